@@ -0,0 +1,415 @@
+"""Docker Registry Cleaner Benchmarks
+
+Start a local HTTPS fake registry (repos x tags, injected latency and error
+rate) and run each scenario end to end in its own process:
+
+- `client`: serial crawl with DockerRegistryClient (images, tags, digests)
+- `main (concurrency=N)`: main() once per `--concurrency` value
+- `list tags (cold/warm cache)`: `main.py list --tags` twice with a tags
+  list cache (`--tags-cache`): the warm run only gets `304 Not Modified`
+- `parse tags (loads/stream)`: one tags list body of `--parse-tags` tags
+  parsed whole (json.loads, former client) then incrementally: compare
+  peak RSS
+- `working set (strings/records)`: the per tag planning state of
+  `--working-set` tags (one digest each) held as 'image:tag' and digest
+  strings (former pipeline) then as tag names and a DigestTable
+- `protected (set/index)`: a running images export of `--protected`
+  entries loaded as a set of digest strings then as a ProtectedIndex,
+  followed by as many lookups: compare wall time and peak RSS
+- `protected (load)`: the same export loaded as a ProtectedIndex only,
+  e.g. `--protected 1000000` for the startup time of a large export
+
+Usage:
+    python benchmarks/benchmark.py --repos 50 --tags 100 --latency 0.005 \\
+        --concurrency 1 4 16 --json results.json
+
+Other environment variables (RATE_LIMIT, RETENTION_KEEP_LAST...) are passed
+through to main().
+"""
+
+import sys
+from argparse import SUPPRESS, ArgumentParser, Namespace
+from json import dump
+from math import ceil
+from os import environ, path, wait4, waitstatus_to_exitcode
+from subprocess import DEVNULL, Popen
+from tempfile import TemporaryDirectory, TemporaryFile
+from time import perf_counter
+from typing import Any, Iterable, Optional
+from fake_registry import FakeRegistry, FakeRegistryServer, create_certificate
+
+ROOT: str = path.dirname(path.dirname(path.abspath(__file__)))
+SRC: str = path.join(ROOT, "src")
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Get a percentile (nearest rank) of a list of values"""
+
+    if not values:
+        return 0.0
+    ordered: list[float] = sorted(values)
+    return ordered[max(0, ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def crawl() -> None:
+    """Client scenario: list images and tags, resolve every digest (serial)"""
+
+    # pylint: disable=import-outside-toplevel
+    from docker_registry_client import DockerRegistryClient
+
+    client = DockerRegistryClient(
+        registry_url=environ["DOCKER_REGISTRY_URL"],
+        ca_file=environ["DOCKER_REGISTRY_CA_FILE"],
+    )
+    for image in client.get_images():
+        for image_tag in client.get_image_tags(image=image):
+            client.get_image_tag_digest(image_tag=image_tag)
+
+
+def parse(file_path: str, parser: str) -> None:
+    """Parse scenario: count the tags of a tags list body (whole or streamed)"""
+
+    # pylint: disable=import-outside-toplevel
+    from json import loads
+    from json_stream import iter_json_strings
+
+    with open(file_path, mode="rb") as file:
+        if parser == "loads":
+            tags: Iterable[str] = list(loads(file.read()).get("tags") or [])
+        else:
+            tags = iter_json_strings(stream=file, key="tags")
+        count: int = sum(1 for tag in tags if tag)
+    print(count)
+
+
+def working_set(tags: int, representation: str) -> None:
+    """Working set scenario: hold then group the planning state of many tags"""
+
+    # pylint: disable=import-outside-toplevel
+    from hashlib import sha256
+    from image_tag import DigestTable, ImageTag
+
+    names: list[str] = []
+    candidates: dict[str, list[str]] = {}
+    table = DigestTable()
+    for index in range(tags):
+        image: str = f"team-{index // 100:06d}/service"
+        tag: str = f"build-{index:08d}"
+        digest: str = f"sha256:{sha256(tag.encode()).hexdigest()}"
+        if representation == "strings":
+            image_tag: str = f"{image}:{tag}"
+            tag_start: int = len(image) + 1
+            names.append(image_tag[tag_start:])
+            candidates.setdefault(digest, []).append(image_tag)
+        else:
+            record = ImageTag(image=image, tag=tag)
+            names.append(record.tag)
+            table.add(tag=record.tag, digest=digest)
+    groups: int = (
+        len(candidates)
+        if representation == "strings"
+        else sum(1 for _ in table.groups())
+    )
+    print(len(names), groups)
+
+
+def load_protected(file_path: str, representation: str) -> None:
+    """Protected scenario: load a running images export, look every digest up"""
+
+    # pylint: disable=import-outside-toplevel
+    from re import compile as re_compile
+    from protected_index import ProtectedIndex
+
+    if representation == "set":
+        pattern = re_compile(r"sha256:[0-9a-f]{64}")
+        with open(file_path, encoding="utf-8") as file:
+            digests: set[str] = {
+                digest for line in file for digest in pattern.findall(line)
+            }
+        with open(file_path, encoding="utf-8") as file:
+            found: int = sum(
+                1 for line in file if line.split("@")[1].strip() in digests
+            )
+    else:
+        protected = ProtectedIndex.load(
+            path=file_path, registry_url="https://registry.example.com"
+        )
+        if representation == "load":
+            print(len(protected))
+            return
+        with open(file_path, encoding="utf-8") as file:
+            found = sum(
+                1
+                for line in file
+                if protected.protects_digest(digest=line.split("@")[1].strip())
+            )
+    print(found)
+
+
+def write_protected(file_path: str, entries: int) -> None:
+    """Write a running images export ('registry/image@digest' lines)"""
+
+    # pylint: disable=import-outside-toplevel
+    from hashlib import sha256
+
+    with open(file_path, mode="w", encoding="utf-8") as file:
+        for index in range(entries):
+            digest: str = sha256(str(index).encode()).hexdigest()
+            file.write(
+                f"registry.example.com/team-{index % 1000:04d}/app@sha256:{digest}\n"
+            )
+
+
+def write_tags_list(file_path: str, tags: int) -> None:
+    """Write a tags list body (`{"name": ..., "tags": [...]}`)
+
+    Written line by line: forked scenario processes inherit the peak RSS.
+    """
+
+    with open(file_path, mode="w", encoding="utf-8") as file:
+        file.write('{"name": "big", "tags": [')
+        for index in range(tags):
+            file.write(f'{", " if index else ""}"tag-{index:08d}"')
+        file.write("]}")
+
+
+def run_scenario(
+    name: str, args: list[str], env: dict[str, str], registry: FakeRegistry
+) -> dict[str, Any]:
+    """Run one scenario process against a fresh registry"""
+
+    registry.reset()
+    with TemporaryFile() as stderr:
+        started: float = perf_counter()
+        with Popen(args=args, env=env, stdout=DEVNULL, stderr=stderr) as process:
+            _, status, rusage = wait4(process.pid, 0)
+            process.returncode = waitstatus_to_exitcode(status)
+        wall: float = perf_counter() - started
+        if process.returncode:
+            stderr.seek(0)
+            raise RuntimeError(
+                f"Scenario '{name}' failed ({process.returncode}): "
+                f"{stderr.read().decode(errors='replace')[-2000:]}"
+            )
+
+    return {
+        "scenario": name,
+        "wall_seconds": wall,
+        "requests": registry.requests,
+        "requests_per_second": registry.requests / wall if wall else 0.0,
+        "statuses": dict(sorted(registry.statuses.items())),
+        "peak_rss_mb": rusage.ru_maxrss / 1024,  # Linux: kilobytes
+        "endpoints": {
+            endpoint: {
+                "count": len(latencies),
+                "p50_ms": percentile(values=latencies, percent=50) * 1000,
+                "p99_ms": percentile(values=latencies, percent=99) * 1000,
+            }
+            for endpoint, latencies in sorted(registry.latencies.items())
+        },
+    }
+
+
+def print_report(results: list[dict[str, Any]]) -> None:
+    """Print results as text tables"""
+
+    print(
+        f"{'scenario':<24} {'wall (s)':>9} {'requests':>9} {'req/s':>9} "
+        f"{'RSS (MB)':>9}  statuses"
+    )
+    for result in results:
+        print(
+            f"{result['scenario']:<24} {result['wall_seconds']:>9.3f} "
+            f"{result['requests']:>9} {result['requests_per_second']:>9.1f} "
+            f"{result['peak_rss_mb']:>9.1f}  {result['statuses']}"
+        )
+    for result in results:
+        print(f"\n{result['scenario']} (server side latency)")
+        for endpoint, stats in result["endpoints"].items():
+            print(
+                f"  {endpoint:<22} {stats['count']:>7} "
+                f"p50={stats['p50_ms']:>8.2f}ms p99={stats['p99_ms']:>8.2f}ms"
+            )
+
+
+def get_arguments(argv: Optional[list[str]] = None) -> Namespace:
+    """Parse command line arguments"""
+
+    parser = ArgumentParser(description="Docker Registry Cleaner Benchmarks")
+    parser.add_argument("--repos", type=int, default=20, help="Number of images")
+    parser.add_argument("--tags", type=int, default=50, help="Tags per image")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Injected latency (seconds)"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Injected 503 error rate"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 4], help="main() workers"
+    )
+    parser.add_argument(
+        "--tags-filter", default="^old-", help="DOCKER_TAGS_FILTER (half the tags)"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="main() dry run")
+    parser.add_argument("--no-client", action="store_true", help="Skip client run")
+    parser.add_argument(
+        "--tags-cache", action="store_true", help="Run tags list crawls (cold/warm)"
+    )
+    parser.add_argument(
+        "--parse-tags", type=int, default=0, help="Tags of the parse scenarios"
+    )
+    parser.add_argument(
+        "--working-set", type=int, default=0, help="Tags of the working set scenarios"
+    )
+    parser.add_argument(
+        "--protected", type=int, default=0, help="Entries of the protected scenarios"
+    )
+    parser.add_argument("--json", help="Write results to a JSON file")
+    parser.add_argument("--crawl", action="store_true", help=SUPPRESS)
+    parser.add_argument("--parse", nargs=2, help=SUPPRESS)
+    parser.add_argument("--hold", help=SUPPRESS)
+    parser.add_argument("--load-protected", nargs=2, help=SUPPRESS)
+    return parser.parse_args(args=argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Benchmarks Main Function"""
+
+    arguments: Namespace = get_arguments(argv=argv)
+    if arguments.crawl:
+        crawl()
+        return
+    if arguments.parse:
+        parse(file_path=arguments.parse[0], parser=arguments.parse[1])
+        return
+    if arguments.hold:
+        working_set(tags=arguments.working_set, representation=arguments.hold)
+        return
+    if arguments.load_protected:
+        load_protected(
+            file_path=arguments.load_protected[0],
+            representation=arguments.load_protected[1],
+        )
+        return
+
+    registry = FakeRegistry(
+        repos=arguments.repos,
+        tags=arguments.tags,
+        latency=arguments.latency,
+        error_rate=arguments.error_rate,
+    )
+    results: list[dict[str, Any]] = []
+    with TemporaryDirectory() as directory:
+        cert_file, key_file = create_certificate(directory=directory)
+        with FakeRegistryServer(
+            registry=registry, cert_file=cert_file, key_file=key_file
+        ) as server:
+            env: dict[str, str] = {
+                "LOGGING_LEVEL": "WARNING",
+                **environ,
+                "PYTHONPATH": SRC,
+                "DOCKER_REGISTRY_URL": server.url,
+                "DOCKER_REGISTRY_CA_FILE": cert_file,
+                "DOCKER_TAGS_FILTER": arguments.tags_filter,
+                "DRY_RUN": "YES" if arguments.dry_run else "NO",
+                "FORCE": "YES",
+            }
+            if not arguments.no_client:
+                results.append(
+                    run_scenario(
+                        name="client",
+                        args=[sys.executable, path.abspath(__file__), "--crawl"],
+                        env=env,
+                        registry=registry,
+                    )
+                )
+            for concurrency in arguments.concurrency:
+                results.append(
+                    run_scenario(
+                        name=f"main (concurrency={concurrency})",
+                        args=[sys.executable, path.join(SRC, "main.py")],
+                        env={**env, "CLEANER_CONCURRENCY": str(concurrency)},
+                        registry=registry,
+                    )
+                )
+            if arguments.tags_cache:
+                list_args: list[str] = [
+                    sys.executable,
+                    path.join(SRC, "main.py"),
+                    "list",
+                    "--tags",
+                ]
+                for cache in ("cold", "warm"):
+                    results.append(
+                        run_scenario(
+                            name=f"list tags ({cache} cache)",
+                            args=list_args,
+                            env={
+                                **env,
+                                "CLEANER_CONCURRENCY": str(max(arguments.concurrency)),
+                                "TAGS_CACHE_FILE": path.join(directory, "tags.db"),
+                            },
+                            registry=registry,
+                        )
+                    )
+            if arguments.parse_tags:
+                body_file: str = path.join(directory, "tags.json")
+                write_tags_list(file_path=body_file, tags=arguments.parse_tags)
+                for parser in ("loads", "stream"):
+                    results.append(
+                        run_scenario(
+                            name=f"parse tags ({parser})",
+                            args=[
+                                sys.executable,
+                                path.abspath(__file__),
+                                "--parse",
+                                body_file,
+                                parser,
+                            ],
+                            env=env,
+                            registry=registry,
+                        )
+                    )
+            for representation in ("strings", "table") if arguments.working_set else ():
+                results.append(
+                    run_scenario(
+                        name=f"working set ({representation})",
+                        args=[
+                            sys.executable,
+                            path.abspath(__file__),
+                            "--working-set",
+                            str(arguments.working_set),
+                            "--hold",
+                            representation,
+                        ],
+                        env=env,
+                        registry=registry,
+                    )
+                )
+            if arguments.protected:
+                protected_file: str = path.join(directory, "running.txt")
+                write_protected(file_path=protected_file, entries=arguments.protected)
+                for representation in ("set", "index", "load"):
+                    results.append(
+                        run_scenario(
+                            name=f"protected ({representation})",
+                            args=[
+                                sys.executable,
+                                path.abspath(__file__),
+                                "--load-protected",
+                                protected_file,
+                                representation,
+                            ],
+                            env=env,
+                            registry=registry,
+                        )
+                    )
+
+    print_report(results=results)
+    if arguments.json:
+        with open(arguments.json, mode="w", encoding="utf-8") as file:
+            dump(obj=results, fp=file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Local HTTPS Fake Docker Registry (Benchmarks)"""
+
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps
+from os import path
+from random import Random
+from ssl import PROTOCOL_TLS_SERVER, SSLContext
+from subprocess import run
+from threading import Lock, Thread
+from time import perf_counter, sleep
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+MANIFEST_MEDIA_TYPE: str = "application/vnd.docker.distribution.manifest.v2+json"
+CONFIG_MEDIA_TYPE: str = "application/vnd.docker.container.image.v1+json"
+
+
+def create_certificate(directory: str) -> tuple[str, str]:
+    """Create a self-signed certificate for 127.0.0.1 (openssl command)"""
+
+    cert_file: str = path.join(directory, "registry.crt")
+    key_file: str = path.join(directory, "registry.key")
+    run(
+        args=[
+            *"openssl req -x509 -newkey rsa:2048 -nodes -days 1".split(),
+            *("-subj", "/CN=127.0.0.1"),
+            *("-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost"),
+            *("-keyout", key_file, "-out", cert_file),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert_file, key_file
+
+
+def get_endpoint(method: str, url: str) -> str:
+    """Get the endpoint name of a request (latency statistics key)"""
+
+    if url.startswith("/v2/_catalog"):
+        return f"{method} catalog"
+    for endpoint in ("tags", "manifests", "blobs"):
+        if f"/{endpoint}/" in url:
+            return f"{method} {endpoint}"
+    return f"{method} other"
+
+
+class FakeRegistry:
+    """In-memory Docker registry content with injected latency and errors
+
+    Every image has `tags` tags, each one pointing to its own manifest whose
+    config blob gets an older creation date as the tag number grows. The
+    first half of the tags are named `old-<n>`, the others `keep-<n>`.
+    """
+
+    def __init__(
+        self,
+        repos: int = 10,
+        tags: int = 20,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.repos = repos
+        self.tags_per_repo = tags
+        self.latency = latency
+        self.error_rate = error_rate
+        self.__random = Random(seed)
+        self.__lock = Lock()
+        self.images: dict[str, dict[str, str]] = {}
+        self.configs: dict[str, bytes] = {}
+        self.manifests: dict[str, bytes] = {}
+        self.latencies: dict[str, list[float]] = {}
+        self.statuses: dict[int, int] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """Recreate the registry content and clear the statistics"""
+
+        created: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        with self.__lock:
+            self.images.clear()
+            self.configs.clear()
+            self.manifests.clear()
+            self.latencies.clear()
+            self.statuses.clear()
+            for repo in range(self.repos):
+                image: str = f"bench/image-{repo:05d}"
+                self.images[image] = {}
+                for number in range(self.tags_per_repo):
+                    prefix: str = "old" if number < self.tags_per_repo // 2 else "keep"
+                    tag: str = f"{prefix}-{number}"
+                    config: bytes = dumps(
+                        obj={"created": (created - timedelta(days=number)).isoformat()}
+                    ).encode()
+                    config_digest: str = f"sha256:{sha256(config).hexdigest()}"
+                    manifest: bytes = dumps(
+                        obj={
+                            "schemaVersion": 2,
+                            "mediaType": MANIFEST_MEDIA_TYPE,
+                            "config": {
+                                "mediaType": CONFIG_MEDIA_TYPE,
+                                "digest": config_digest,
+                                "size": len(config),
+                            },
+                            "layers": [],
+                            "annotations": {"image": image, "tag": tag},
+                        }
+                    ).encode()
+                    digest: str = f"sha256:{sha256(manifest).hexdigest()}"
+                    self.configs[config_digest] = config
+                    self.manifests[digest] = manifest
+                    self.images[image][tag] = digest
+
+    @property
+    def requests(self) -> int:
+        """Number of requests handled"""
+
+        return sum(self.statuses.values())
+
+    def record(self, endpoint: str, status: int, duration: float) -> None:
+        """Record a handled request"""
+
+        with self.__lock:
+            self.latencies.setdefault(endpoint, []).append(duration)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def is_failing(self) -> bool:
+        """Draw an injected error"""
+
+        with self.__lock:
+            return self.__random.random() < self.error_rate
+
+    def get_tags(self, image: str) -> Optional[list[str]]:
+        """Get the sorted tags of an image (None if unknown)"""
+
+        with self.__lock:
+            tags: Optional[dict[str, str]] = self.images.get(image)
+            return None if tags is None else sorted(tags)
+
+    def get_digest(self, image: str, reference: str) -> Optional[str]:
+        """Get the manifest digest of an image tag (or digest)"""
+
+        with self.__lock:
+            tags: dict[str, str] = self.images.get(image, {})
+            if reference in tags:
+                return tags[reference]
+            return reference if reference in tags.values() else None
+
+    def delete_manifest(self, image: str, digest: str) -> bool:
+        """Delete a manifest and the tags referencing it"""
+
+        with self.__lock:
+            tags: Optional[dict[str, str]] = self.images.get(image)
+            if tags is None or digest not in tags.values():
+                return False
+            for tag in [tag for tag, value in tags.items() if value == digest]:
+                del tags[tag]
+            return True
+
+
+def paginate(items: list[str], query: dict[str, list[str]]) -> tuple[list[str], bool]:
+    """Get one page of a sorted list (`n` and `last` query parameters)"""
+
+    last: str = query.get("last", [""])[0]
+    start: int = 0
+    if last:
+        start = next((i for i, item in enumerate(items) if item > last), len(items))
+    number: int = int(query.get("n", [str(len(items) or 1)])[0])
+    end: int = start + number
+    return items[start:end], end < len(items)
+
+
+class FakeRegistryHandler(BaseHTTPRequestHandler):
+    """Docker Registry HTTP API V2 subset (HTTP/1.1 keep-alive)"""
+
+    protocol_version = "HTTP/1.1"
+    server: "FakeRegistryServer"
+
+    def log_message(self, *_):  # pylint: disable=arguments-differ
+        """Quiet Logs"""
+
+    def __send(
+        self,
+        status: int,
+        body: bytes = b"",
+        headers: Optional[dict[str, str]] = None,
+    ) -> int:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+        return status
+
+    def __route(self) -> int:
+        registry: FakeRegistry = self.server.registry
+        url = urlparse(self.path)
+        query: dict[str, list[str]] = parse_qs(url.query)
+        if registry.is_failing():
+            return self.__send(status=503)
+
+        if url.path == "/v2/_catalog" and self.command == "GET":
+            images, more = paginate(items=sorted(registry.images), query=query)
+            return self.__send(
+                status=200,
+                body=dumps(obj={"repositories": images}).encode(),
+                headers=self.__link(url=url.path, items=images, more=more, query=query),
+            )
+
+        image, _, reference = url.path.removeprefix("/v2/").rpartition("/")
+        image, _, kind = image.rpartition("/")
+        tags: Optional[list[str]] = registry.get_tags(image=image)
+        if tags is None:
+            return self.__send(status=404)
+
+        if kind == "tags" and reference == "list" and self.command == "GET":
+            names, more = paginate(items=tags, query=query)
+            body: bytes = dumps(obj={"name": image, "tags": names}).encode()
+            headers: dict[str, str] = {
+                "ETag": f'"{sha256(body).hexdigest()[:32]}"',
+                **self.__link(url=url.path, items=names, more=more, query=query),
+            }
+            if self.headers.get("If-None-Match") == headers["ETag"]:
+                return self.__send(status=304, headers=headers)
+            return self.__send(status=200, body=body, headers=headers)
+
+        if kind == "manifests" and self.command in ("GET", "HEAD"):
+            digest: Optional[str] = registry.get_digest(
+                image=image, reference=reference
+            )
+            if digest is None:
+                return self.__send(status=404)
+            return self.__send(
+                status=200,
+                body=registry.manifests[digest],
+                headers={
+                    "Content-Type": MANIFEST_MEDIA_TYPE,
+                    "Docker-Content-Digest": digest,
+                },
+            )
+
+        if kind == "manifests" and self.command == "DELETE":
+            deleted: bool = registry.delete_manifest(image=image, digest=reference)
+            return self.__send(status=202 if deleted else 404)
+
+        if kind == "blobs" and self.command == "GET" and reference in registry.configs:
+            return self.__send(
+                status=200,
+                body=registry.configs[reference],
+                headers={"Content-Type": CONFIG_MEDIA_TYPE},
+            )
+        return self.__send(status=404)
+
+    @staticmethod
+    def __link(
+        url: str, items: list[str], more: bool, query: dict[str, list[str]]
+    ) -> dict[str, str]:
+        if not more:
+            return {}
+        number: str = query.get("n", [str(len(items))])[0]
+        return {"Link": f'<{url}?n={number}&last={items[-1]}>; rel="next"'}
+
+    def __handle(self) -> None:
+        started: float = perf_counter()
+        if self.server.registry.latency:
+            sleep(self.server.registry.latency)
+        status: int = self.__route()
+        self.server.registry.record(
+            endpoint=get_endpoint(method=self.command, url=self.path),
+            status=status,
+            duration=perf_counter() - started,
+        )
+
+    do_GET = do_HEAD = do_DELETE = __handle
+
+
+class FakeRegistryServer(ThreadingHTTPServer):
+    """Threaded HTTPS server exposing a FakeRegistry"""
+
+    daemon_threads = True
+
+    def __init__(self, registry: FakeRegistry, cert_file: str, key_file: str):
+        super().__init__(("127.0.0.1", 0), FakeRegistryHandler)
+        self.registry = registry
+        ssl_context = SSLContext(protocol=PROTOCOL_TLS_SERVER)
+        ssl_context.load_cert_chain(certfile=cert_file, keyfile=key_file)
+        self.socket = ssl_context.wrap_socket(sock=self.socket, server_side=True)
+        self.thread = Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Registry HTTPS URL"""
+
+        return f"https://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self) -> "FakeRegistryServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.shutdown()
+        self.server_close()
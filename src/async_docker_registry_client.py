@@ -0,0 +1,411 @@
+"""Asynchronous Docker Registry Client"""
+
+from asyncio import (
+    IncompleteReadError,
+    Semaphore,
+    StreamReader,
+    StreamWriter,
+    open_connection,
+    wait_for,
+)
+from collections import deque
+from http.client import HTTPException
+from json import loads
+from ssl import SSLContext
+from typing import AsyncIterator, Generator, Optional
+from urllib.parse import quote, urlparse, urlunparse, ParseResult
+from docker_registry_client import (
+    MANIFEST_MEDIA_TYPES,
+    REDIRECT_STATUSES,
+    REDIRECTS_MAX,
+    get_manifest_accept,
+    get_redirect_url,
+    get_ssl_context,
+)
+from http_parser import ParsedResponse, ReadRequest, parse_response
+from image_tag import ImageTag
+from logger import logger
+from matcher import Matcher, get_matcher
+from utils import get_next_link
+
+
+class AsyncHTTPResponse:  # pylint: disable=too-few-public-methods
+    """AsyncHTTPResponse Class"""
+
+    def __init__(
+        self, status: int, reason: str, headers: dict[str, str], body: bytes
+    ) -> None:
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    def getheader(self, name: str) -> Optional[str]:
+        """AsyncHTTPResponse Get Header Method (case insensitive)"""
+
+        return self.headers.get(name.lower())
+
+
+class PooledConnection:
+    """Persistent (keep-alive) TLS connection owned by a ConnectionPool"""
+
+    def __init__(self, reader: StreamReader, writer: StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.requests: int = 0
+
+    @property
+    def is_closing(self) -> bool:
+        """Connection Already Closed (or half-closed by the peer)"""
+
+        return self.writer.is_closing() or self.reader.at_eof()
+
+    def close(self) -> None:
+        """Close Connection"""
+
+        self.writer.close()
+
+
+class ConnectionPool:
+    """Pool of persistent TLS connections limited per host"""
+
+    def __init__(
+        self,
+        ssl_context: SSLContext,
+        limit_per_host: int = 10,
+        timeout: int = 3,
+    ) -> None:
+        self.ssl_context = ssl_context
+        self.limit_per_host = max(1, limit_per_host)
+        self.timeout = timeout
+        self.opened: int = 0
+        self.__idle: dict[tuple[str, int], deque[PooledConnection]] = {}
+        self.__semaphores: dict[tuple[str, int], Semaphore] = {}
+
+    def __semaphore(self, key: tuple[str, int]) -> Semaphore:
+        if key not in self.__semaphores:
+            self.__semaphores[key] = Semaphore(value=self.limit_per_host)
+        return self.__semaphores[key]
+
+    async def acquire(
+        self, host: str, port: int, fresh: bool = False
+    ) -> PooledConnection:
+        """Get an idle connection for host:port or open a new one"""
+
+        key: tuple[str, int] = (host, port)
+        await self.__semaphore(key=key).acquire()
+        idle: deque[PooledConnection] = self.__idle.setdefault(key, deque())
+        while idle and not fresh:
+            connection: PooledConnection = idle.pop()
+            if not connection.is_closing:
+                return connection
+            connection.close()
+        try:
+            reader, writer = await wait_for(
+                open_connection(
+                    host=host, port=port, ssl=self.ssl_context, server_hostname=host
+                ),
+                timeout=self.timeout,
+            )
+        except BaseException:
+            self.__semaphore(key=key).release()
+            raise
+        self.opened += 1
+        return PooledConnection(reader=reader, writer=writer)
+
+    def release(
+        self, host: str, port: int, connection: PooledConnection, reusable: bool
+    ) -> None:
+        """Give back a connection to the pool (closed if not reusable)"""
+
+        key: tuple[str, int] = (host, port)
+        if reusable and not connection.is_closing:
+            self.__idle.setdefault(key, deque()).append(connection)
+        else:
+            connection.close()
+        self.__semaphore(key=key).release()
+
+    async def close(self) -> None:
+        """Close all idle connections"""
+
+        for idle in self.__idle.values():
+            while idle:
+                connection: PooledConnection = idle.pop()
+                connection.close()
+                try:
+                    await connection.writer.wait_closed()
+                except (ConnectionError, OSError):
+                    pass
+
+
+async def _read_response(
+    reader: StreamReader, method: str
+) -> tuple[AsyncHTTPResponse, bool]:
+    """Read one response with the shared parser: (response, keep alive)"""
+
+    parser: Generator[ReadRequest, bytes, ParsedResponse] = parse_response(
+        method=method
+    )
+    try:
+        kind, size = next(parser)
+        while True:
+            if kind == "line":
+                data: bytes = await reader.readline()
+            elif kind == "exact":
+                data = await reader.readexactly(size)
+            else:
+                data = await reader.read()
+            kind, size = parser.send(data)
+    except StopIteration as stop:
+        parsed: ParsedResponse = stop.value
+        return (
+            AsyncHTTPResponse(
+                status=parsed.status,
+                reason=parsed.reason,
+                headers=parsed.headers,
+                body=parsed.body,
+            ),
+            parsed.keep_alive,
+        )
+
+
+class AsyncDockerRegistryClient:
+    """AsyncDockerRegistryClient Class (asyncio sibling of DockerRegistryClient)"""
+
+    connection_pool: ConnectionPool
+    manifest_media_types: dict[str, str]
+    registry_host: str
+    registry_port: int
+    registry_path: str
+
+    def __init__(
+        self,
+        registry_url: str,
+        ca_file: Optional[str] = None,
+        timeout: int = 3,
+        limit_per_host: int = 10,
+    ) -> None:
+        if not registry_url.startswith("https://"):
+            raise ValueError("Docker registry URL must start with 'https://'")
+
+        parse_result: ParseResult = urlparse(url=registry_url)
+
+        self.registry_host: str = parse_result.hostname if parse_result.hostname else ""
+        self.registry_port: int = parse_result.port if parse_result.port else 443
+        self.registry_path = parse_result.path
+        # Manifest media type served by the registry per repository
+        self.manifest_media_types = {}
+
+        self.connection_pool = ConnectionPool(
+            ssl_context=get_ssl_context(ca_file=ca_file),
+            limit_per_host=limit_per_host,
+            timeout=timeout,
+        )
+
+    async def __aenter__(self) -> "AsyncDockerRegistryClient":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close all pooled connections"""
+
+        await self.connection_pool.close()
+
+    def __route(self, url: str) -> tuple[str, int, str]:
+        """Get the (host, port, request target) of a path or absolute URL"""
+
+        parse_result: ParseResult = urlparse(url=url)
+        if not parse_result.scheme:
+            return self.registry_host, self.registry_port, url
+        if parse_result.scheme != "https":
+            raise HTTPException(f"Unsupported redirect URL scheme: {url}")
+        return (
+            parse_result.hostname or "",
+            parse_result.port or 443,
+            urlunparse(parse_result._replace(scheme="", netloc="")) or "/",
+        )
+
+    async def __send(
+        self, url: str, method: str, headers: dict[str, str]
+    ) -> AsyncHTTPResponse:
+        host, port, target = self.__route(url=url)
+        # Default port omitted (signed Host headers, proxies)
+        host_header: str = host if port == 443 else f"{host}:{port}"
+        request: bytes = (
+            f"{method} {target} HTTP/1.1\r\n"
+            f"Host: {host_header}\r\n"
+            "Connection: keep-alive\r\n"
+            + "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+            + "\r\n"
+        ).encode(encoding="latin-1")
+
+        fresh: bool = False
+        while True:
+            connection: PooledConnection = await self.connection_pool.acquire(
+                host=host, port=port, fresh=fresh
+            )
+            reused: bool = connection.requests > 0
+            keep_alive: bool = False
+            try:
+                connection.writer.write(request)
+                await connection.writer.drain()
+                response, keep_alive = await wait_for(
+                    _read_response(reader=connection.reader, method=method),
+                    timeout=self.connection_pool.timeout,
+                )
+            except (ConnectionError, IncompleteReadError) as exception:
+                if not reused or fresh:
+                    raise
+                # Half-closed keep-alive connection: retry once on a new one
+                logger.debug(msg=f"Stale keep-alive connection: {exception}")
+                fresh = True
+                continue
+            finally:
+                connection.requests += 1
+                self.connection_pool.release(
+                    host=host,
+                    port=port,
+                    connection=connection,
+                    reusable=keep_alive,
+                )
+            return response
+
+    async def __request_response(
+        self, url: str, method: str = "GET"
+    ) -> AsyncHTTPResponse:
+        """Send a request, following (at most REDIRECTS_MAX) redirects"""
+
+        for _ in range(REDIRECTS_MAX + 1):
+            response: AsyncHTTPResponse = await self.__send(
+                url=url, method=method, headers={}
+            )
+            if response.status in range(200, 300):
+                return response
+
+            # Detect redirect URL
+            location_header: Optional[str] = response.getheader(name="location")
+            if location_header is None or response.status not in REDIRECT_STATUSES:
+                # Raise HTTPException
+                raise HTTPException(
+                    f"Received HTTP code != 200: {response.status} -> {response.reason}"
+                )
+            location: str = get_redirect_url(url=url, location=location_header)
+            logger.info(msg=f"Redirect detected: {url} -> {location}")
+            if response.status == 303:
+                method = "GET"
+            url = location
+
+        raise HTTPException(f"Too many redirects (> {REDIRECTS_MAX}): {url}")
+
+    async def __request(
+        self, url: str, method: str = "GET"
+    ) -> dict | list | bytes | None:
+        response: AsyncHTTPResponse = await self.__request_response(
+            url=url, method=method
+        )
+        return loads(response.body) if response.body else response.body
+
+    async def __request_pages(self, url: str) -> AsyncIterator[dict]:
+        """Follow 'Link: <...>; rel="next"' pagination, one JSON page at a time"""
+
+        next_url: Optional[str] = url
+        while next_url is not None:
+            response: AsyncHTTPResponse = await self.__request_response(url=next_url)
+            next_url = self.__with_registry_path(
+                url=get_next_link(link_header=response.getheader(name="link"))
+            )
+            yield dict(loads(response.body)) if response.body else {}
+
+    def __with_registry_path(self, url: Optional[str]) -> Optional[str]:
+        registry_path: str = self.registry_path.rstrip("/")
+        if url is None or not registry_path or url.startswith(registry_path):
+            return url
+        return f"{registry_path}{url}"
+
+    async def __request_get_header_values(
+        self, url: str, headers: dict[str, str], header_names: tuple[str, ...]
+    ) -> tuple[str, ...]:
+        response: AsyncHTTPResponse = await self.__send(
+            url=url, method="HEAD", headers=headers
+        )
+        if response.status != 200:
+            # Raise HTTPException
+            raise HTTPException(
+                "Received HTTP code != 200: "
+                f"{response.status} -> {response.reason} ({url=})"
+            )
+        return tuple(
+            response.getheader(name=header_name) or "" for header_name in header_names
+        )
+
+    async def get_images(
+        self,
+        number_max: int = 500,
+        pattern: str | Matcher = r".*",
+        last: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """AsyncDockerClient Get Images Method (streamed, `number_max` per page)
+
+        Images are listed in catalog order, starting after `last` if given.
+        """
+
+        matcher: Matcher = get_matcher(pattern=pattern)
+        async for page in self.__request_pages(
+            url=f"{self.registry_path}/v2/_catalog?n={number_max}"
+            + (f"&last={quote(last)}" if last else "")
+        ):
+            for image in page.get("repositories") or []:
+                if matcher(image):
+                    yield image
+
+    async def get_image_tags(
+        self,
+        image: str,
+        pattern: str | Matcher = r".*",
+        number_max: Optional[int] = None,
+    ) -> AsyncIterator[ImageTag]:
+        """AsyncDockerClient Get Image Tags Method (streamed, `number_max` per page)"""
+
+        matcher: Matcher = get_matcher(pattern=pattern)
+        query: str = f"?n={number_max}" if number_max else ""
+        async for page in self.__request_pages(
+            url=f"{self.registry_path}/v2/{image}/tags/list{query}"
+        ):
+            for tag in page.get("tags") or []:
+                if matcher(tag):
+                    yield ImageTag(image=image, tag=tag)
+
+    async def get_image_tag_digest(self, image_tag: ImageTag | str) -> str | None:
+        """Method that returns Docker image digest (single HEAD request)"""
+
+        if isinstance(image_tag, str):
+            image_tag = ImageTag.parse(reference=image_tag)
+        image, tag = image_tag.image, image_tag.tag
+
+        try:
+            digest, media_type = await self.__request_get_header_values(
+                url=f"/v2/{image}/manifests/{tag}",
+                headers={
+                    "Accept": get_manifest_accept(
+                        media_type=self.manifest_media_types.get(image)
+                    )
+                },
+                header_names=("Docker-Content-Digest", "Content-Type"),
+            )
+        except HTTPException:
+            return None
+        if media_type in MANIFEST_MEDIA_TYPES:
+            self.manifest_media_types[image] = media_type
+        return digest
+
+    async def delete_image(self, image: str, digest: str) -> bool:
+        """Method that delete a Docker image using digest"""
+
+        try:
+            await self.__request(url=f"/v2/{image}/manifests/{digest}", method="DELETE")
+        except HTTPException as exception:
+            logger.warning(msg=exception)
+            return False
+        return True
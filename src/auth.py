@@ -0,0 +1,168 @@
+"""Docker Registry Token Authentication"""
+
+from base64 import b64encode
+from json import loads
+from re import findall, match
+from ssl import SSLContext
+from threading import Lock
+from time import time
+from typing import Callable, Optional
+from urllib.parse import urlencode, urlparse
+from urllib.request import Request, urlopen
+from logger import logger
+
+# Actions requested for repository scopes: one token per repository is
+# enough to list tags, resolve digests and delete manifests
+REPOSITORY_ACTIONS: tuple[str, ...] = ("pull", "delete")
+
+
+def parse_www_authenticate(value: str) -> tuple[str, dict[str, str]]:
+    """Parse 'WWW-Authenticate' header: scheme and parameters"""
+
+    scheme, _, parameters = value.strip().partition(" ")
+    return scheme.lower(), {
+        key.lower(): quoted if quoted else unquoted
+        for key, quoted, unquoted in findall(
+            r'([A-Za-z_]+)=(?:"([^"]*)"|([^,\s]*))', parameters
+        )
+    }
+
+
+def get_url_scope(url: str) -> Optional[str]:
+    """Get token scope needed by a registry API URL"""
+
+    if "/v2/_catalog" in url:
+        return "registry:catalog:*"
+    if result := match(r"^(?:.*?)/v2/(.+?)/(?:tags|manifests|blobs)/", url):
+        return f"repository:{result.group(1)}:{','.join(REPOSITORY_ACTIONS)}"
+    return None
+
+
+def widen_scope(scope: str) -> str:
+    """Widen a challenged repository scope to the actions the cleaner needs"""
+
+    if not scope.startswith("repository:"):
+        return scope
+    resource, _, actions = scope.rpartition(":")
+    wanted: list[str] = list(dict.fromkeys((*actions.split(","), *REPOSITORY_ACTIONS)))
+    return f"{resource}:{','.join(action for action in wanted if action)}"
+
+
+class TokenAuthenticator:
+    """Docker token authentication flow with an in-memory token cache
+
+    Tokens are cached per scope, shared by all clients (thread-safe) and
+    refreshed `refresh_margin` seconds before they expire.
+    """
+
+    def __init__(
+        self,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        ssl_context: Optional[SSLContext] = None,
+        timeout: int = 3,
+        refresh_margin: float = 10,
+        clock: Callable[[], float] = time,
+    ) -> None:
+        self.username = username
+        self.password = password
+        self.ssl_context = ssl_context
+        self.timeout = timeout
+        self.refresh_margin = refresh_margin
+        self.fetched: int = 0
+        self.__clock = clock
+        self.__tokens: dict[str, tuple[str, float]] = {}
+        self.__challenge: Optional[tuple[str, dict[str, str]]] = None
+        self.__locks: dict[str, Lock] = {}
+        self.__lock = Lock()
+
+    @property
+    def basic_credentials(self) -> Optional[str]:
+        """Basic authentication credentials (if any)"""
+
+        if self.username is None:
+            return None
+        credentials: bytes = f"{self.username}:{self.password or ''}".encode()
+        return b64encode(credentials).decode(encoding="ascii")
+
+    def get_authorization(self, url: str) -> Optional[str]:
+        """Get 'Authorization' header value for an URL (once challenged)"""
+
+        if self.__challenge is None:
+            return None
+        scheme, parameters = self.__challenge
+        if scheme == "basic":
+            credentials: Optional[str] = self.basic_credentials
+            return f"Basic {credentials}" if credentials else None
+        if (scope := get_url_scope(url=url)) is None:
+            return None
+        # Known realm: get the token proactively (no 401 round trip)
+        token: Optional[str] = self.__get_cached_token(
+            scope=scope
+        ) or self.__fetch_token(parameters=parameters, scope=scope)
+        return f"Bearer {token}" if token else None
+
+    def on_challenge(self, url: str, www_authenticate: str) -> bool:
+        """Handle a 401 challenge, returns True if the request can be retried"""
+
+        scheme, parameters = parse_www_authenticate(value=www_authenticate)
+        if scheme == "basic":
+            self.__challenge = (scheme, parameters)
+            return self.username is not None
+        if scheme != "bearer" or "realm" not in parameters:
+            return False
+        # Credentials are only sent over TLS, like every registry request
+        if urlparse(parameters["realm"]).scheme != "https":
+            logger.warning(
+                msg=f"❌ Token realm refused, HTTPS only: {parameters['realm']!r}"
+            )
+            return False
+        self.__challenge = (scheme, parameters)
+        scope: Optional[str] = (
+            widen_scope(scope=parameters["scope"])
+            if "scope" in parameters
+            else get_url_scope(url=url)
+        )
+        # Token rejected (revoked, clock skew...): get a new one
+        self.__tokens.pop(scope or "", None)
+        return self.__fetch_token(parameters=parameters, scope=scope) is not None
+
+    def __lock_for(self, scope: str) -> Lock:
+        with self.__lock:
+            return self.__locks.setdefault(scope, Lock())
+
+    def __get_cached_token(self, scope: str) -> Optional[str]:
+        token, expires_at = self.__tokens.get(scope, ("", 0.0))
+        if token and self.__clock() < expires_at - self.refresh_margin:
+            return token
+        return None
+
+    def __fetch_token(
+        self, parameters: dict[str, str], scope: Optional[str]
+    ) -> Optional[str]:
+        key: str = scope or ""
+        # One token request per scope, even with many workers waiting for it
+        with self.__lock_for(scope=key):
+            if (token := self.__get_cached_token(scope=key)) is not None:
+                return token
+            query: dict[str, str] = {"service": parameters.get("service", "")}
+            if scope:
+                query["scope"] = scope
+            request = Request(url=f"{parameters['realm']}?{urlencode(query=query)}")
+            if (credentials := self.basic_credentials) is not None:
+                request.add_header("Authorization", f"Basic {credentials}")
+            try:
+                with urlopen(  # nosemgrep: dynamic-urllib-use-detected
+                    request, timeout=self.timeout, context=self.ssl_context
+                ) as response:
+                    body: dict = loads(response.read())
+            except (OSError, ValueError) as exception:
+                logger.warning(msg=f"❌ Cannot get token ({scope=}): {exception}")
+                return None
+            token = body.get("token") or body.get("access_token")
+            if not token:
+                return None
+            self.fetched += 1
+            expires_in: float = float(body.get("expires_in") or 60)
+            self.__tokens[key] = (token, self.__clock() + expires_in)
+            return token
@@ -1,17 +1,173 @@
 """Configuration"""
 
-from typing import Final, Optional
-from os import getenv
+from os import environ as os_environ
+from typing import Any, Mapping, NamedTuple, Optional
 from utils import str2bool
 
-LOGGING_LEVEL: Final[str] = getenv(key="LOGGING_LEVEL", default="INFO")
-DOCKER_REGISTRY_URL: Final[str] = getenv(key="DOCKER_REGISTRY_URL", default="")
-DOCKER_REGISTRY_CA_FILE: Final[Optional[str]] = getenv(key="DOCKER_REGISTRY_CA_FILE")
-DOCKER_IMAGES_FILTER: Final[str] = getenv(key="DOCKER_IMAGES_FILTER", default=r".*")
-DOCKER_TAGS_FILTER: Final[str] = getenv(key="DOCKER_TAGS_FILTER", default=r".*")
-IMAGE_LIST_NBR_MAX: Final[int] = int(getenv(key="IMAGE_LIST_NBR_MAX", default="1000"))
-HTTPS_CONNECTION_TIMEOUT: Final[int] = int(
-    getenv(key="HTTP_CONNECTION_TIMEOUT", default="3")
+# Files written by a run: one per registry when several registries are cleaned
+PER_REGISTRY_FILES: tuple[str, ...] = (
+    "state_file",
+    "checkpoint_file",
+    "metrics_file",
+    "events_file",
+    "tags_cache_file",
 )
-FORCE: Final[bool] = str2bool(string=getenv(key="FORCE", default="NO"))
-DRY_RUN: Final[bool] = str2bool(string=getenv(key="DRY_RUN", default="YES"))
+
+
+class Config(NamedTuple):
+    """Cleaner settings, parsed once from environment variables"""
+
+    logging_level: str = "INFO"
+    docker_registry_url: str = ""
+    docker_registry_ca_file: Optional[str] = None
+    docker_images_filter: str = r".*"
+    docker_tags_filter: str = r".*"
+    image_list_nbr_max: int = 1000
+    https_connection_timeout: int = 3
+    force: bool = False
+    dry_run: bool = True
+    cleaner_concurrency: int = 1
+    tag_list_nbr_max: int = 1000
+    state_file: Optional[str] = None
+    state_digest_ttl: int = 604800
+    state_report: bool = False
+    retention_keep_last: int = 0
+    retention_older_than_days: int = 0
+    retention_keep_semver: int = 0
+    docker_images_exclude: str = ""
+    docker_tags_exclude: str = ""
+    rate_limit: float = 0.0
+    retry_max: int = 3
+    retry_backoff_base: float = 0.5
+    docker_registry_username: Optional[str] = None
+    docker_registry_password: Optional[str] = None
+    metrics_file: Optional[str] = None
+    metrics_pushgateway_url: Optional[str] = None
+    metrics_job: str = "docker_registry_cleaner"
+    metrics_format: str = "prometheus"
+    events_file: Optional[str] = None
+    summary_failures_max: int = 10
+    shard_index: int = 0
+    shard_count: int = 1
+    checkpoint_file: Optional[str] = None
+    gc_estimate: bool = False
+    gc_batch_size: int = 16
+    tags_cache_file: Optional[str] = None
+    config_file: Optional[str] = None
+    delete_pipeline_depth: int = 1
+    profile: bool = False
+    profile_file: Optional[str] = None
+    protected_file: Optional[str] = None
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "Config":
+        """Parse settings from environment variables (os.environ by default)"""
+
+        env: Mapping[str, str] = os_environ if environ is None else environ
+        return cls(
+            logging_level=env.get("LOGGING_LEVEL", "INFO"),
+            docker_registry_url=env.get("DOCKER_REGISTRY_URL", ""),
+            docker_registry_ca_file=env.get("DOCKER_REGISTRY_CA_FILE"),
+            docker_images_filter=env.get("DOCKER_IMAGES_FILTER", r".*"),
+            docker_tags_filter=env.get("DOCKER_TAGS_FILTER", r".*"),
+            image_list_nbr_max=int(env.get("IMAGE_LIST_NBR_MAX", "1000")),
+            https_connection_timeout=int(env.get("HTTP_CONNECTION_TIMEOUT", "3")),
+            force=str2bool(string=env.get("FORCE", "NO")),
+            dry_run=str2bool(string=env.get("DRY_RUN", "YES")),
+            cleaner_concurrency=int(env.get("CLEANER_CONCURRENCY", "1")),
+            tag_list_nbr_max=int(env.get("TAG_LIST_NBR_MAX", "1000")),
+            state_file=env.get("STATE_FILE"),
+            state_digest_ttl=int(env.get("STATE_DIGEST_TTL", "604800")),
+            state_report=str2bool(string=env.get("STATE_REPORT", "NO")),
+            retention_keep_last=int(env.get("RETENTION_KEEP_LAST", "0")),
+            retention_older_than_days=int(env.get("RETENTION_OLDER_THAN_DAYS", "0")),
+            retention_keep_semver=int(env.get("RETENTION_KEEP_SEMVER", "0")),
+            docker_images_exclude=env.get("DOCKER_IMAGES_EXCLUDE", ""),
+            docker_tags_exclude=env.get("DOCKER_TAGS_EXCLUDE", ""),
+            rate_limit=float(env.get("RATE_LIMIT", "0")),
+            retry_max=int(env.get("RETRY_MAX", "3")),
+            retry_backoff_base=float(env.get("RETRY_BACKOFF_BASE", "0.5")),
+            docker_registry_username=env.get("DOCKER_REGISTRY_USERNAME"),
+            docker_registry_password=env.get("DOCKER_REGISTRY_PASSWORD"),
+            metrics_file=env.get("METRICS_FILE"),
+            metrics_pushgateway_url=env.get("METRICS_PUSHGATEWAY_URL"),
+            metrics_job=env.get("METRICS_JOB", "docker_registry_cleaner"),
+            metrics_format=env.get("METRICS_FORMAT", "prometheus"),
+            events_file=env.get("EVENTS_FILE"),
+            summary_failures_max=int(env.get("SUMMARY_FAILURES_MAX", "10")),
+            shard_index=int(env.get("SHARD_INDEX", "0")),
+            shard_count=int(env.get("SHARD_COUNT", "1")),
+            checkpoint_file=env.get("CHECKPOINT_FILE"),
+            gc_estimate=str2bool(string=env.get("GC_ESTIMATE", "NO")),
+            gc_batch_size=int(env.get("GC_BATCH_SIZE", "16")),
+            tags_cache_file=env.get("TAGS_CACHE_FILE"),
+            config_file=env.get("CONFIG_FILE"),
+            delete_pipeline_depth=int(env.get("DELETE_PIPELINE_DEPTH", "1")),
+            profile=str2bool(string=env.get("PROFILE", "NO")),
+            profile_file=env.get("PROFILE_FILE"),
+            protected_file=env.get("PROTECTED_FILE"),
+        )
+
+    def with_settings(self, settings: Mapping[str, Any]) -> "Config":
+        """Get a copy with other settings (field names, type checked)"""
+
+        defaults: Config = Config()
+        values: dict[str, Any] = dict(zip(Config._fields, self))
+        for key, value in settings.items():
+            if key not in values:
+                raise ValueError(f"Unknown setting '{key}'")
+            default: Any = getattr(defaults, key)
+            expected: type = type(default) if default is not None else str
+            # bool is an int subclass: booleans only for boolean settings
+            if isinstance(value, bool) == (expected is bool):
+                if expected is float and isinstance(value, int):
+                    value = float(value)
+                if isinstance(value, expected):
+                    values[key] = value
+                    continue
+            raise ValueError(f"Setting '{key}' must be a {expected.__name__}")
+        return Config(**values)
+
+
+def load_registries(path: str, base: Config) -> tuple[int, dict[str, Config]]:
+    """Load the registries of a TOML file: (concurrency budget, configs by name)
+
+    Each `[registries.<name>]` table overrides the `[defaults]` table, which
+    overrides `base` (environment). Keys are the lowercase environment
+    variable names. `concurrency` (top level) is the number of concurrent
+    requests shared by all registries (default: sum of their concurrency).
+    """
+
+    # pylint: disable-next=import-outside-toplevel
+    from tomllib import load
+
+    with open(path, mode="rb") as file:
+        data: dict[str, Any] = load(file)
+    if unknown := set(data) - {"concurrency", "defaults", "registries"}:
+        raise ValueError(f"Unknown configuration keys: {sorted(unknown)}")
+    defaults: Config = base.with_settings(settings=data.get("defaults", {}))
+    registries: dict[str, Config] = {
+        name: defaults.with_settings(settings=settings)
+        for name, settings in data.get("registries", {}).items()
+    }
+    if not registries:
+        raise ValueError(f"No registries in '{path}'")
+
+    for key in PER_REGISTRY_FILES:
+        values: list[str] = [
+            value
+            for config in registries.values()
+            if (value := getattr(config, key)) and value != "-"
+        ]
+        if len(values) != len(set(values)):
+            raise ValueError(f"Setting '{key}' must differ per registry")
+
+    concurrency: Any = data.get(
+        "concurrency",
+        sum(config.cleaner_concurrency for config in registries.values()),
+    )
+    if not isinstance(concurrency, int) or isinstance(concurrency, bool):
+        raise ValueError("Setting 'concurrency' must be a positive int")
+    if concurrency < 1:
+        raise ValueError("Setting 'concurrency' must be a positive int")
+    return concurrency, registries
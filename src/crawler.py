@@ -0,0 +1,45 @@
+"""Concurrent Tags Lists Crawl"""
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import local
+from typing import Callable, Iterable, Iterator, Optional
+from docker_registry_client import DockerRegistryClient
+
+
+def crawl_tags(
+    client_factory: Callable[[], DockerRegistryClient],
+    images: Iterable[str],
+    concurrency: int = 1,
+    number_max: Optional[int] = None,
+) -> Iterator[tuple[str, list[str]]]:
+    """List the tags of Docker images concurrently, yielded in catalog order
+
+    Every worker thread owns its own client. Images are consumed lazily: at
+    most `2 * concurrency` tags lists are pending at once.
+    """
+
+    clients = local()
+
+    def list_tags(image: str) -> list[str]:
+        client: Optional[DockerRegistryClient] = getattr(clients, "client", None)
+        if client is None:
+            client = clients.client = client_factory()
+        return [
+            image_tag.tag
+            for image_tag in client.get_image_tags(image=image, number_max=number_max)
+        ]
+
+    concurrency = max(1, concurrency)
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="crawler"
+    ) as executor:
+        pending: deque[tuple[str, Future]] = deque()
+        for image in images:
+            pending.append((image, executor.submit(list_tags, image)))
+            if len(pending) >= 2 * concurrency:
+                image, future = pending.popleft()
+                yield image, future.result()
+        while pending:
+            image, future = pending.popleft()
+            yield image, future.result()
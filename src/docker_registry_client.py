@@ -1,18 +1,100 @@
 """Docker Registry Client"""
 
-from http.client import HTTPSConnection, HTTPResponse, HTTPException
-from urllib.parse import urlparse, ParseResult
+from collections import deque
+from datetime import datetime
+from http.client import HTTPConnection, HTTPSConnection, HTTPResponse, HTTPException
+from itertools import islice
+from socket import create_connection, socket
+from urllib.parse import quote, urljoin, urlparse, urlunparse, ParseResult
 from json import loads
-from re import search
 from ssl import SSLContext, PROTOCOL_TLS_CLIENT, CERT_REQUIRED
-from typing import Optional
+from time import monotonic, sleep
+from typing import BinaryIO, Iterable, Iterator, NamedTuple, Optional
+from auth import TokenAuthenticator
+from http_parser import ParsedResponse, read_response
+from image_tag import ImageTag
+from json_stream import CHUNK_SIZE, iter_json_strings
 from logger import logger
+from metrics import MetricsHook
+from matcher import Matcher, get_matcher
+from rate_limiter import RETRYABLE_STATUSES, AdaptiveRateLimiter, RetryPolicy
+from tags_cache import CachedTagsPage, TagsListCache
+from utils import get_next_link, parse_datetime, parse_retry_after
+
+MANIFEST_MEDIA_TYPES: tuple[str, ...] = (
+    "application/vnd.docker.distribution.manifest.v2+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.oci.image.index.v1+json",
+)
+
+REDIRECT_STATUSES: frozenset[int] = frozenset((301, 302, 303, 307, 308))
+PERMANENT_REDIRECT_STATUSES: frozenset[int] = frozenset((301, 308))
+REDIRECTS_MAX: int = 5
+REDIRECT_CACHE_SIZE: int = 1024
+# Bulk deletions: items read (and grouped by repository) at once
+DELETE_BATCH_SIZE: int = 256
+
+
+class DeleteResult(NamedTuple):
+    """Result of one manifest deletion of a bulk delete"""
+
+    image: str
+    digest: str
+    deleted: bool
+    latency: float
+
+
+def open_pipelined_connection(
+    host: str, port: int, timeout: int, ssl_context: SSLContext
+) -> socket:
+    """Open a TLS connection used for pipelined requests"""
+
+    return ssl_context.wrap_socket(
+        sock=create_connection(address=(host, port), timeout=timeout),
+        server_hostname=host,
+    )
+
+
+def get_redirect_url(url: str, location: str) -> str:
+    """Get the URL a 'Location' header points to (registry URLs are paths)"""
+
+    if urlparse(url=location).scheme or urlparse(url=url).scheme:
+        return urljoin(url, location)
+    if location.startswith("/"):
+        return location
+    return f"{url.partition('?')[0].rpartition('/')[0]}/{location}"
+
+
+def get_ssl_context(ca_file: Optional[str] = None) -> SSLContext:
+    """Get TLS client context (custom CA file or system default CAs)"""
+
+    ssl_context: SSLContext = SSLContext(
+        protocol=PROTOCOL_TLS_CLIENT, verify_mode=CERT_REQUIRED
+    )
+    if ca_file:
+        ssl_context.load_verify_locations(cafile=ca_file)
+    else:
+        ssl_context.load_default_certs()
+    return ssl_context
+
+
+def get_manifest_accept(media_type: Optional[str] = None) -> str:
+    """Get manifest Accept header value (known media type of repository first)"""
+
+    if media_type is None:
+        return ", ".join(MANIFEST_MEDIA_TYPES)
+    return ", ".join(
+        (media_type, *(other for other in MANIFEST_MEDIA_TYPES if other != media_type))
+    )
 
 
 class DockerRegistryClient:
     """DockerRegistryClient Class"""
 
     https_connection: HTTPSConnection
+    manifest_media_types: dict[str, str]
+    configs_created: dict[str, Optional[datetime]]
     registry_host: str
     registry_port: int
     registry_path: str
@@ -22,6 +104,11 @@ class DockerRegistryClient:
         registry_url: str,
         ca_file: Optional[str] = None,
         timeout: int = 3,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        authenticator: Optional[TokenAuthenticator] = None,
+        metrics: Optional[MetricsHook] = None,
+        tags_cache: Optional[TagsListCache] = None,
     ) -> None:
         if not registry_url.startswith("https://"):
             raise ValueError("Docker registry URL must start with 'https://'")
@@ -31,45 +118,337 @@ class DockerRegistryClient:
         self.registry_host: str = parse_result.hostname if parse_result.hostname else ""
         self.registry_port: int = parse_result.port if parse_result.port else 443
         self.registry_path = parse_result.path
+        # Manifest media type served by the registry per repository
+        self.manifest_media_types = {}
+        # Image creation date per config blob digest
+        self.configs_created = {}
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.authenticator = authenticator
+        self.metrics = metrics if metrics is not None else MetricsHook()
+        self.tags_cache = tags_cache
+        self.timeout = timeout
+        # Permanent (301/308) redirects: URL -> final URL
+        self.redirects: dict[str, str] = {}
+        # Last response per connection (read before the next request)
+        self.__responses: dict[HTTPConnection, HTTPResponse] = {}
+        self.ssl_context: SSLContext = get_ssl_context(ca_file=ca_file)
 
-        ssl_context: SSLContext = SSLContext(
-            protocol=PROTOCOL_TLS_CLIENT, verify_mode=CERT_REQUIRED
-        )
-        if ca_file:
-            ssl_context.load_verify_locations(cafile=ca_file)
-        else:
-            ssl_context.load_default_certs()
         self.https_connection = HTTPSConnection(  # nosemgrep: bandit.B309
             host=self.registry_host,
             port=self.registry_port,
             timeout=timeout,
-            context=ssl_context,
+            context=self.ssl_context,
+        )
+        # Connections per origin (scheme, host, port), e.g. redirects to S3/CDN
+        self.registry_origin: tuple[str, str, int] = (
+            "https",
+            self.registry_host,
+            self.registry_port,
+        )
+        self.connections: dict[tuple[str, str, int], HTTPConnection] = {
+            self.registry_origin: self.https_connection
+        }
+
+    def close(self) -> None:
+        """Close every connection (registry and redirect targets)"""
+
+        for connection in self.connections.values():
+            connection.close()
+
+    def __route(self, url: str) -> tuple[HTTPConnection, str, bool]:
+        """Get the (reused) connection of an URL origin and the request target
+
+        Relative URLs and absolute URLs of the registry origin go to the
+        registry connection (True), other origins get their own connection.
+        """
+
+        parse_result: ParseResult = urlparse(url=url)
+        if not parse_result.scheme:
+            return self.https_connection, url, True
+        scheme: str = parse_result.scheme
+        origin: tuple[str, str, int] = (
+            scheme,
+            parse_result.hostname or "",
+            parse_result.port or (443 if scheme == "https" else 80),
         )
+        target: str = urlunparse(parse_result._replace(scheme="", netloc="")) or "/"
+        if origin == self.registry_origin:
+            return self.https_connection, target, True
+
+        connection: Optional[HTTPConnection] = self.connections.get(origin)
+        if connection is None:
+            if scheme == "https":
+                connection = HTTPSConnection(  # nosemgrep: bandit.B309
+                    host=origin[1],
+                    port=origin[2],
+                    timeout=self.timeout,
+                    context=get_ssl_context(),
+                )
+            elif scheme == "http":
+                connection = HTTPConnection(
+                    host=origin[1], port=origin[2], timeout=self.timeout
+                )
+            else:
+                raise HTTPException(f"Unsupported redirect URL scheme: {url}")
+            self.connections[origin] = connection
+        return connection, target, False
+
+    def __perform(
+        self, url: str, method: str, headers: Optional[dict[str, str]] = None
+    ) -> tuple[HTTPResponse, bool]:
+        """Send a request (rate limited), retry on throttling and network errors
+
+        Returns the response and whether an earlier attempt may have been
+        processed (network error, 5xx), unlike throttled (429) or challenged
+        (401) attempts the registry answered without processing them.
+        """
+
+        connection, target, is_registry = self.__route(url=url)
+        attempt: int = 0
+        challenged: bool = False
+        processed: bool = False
+        while True:
+            # Body left unread by a caller: read it, the connection stays usable
+            previous: Optional[HTTPResponse] = self.__responses.pop(connection, None)
+            if previous is not None and not previous.isclosed():
+                _ = previous.read()
+            request_headers: dict[str, str] = dict(headers or {})
+            # Credentials are never sent to another origin (e.g. presigned URLs)
+            if (
+                is_registry
+                and self.authenticator is not None
+                and (authorization := self.authenticator.get_authorization(url=url))
+            ):
+                request_headers["Authorization"] = authorization
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            started: float = monotonic()
+            try:
+                connection.request(method=method, url=target, headers=request_headers)
+                response: HTTPResponse = connection.getresponse()
+                latency: float = monotonic() - started
+                self.__responses[connection] = response
+            except (OSError, HTTPException) as exception:
+                self.metrics.on_request(
+                    url=url,
+                    method=method,
+                    status=None,
+                    duration=monotonic() - started,
+                )
+                # Broken connection: a new one is opened by the next request
+                connection.close()
+                self.metrics.on_reconnect(url=url)
+                if attempt >= self.retry_policy.max_retries:
+                    raise
+                processed = True
+                delay: float = self.retry_policy.get_delay(attempt=attempt)
+                logger.warning(
+                    msg=f"🔁 {method} {url}: {exception!r} (retry in {delay:.2f}s)"
+                )
+            else:
+                self.metrics.on_request(
+                    url=url,
+                    method=method,
+                    status=response.status,
+                    duration=latency,
+                    size=(
+                        int(response.getheader(name="content-length") or 0)
+                        if method != "HEAD"
+                        else 0
+                    ),
+                )
+                if (
+                    response.status == 401
+                    and is_registry
+                    and self.authenticator is not None
+                    and not challenged
+                    and (challenge := response.getheader(name="www-authenticate"))
+                ):
+                    # Avoid http.client.ResponseNotReady: Request-sent
+                    _ = response.read()
+                    challenged = True
+                    if self.authenticator.on_challenge(
+                        url=url, www_authenticate=challenge
+                    ):
+                        continue
+                    return response, processed
+                if (
+                    response.status not in RETRYABLE_STATUSES
+                    or attempt >= self.retry_policy.max_retries
+                ):
+                    if self.rate_limiter is not None and response.status < 400:
+                        self.rate_limiter.on_success(latency=latency)
+                    return response, processed
+                processed = processed or response.status >= 500
+                # Avoid http.client.ResponseNotReady: Request-sent
+                _ = response.read()
+                retry_after: Optional[float] = parse_retry_after(
+                    value=response.getheader(name="retry-after")
+                )
+                if self.rate_limiter is not None and response.status == 429:
+                    self.rate_limiter.on_throttled(retry_after=retry_after)
+                delay = self.retry_policy.get_delay(
+                    attempt=attempt, retry_after=retry_after
+                )
+                logger.warning(
+                    msg=(
+                        f"🔁 {method} {url}: HTTP {response.status} "
+                        f"(retry in {delay:.2f}s)"
+                    )
+                )
+            self.metrics.on_retry(url=url, method=method)
+            sleep(delay)
+            attempt += 1
+
+    def __send(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[dict[str, str]] = None,
+        sent: bool = False,
+    ) -> HTTPResponse:
+        """Send a request, following (at most REDIRECTS_MAX) redirects
+
+        `sent`: the request was already sent once (e.g. pipelined), a DELETE
+        answered 404 was then processed by that earlier attempt.
+        """
+
+        # Known permanent redirects: go to the final URL directly
+        for _ in range(REDIRECTS_MAX):
+            if url not in self.redirects:
+                break
+            url = self.redirects[url]
+
+        for _ in range(REDIRECTS_MAX + 1):
+            response, processed = self.__perform(
+                url=url, method=method, headers=headers
+            )
+            if response.status in range(200, 300):
+                return response
+            if method == "DELETE" and (sent or processed) and response.status == 404:
+                # Deleted by an earlier attempt (timeout, server error)
+                logger.info(msg=f"{method} {url}: HTTP 404 on retry, already deleted")
+                return response
+            # Conditional request: cached content still valid
+            if response.status == 304 and (
+                "If-None-Match" in (headers or {})
+                or "If-Modified-Since" in (headers or {})
+            ):
+                return response
 
-    def __request(self, url: str, method: str = "GET") -> bytes | None:
-        self.https_connection.request(method=method, url=url)
-        response: HTTPResponse = self.https_connection.getresponse()
-        if response.status not in range(200, 300):
             # Detect redirect URL
             location_header: Optional[str] = response.getheader(name="location")
-            if location_header is not None:
-                logger.info(msg=f"Redirect detected: {url} -> {location_header}")
+            if location_header is None or response.status not in REDIRECT_STATUSES:
                 # Avoid http.client.ResponseNotReady: Request-sent
                 _ = response.read()
-                return self.__request(url=location_header, method=method)
+                # Raise HTTPException
+                raise HTTPException(
+                    f"Received HTTP code != 200: {response.status} -> {response.reason}"
+                )
+            # Avoid http.client.ResponseNotReady: Request-sent
+            _ = response.read()
+            location: str = get_redirect_url(url=url, location=location_header)
+            logger.info(msg=f"Redirect detected: {url} -> {location}")
+            self.metrics.on_redirect(url=url, location=location)
+            if response.status in PERMANENT_REDIRECT_STATUSES:
+                if len(self.redirects) >= REDIRECT_CACHE_SIZE:
+                    del self.redirects[next(iter(self.redirects))]
+                self.redirects[url] = location
+            if response.status == 303:
+                method = "GET"
+            url = location
 
-            # Raise HTTPException
-            raise HTTPException(
-                f"Received HTTP code != 200: {response.status} -> {response.reason}"
-            )
-        body: bytes | None = response.read()
+        raise HTTPException(f"Too many redirects (> {REDIRECTS_MAX}): {url}")
+
+    def __request(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[dict[str, str]] = None,
+        sent: bool = False,
+    ) -> bytes | None:
+        body: bytes | None = self.__send(
+            url=url, method=method, headers=headers, sent=sent
+        ).read()
         return loads(body) if body else body
 
-    def __request_get_header_value(
-        self, url: str, headers: dict[str, str], header_name: str
-    ) -> str | None:
-        self.https_connection.request(method="HEAD", url=url, headers=headers)
-        response: HTTPResponse = self.https_connection.getresponse()
+    def __read_strings(self, response: HTTPResponse, key: str) -> Iterator[str]:
+        """Stream the strings of a JSON array member of a response body"""
+
+        try:
+            yield from iter_json_strings(stream=response, key=key)
+        finally:
+            # Stopped early: read the rest to keep the connection reusable
+            while response.read(CHUNK_SIZE):
+                pass
+
+    def __request_strings(self, url: str, key: str) -> Iterator[str]:
+        """Follow 'Link: <...>; rel="next"' pagination, streaming `key` items"""
+
+        next_url: Optional[str] = url
+        while next_url is not None:
+            response: HTTPResponse = self.__send(url=next_url)
+            next_url = self.__with_registry_path(
+                url=get_next_link(link_header=response.getheader(name="link"))
+            )
+            yield from self.__read_strings(response=response, key=key)
+
+    def __request_tags_pages(self, url: str) -> Iterator[Iterable[str]]:
+        """Follow tags list pages, revalidating cached pages (304: cache hit)
+
+        Pages are streamed unless they are cached (validators sent).
+        """
+
+        next_url: Optional[str] = url
+        while next_url is not None:
+            page_url: str = next_url
+            cached: Optional[CachedTagsPage] = (
+                self.tags_cache.get(url=page_url)
+                if self.tags_cache is not None
+                else None
+            )
+            headers: dict[str, str] = {}
+            if cached is not None and cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached is not None and cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+            response: HTTPResponse = self.__send(url=page_url, headers=headers)
+            if response.status == 304 and cached is not None:
+                # Avoid http.client.ResponseNotReady: Request-sent
+                _ = response.read()
+                next_url = cached.next_url
+                yield cached.tags
+                continue
+
+            next_url = self.__with_registry_path(
+                url=get_next_link(link_header=response.getheader(name="link"))
+            )
+            tags: Iterator[str] = self.__read_strings(response=response, key="tags")
+            etag: Optional[str] = response.getheader(name="etag")
+            last_modified: Optional[str] = response.getheader(name="last-modified")
+            if self.tags_cache is None or not (etag or last_modified):
+                yield tags
+                continue
+            page: CachedTagsPage = CachedTagsPage(
+                etag=etag,
+                last_modified=last_modified,
+                tags=list(tags),
+                next_url=next_url,
+            )
+            self.tags_cache.set(url=page_url, page=page)
+            yield page.tags
+
+    def __with_registry_path(self, url: Optional[str]) -> Optional[str]:
+        registry_path: str = self.registry_path.rstrip("/")
+        if url is None or not registry_path or url.startswith(registry_path):
+            return url
+        return f"{registry_path}{url}"
+
+    def __request_get_header_values(
+        self, url: str, headers: dict[str, str], header_names: tuple[str, ...]
+    ) -> tuple[str, ...]:
+        response, _ = self.__perform(url=url, method="HEAD", headers=headers)
         if response.status != 200:
             # Avoid http.client.ResponseNotReady: Request-sent
             _ = response.read()
@@ -78,65 +457,326 @@ class DockerRegistryClient:
                 "Received HTTP code != 200: "
                 f"{response.status} -> {response.reason} ({url=})"
             )
-        value: str | None = response.getheader(name=header_name)
+        values: tuple[str, ...] = tuple(
+            response.getheader(name=header_name) or "" for header_name in header_names
+        )
         # Avoid http.client.ResponseNotReady: Request-sent
         _ = response.read()
-        return value if value is not None else ""
+        return values
 
-    def get_images(self, number_max: int = 500, pattern: str = r".*") -> list[str]:
-        """DockerClient Get Images Method"""
+    def get_images(
+        self,
+        number_max: int = 500,
+        pattern: str | Matcher = r".*",
+        last: Optional[str] = None,
+    ) -> Iterator[str]:
+        """DockerClient Get Images Method (streamed, `number_max` per page)
 
-        images: list[str] = dict(
-            self.__request(url=f"{self.registry_path}/v2/_catalog?n={number_max}")
-        ).get("repositories")
+        Images are listed in catalog order, starting after `last` if given.
+        Response bodies are parsed incrementally (one name at a time).
+        """
 
-        return [image for image in images if search(pattern=pattern, string=image)]
+        matcher: Matcher = get_matcher(pattern=pattern)
+        for image in self.__request_strings(
+            url=f"{self.registry_path}/v2/_catalog?n={number_max}"
+            + (f"&last={quote(last)}" if last else ""),
+            key="repositories",
+        ):
+            if matcher(image):
+                yield image
 
-    def get_image_tags(self, image: str, pattern: str = r".*") -> list[str]:
-        """DockerClient Get Image Tags Method"""
+    def get_image_tags(
+        self,
+        image: str,
+        pattern: str | Matcher = r".*",
+        number_max: Optional[int] = None,
+    ) -> Iterator[ImageTag]:
+        """DockerClient Get Image Tags Method (streamed, `number_max` per page)
 
-        tags: list[str] = dict(
-            self.__request(url=f"{self.registry_path}/v2/{image}/tags/list")
-        ).get("tags")
-        if not tags:
-            return []
-        return [f"{image}:{tag}" for tag in tags if search(pattern=pattern, string=tag)]
+        Pages are revalidated with conditional requests if a tags cache is set.
+        """
 
-    def get_image_tag_digest(self, image_tag: str) -> str | None:
-        """Method that returns Docker image digest"""
+        matcher: Matcher = get_matcher(pattern=pattern)
+        query: str = f"?n={number_max}" if number_max else ""
+        for tags in self.__request_tags_pages(
+            url=f"{self.registry_path}/v2/{image}/tags/list{query}"
+        ):
+            for tag in tags:
+                if matcher(tag):
+                    yield ImageTag(image=image, tag=tag)
 
-        try:
-            (image, tag) = image_tag.split(":")
-        except ValueError:
-            image: str = image_tag
-            tag: str = "latest"
+    def get_image_tag_digest(self, image_tag: ImageTag | str) -> str | None:
+        """Method that returns Docker image digest (single HEAD request)"""
 
-        url: str = f"/v2/{image}/manifests/{tag}"
+        if isinstance(image_tag, str):
+            image_tag = ImageTag.parse(reference=image_tag)
+        image, tag = image_tag.image, image_tag.tag
 
         try:
-            return self.__request_get_header_value(
-                url=url,
+            digest, media_type = self.__request_get_header_values(
+                url=f"/v2/{image}/manifests/{tag}",
                 headers={
-                    "Accept": "application/vnd.docker.distribution.manifest.v2+json"
+                    "Accept": get_manifest_accept(
+                        media_type=self.manifest_media_types.get(image)
+                    )
                 },
-                header_name="Docker-Content-Digest",
+                header_names=("Docker-Content-Digest", "Content-Type"),
             )
         except HTTPException:
-            try:
-                return self.__request_get_header_value(
-                    url=url,
-                    headers={"Accept": "application/vnd.oci.image.manifest.v1+json"},
-                    header_name="Docker-Content-Digest",
+            return None
+        if media_type in MANIFEST_MEDIA_TYPES:
+            self.manifest_media_types[image] = media_type
+        return digest
+
+    def get_image_manifest(self, image: str, reference: str) -> dict:
+        """Method that returns Docker image manifest (tag or digest reference)"""
+
+        return dict(
+            self.__request(
+                url=f"/v2/{image}/manifests/{reference}",
+                headers={
+                    "Accept": get_manifest_accept(
+                        media_type=self.manifest_media_types.get(image)
+                    )
+                },
+            )
+        )
+
+    def get_image_blobs(self, image: str, digest: str) -> list[tuple[str, int]]:
+        """Method that returns (digest, size) of the blobs of a manifest
+
+        Platform manifests of a manifest list / OCI index are followed.
+        """
+
+        manifest: dict = self.get_image_manifest(image=image, reference=digest)
+        blobs: list[tuple[str, int]] = []
+        for child in manifest.get("manifests") or []:
+            blobs.append((child["digest"], int(child.get("size") or 0)))
+            blobs.extend(self.get_image_blobs(image=image, digest=child["digest"]))
+        if config := manifest.get("config"):
+            blobs.append((config["digest"], int(config.get("size") or 0)))
+        blobs.extend(
+            (layer["digest"], int(layer.get("size") or 0))
+            for layer in manifest.get("layers") or []
+        )
+        # Schema 1 manifests: no sizes
+        blobs.extend((layer["blobSum"], 0) for layer in manifest.get("fsLayers") or [])
+        return blobs
+
+    def get_image_tag_created(self, image_tag: ImageTag | str) -> Optional[datetime]:
+        """Method that returns Docker image creation date (from config blob)
+
+        Config blobs are cached by digest since they are shared across tags.
+        """
+
+        if isinstance(image_tag, str):
+            image_tag = ImageTag.parse(reference=image_tag)
+        image, tag = image_tag.image, image_tag.tag
+        try:
+            manifest: dict = self.get_image_manifest(image=image, reference=tag)
+            if "manifests" in manifest and manifest["manifests"]:
+                # Manifest list / OCI index: use the first platform manifest
+                manifest = self.get_image_manifest(
+                    image=image, reference=manifest["manifests"][0]["digest"]
                 )
-            except HTTPException:
-                return None
+            config_digest: str = manifest["config"]["digest"]
+            if config_digest not in self.configs_created:
+                image_config: dict = dict(
+                    self.__request(url=f"/v2/{image}/blobs/{config_digest}")
+                )
+                self.configs_created[config_digest] = parse_datetime(
+                    value=image_config.get("created")
+                )
+        except (HTTPException, KeyError, IndexError, TypeError, ValueError) as error:
+            logger.warning(msg=f"Cannot get creation date of '{image_tag}': {error}")
+            return None
+        return self.configs_created[config_digest]
 
     def delete_image(self, image: str, digest: str) -> bool:
         """Method that delete a Docker image using digest"""
 
+        return self.__delete_manifest(image=image, digest=digest, sent=False)
+
+    def __delete_manifest(self, image: str, digest: str, sent: bool) -> bool:
+        """Delete a manifest (`sent`: maybe processed by an earlier request)"""
+
         try:
-            self.__request(url=f"/v2/{image}/manifests/{digest}", method="DELETE")
+            self.__request(
+                url=f"/v2/{image}/manifests/{digest}", method="DELETE", sent=sent
+            )
         except HTTPException as exception:
             logger.warning(msg=exception)
             return False
         return True
+
+    def delete_images(
+        self, items: Iterable[tuple[str, str]], depth: int = 1
+    ) -> Iterator[DeleteResult]:
+        """Delete manifests in bulk: (image, digest) items, results streamed
+
+        Items are read DELETE_BATCH_SIZE at a time and grouped by repository
+        (same authorization scope). With `depth` > 1, up to `depth` DELETE
+        requests are in flight on one connection (HTTP/1.1 pipelining): the
+        round trip time is paid once per window instead of once per manifest.
+        """
+
+        iterator: Iterator[tuple[str, str]] = iter(items)
+        while batch := list(islice(iterator, DELETE_BATCH_SIZE)):
+            # Stable sort: digests of a repository keep their order
+            batch.sort(key=lambda item: item[0])
+            if depth > 1:
+                yield from self.__delete_pipelined(items=batch, depth=depth)
+                continue
+            for image, digest in batch:
+                started: float = monotonic()
+                deleted: bool = self.delete_image(image=image, digest=digest)
+                yield DeleteResult(
+                    image=image,
+                    digest=digest,
+                    deleted=deleted,
+                    latency=monotonic() - started,
+                )
+
+    def __get_pipelined_request(self, url: str) -> bytes:
+        host: str = (
+            self.registry_host
+            if self.registry_port == 443
+            else f"{self.registry_host}:{self.registry_port}"
+        )
+        headers: list[str] = [
+            f"DELETE {url} HTTP/1.1",
+            f"Host: {host}",
+            "Accept-Encoding: identity",
+            "Content-Length: 0",
+        ]
+        if self.authenticator is not None and (
+            authorization := self.authenticator.get_authorization(url=url)
+        ):
+            headers.append(f"Authorization: {authorization}")
+        return ("\r\n".join(headers) + "\r\n\r\n").encode(encoding="latin-1")
+
+    def __delete_pipelined(
+        self, items: list[tuple[str, str]], depth: int
+    ) -> Iterator[DeleteResult]:
+        """Pipelined DELETE requests on a dedicated registry connection
+
+        Requests not answered when the connection breaks or is closed by the
+        registry are sent again on a new connection. A broken connection may
+        have processed them already: a resent DELETE answered 404 is deleted.
+        Requests after a `Connection: close` response were not processed.
+        Responses needing more than one request (authentication challenge,
+        throttling, server errors, redirects) fall back to single requests.
+        """
+
+        # (image, digest, sent before)
+        waiting: deque[tuple[str, str, bool]] = deque(
+            (image, digest, False) for image, digest in items
+        )
+        in_flight: deque[tuple[str, str, bool, float]] = deque()
+        fallback: list[tuple[str, str, bool]] = []
+        connection: Optional[socket] = None
+        stream: Optional[BinaryIO] = None
+        failures: int = 0
+        try:
+            while waiting or in_flight:
+                try:
+                    if connection is None:
+                        connection = open_pipelined_connection(
+                            host=self.registry_host,
+                            port=self.registry_port,
+                            timeout=self.timeout,
+                            ssl_context=self.ssl_context,
+                        )
+                        stream = connection.makefile(mode="rb")
+                    while waiting and len(in_flight) < depth:
+                        image, digest, sent = waiting.popleft()
+                        url: str = f"/v2/{image}/manifests/{digest}"
+                        if url in self.redirects:
+                            fallback.append((image, digest, sent))
+                            continue
+                        if self.rate_limiter is not None:
+                            self.rate_limiter.acquire()
+                        in_flight.append((image, digest, sent, monotonic()))
+                        connection.sendall(self.__get_pipelined_request(url=url))
+                    if not in_flight:
+                        continue
+                    response: ParsedResponse = read_response(
+                        stream=stream, method="DELETE"
+                    )
+                except (OSError, HTTPException) as exception:
+                    failures += 1
+                    if connection is not None:
+                        connection.close()
+                        connection = stream = None
+                    self.metrics.on_reconnect(url="/v2/")
+                    # Unanswered requests are sent again
+                    waiting.extendleft(
+                        (image, digest, True)
+                        for image, digest, _, _ in reversed(in_flight)
+                    )
+                    in_flight.clear()
+                    if failures > self.retry_policy.max_retries:
+                        logger.warning(msg=f"🔁 Pipelined DELETE: {exception!r}")
+                        fallback.extend(waiting)
+                        waiting.clear()
+                    continue
+
+                failures = 0
+                image, digest, sent, started = in_flight.popleft()
+                latency: float = monotonic() - started
+                url = f"/v2/{image}/manifests/{digest}"
+                status: int = response.status
+                self.metrics.on_request(
+                    url=url, method="DELETE", status=status, duration=latency
+                )
+                if status in range(200, 300) or (sent and status == 404):
+                    if status == 404:
+                        # Deleted by the unanswered request sent before
+                        logger.info(msg=f"DELETE {url}: HTTP 404 on resend, deleted")
+                    elif self.rate_limiter is not None:
+                        self.rate_limiter.on_success(latency=latency)
+                    yield DeleteResult(
+                        image=image, digest=digest, deleted=True, latency=latency
+                    )
+                elif (
+                    status in RETRYABLE_STATUSES
+                    or status in REDIRECT_STATUSES
+                    or (status == 401 and self.authenticator is not None)
+                ):
+                    # Server errors may come after the deletion was processed
+                    fallback.append((image, digest, sent or status >= 500))
+                else:
+                    logger.warning(
+                        msg=(
+                            f"Received HTTP code != 200: {status} -> "
+                            f"{response.reason} ({url=})"
+                        )
+                    )
+                    yield DeleteResult(
+                        image=image, digest=digest, deleted=False, latency=latency
+                    )
+                if not response.keep_alive:
+                    # Closed by the registry: later requests were not processed,
+                    # sent again as they were
+                    connection.close()
+                    connection = stream = None
+                    waiting.extendleft(
+                        (image, digest, sent)
+                        for image, digest, sent, _ in reversed(in_flight)
+                    )
+                    in_flight.clear()
+        finally:
+            if connection is not None:
+                connection.close()
+
+        for image, digest, sent in fallback:
+            started = monotonic()
+            deleted: bool = self.__delete_manifest(
+                image=image, digest=digest, sent=sent
+            )
+            yield DeleteResult(
+                image=image,
+                digest=digest,
+                deleted=deleted,
+                latency=monotonic() - started,
+            )
@@ -0,0 +1,88 @@
+"""Structured Run Events (JSON Lines) And Streaming Summary"""
+
+import sys
+from datetime import datetime, timezone
+from json import dumps
+from typing import Any, Optional, TextIO
+from image_tag import ImageTag
+
+RESULTS: tuple[str, ...] = ("deleted", "failed", "dry_run", "kept")
+
+
+class EventWriter:
+    """JSON-lines event stream, one record per action, written incrementally"""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    @classmethod
+    def open(cls, path: str) -> "EventWriter":
+        """Open an event stream on a file (appended) or stdout ('-')"""
+
+        if path == "-":
+            return cls(stream=sys.stdout)
+        # pylint: disable=consider-using-with
+        return cls(stream=open(path, mode="a", encoding="utf-8", buffering=1))
+
+    def __enter__(self) -> "EventWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def write(self, **fields: Any) -> None:
+        """Write one event record"""
+
+        record: dict[str, Any] = {
+            "time": datetime.now(tz=timezone.utc).isoformat(timespec="milliseconds"),
+            **fields,
+        }
+        self.stream.write(dumps(obj=record, separators=(",", ":")) + "\n")
+
+    def close(self) -> None:
+        """Flush the stream (and close it unless it is stdout)"""
+
+        if self.stream is sys.stdout:
+            self.stream.flush()
+        else:
+            self.stream.close()
+
+
+class RunSummary:
+    """Running counters per result and a bounded sample of failures
+
+    Memory does not depend on the number of processed tags: only the first
+    `failures_max` failures and the count of each failure reason are kept.
+    """
+
+    def __init__(self, failures_max: int = 10) -> None:
+        self.failures_max = failures_max
+        self.counts: dict[str, int] = dict.fromkeys(RESULTS, 0)
+        self.reasons: dict[str, int] = {}
+        self.failures: list[str] = []
+
+    @property
+    def deleted(self) -> int:
+        """Number of deleted tags"""
+
+        return self.counts["deleted"]
+
+    @property
+    def failed(self) -> int:
+        """Number of tags that could not be deleted"""
+
+        return self.counts["failed"]
+
+    def record(
+        self, image_tag: ImageTag | str, result: str, reason: Optional[str] = None
+    ) -> None:
+        """Count one tag result"""
+
+        self.counts[result] = self.counts.get(result, 0) + 1
+        if result != "failed":
+            return
+        self.reasons[reason or "unknown"] = self.reasons.get(reason or "unknown", 0) + 1
+        if len(self.failures) < self.failures_max:
+            self.failures.append(
+                f"{image_tag} ({reason})" if reason else str(image_tag)
+            )
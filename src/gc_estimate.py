@@ -0,0 +1,75 @@
+"""Registry Garbage Collection Impact Estimation"""
+
+from array import array
+from typing import Iterable
+
+
+def get_digest_key(digest: str) -> bytes:
+    """Get a compact key of a blob digest (raw bytes of sha256 digests)"""
+
+    algorithm, _, encoded = digest.partition(":")
+    if algorithm == "sha256" and len(encoded) == 64:
+        try:
+            return bytes.fromhex(encoded)
+        except ValueError:
+            pass
+    return digest.encode(encoding="utf-8")
+
+
+class BlobIndex:
+    """Blob reference counts of deleted and retained manifests
+
+    Layers are heavily shared: every blob is stored once, indexed by its raw
+    digest, with its size and reference counts in typed arrays. A blob
+    becomes reclaimable (by the registry garbage collector) when deleted
+    manifests reference it and no retained one does. Its size is accounted
+    to the first repository deleting it. Only repositories with deletion
+    candidates are indexed: blobs shared with other repositories look
+    reclaimable, so the result is an upper bound, not the space freed.
+    """
+
+    def __init__(self) -> None:
+        self.__slots: dict[bytes, int] = {}
+        self.__repositories: dict[str, int] = {}
+        self.sizes: array = array("Q")
+        self.retained: array = array("I")
+        self.deleted: array = array("I")
+        self.owners: array = array("I")
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def add(
+        self, repository: str, blobs: Iterable[tuple[str, int]], retained: bool
+    ) -> None:
+        """Add the blobs (digest, size) referenced by one manifest"""
+
+        owner: int = self.__repositories.setdefault(
+            repository, len(self.__repositories)
+        )
+        counts: array = self.retained if retained else self.deleted
+        for digest, size in blobs:
+            key: bytes = get_digest_key(digest=digest)
+            slot: int = self.__slots.get(key, -1)
+            if slot < 0:
+                slot = self.__slots[key] = len(self.sizes)
+                self.sizes.append(size)
+                self.retained.append(0)
+                self.deleted.append(0)
+                self.owners.append(owner)
+            elif not retained and not self.deleted[slot]:
+                self.owners[slot] = owner
+            counts[slot] += 1
+
+    def get_reclaimable(self) -> dict[str, tuple[int, int]]:
+        """Get reclaimable (blobs, bytes) per repository (upper bound)"""
+
+        names: list[str] = list(self.__repositories)
+        reclaimable: dict[str, tuple[int, int]] = {}
+        for size, retained, deleted, owner in zip(
+            self.sizes, self.retained, self.deleted, self.owners
+        ):
+            if deleted and not retained:
+                blobs, total = reclaimable.get(names[owner], (0, 0))
+                reclaimable[names[owner]] = (blobs + 1, total + size)
+        return reclaimable
@@ -0,0 +1,93 @@
+"""HTTP/1.1 Response Parser (Pipelined And Asynchronous Connections)"""
+
+from http.client import HTTPException, IncompleteRead, RemoteDisconnected
+from typing import BinaryIO, Generator, NamedTuple
+
+LINE_MAX: int = 65537
+LINE_ENDS: tuple[bytes, ...] = (b"\r\n", b"\n", b"")
+
+# Reads requested by the parser: ("line", max size), ("exact", size), ("all", 0)
+ReadRequest = tuple[str, int]
+
+
+class ParsedResponse(NamedTuple):
+    """HTTP response read from a raw connection (header names lowercase)"""
+
+    status: int
+    reason: str
+    headers: dict[str, str]
+    body: bytes
+    keep_alive: bool
+
+
+def parse_response(
+    method: str = "GET",
+) -> Generator[ReadRequest, bytes, ParsedResponse]:
+    """Parse one HTTP/1.1 response, independently of the I/O
+
+    The generator yields the reads it needs and is sent the bytes read: the
+    blocking (`read_response`) and asyncio connections drive the same parser.
+    """
+
+    status_line: bytes = yield "line", LINE_MAX
+    if not status_line:
+        raise RemoteDisconnected("Connection closed by peer")
+    version, _, rest = status_line.decode(encoding="latin-1").partition(" ")
+    status, _, reason = rest.partition(" ")
+    if not version.startswith("HTTP/") or not status.isdigit():
+        raise HTTPException(f"Invalid status line: {status_line!r}")
+    headers: dict[str, str] = {}
+    while (line := (yield "line", LINE_MAX)) not in LINE_ENDS:
+        name, _, value = line.decode(encoding="latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    keep_alive: bool = (
+        headers.get("connection", "").lower() != "close" and version != "HTTP/1.0"
+    )
+    body: bytes = b""
+    if method != "HEAD" and int(status) not in (204, 304) and int(status) >= 200:
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks: list[bytes] = []
+            while size := int((yield "line", LINE_MAX).split(b";")[0], 16):
+                chunk: bytes = yield "exact", size + 2
+                if len(chunk) < size + 2:
+                    raise IncompleteRead(partial=chunk, expected=size + 2)
+                chunks.append(chunk[:size])
+            while (yield "line", LINE_MAX) not in LINE_ENDS:
+                pass  # Trailers
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            length: int = int(headers["content-length"])
+            body = yield "exact", length
+            if len(body) < length:
+                raise IncompleteRead(partial=body, expected=length)
+        else:
+            body = yield "all", 0
+            keep_alive = False
+    return ParsedResponse(
+        status=int(status),
+        reason=reason.strip(),
+        headers=headers,
+        body=body,
+        keep_alive=keep_alive,
+    )
+
+
+def read_response(stream: BinaryIO, method: str = "GET") -> ParsedResponse:
+    """Read one response of a (pipelined) connection from its buffered stream"""
+
+    parser: Generator[ReadRequest, bytes, ParsedResponse] = parse_response(
+        method=method
+    )
+    try:
+        kind, size = next(parser)
+        while True:
+            if kind == "line":
+                data: bytes = stream.readline(size)
+            elif kind == "exact":
+                data = stream.read(size)
+            else:
+                data = stream.read()
+            kind, size = parser.send(data)
+    except StopIteration as stop:
+        return stop.value
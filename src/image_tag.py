@@ -0,0 +1,159 @@
+"""Compact Docker Image Tags (Interned Names, Raw Digests Tables)"""
+
+from itertools import groupby
+from sys import intern
+from typing import Iterator, Optional
+
+SHA256_PREFIX: str = "sha256:"
+SHA256_SIZE: int = 32
+
+
+def pack_digest(digest: str) -> bytes:
+    """Get the compact form of a digest: 32 raw bytes for 'sha256:<hex>'
+
+    Other digests (algorithms, non canonical hex) are kept as encoded text.
+    """
+
+    if digest.startswith(SHA256_PREFIX) and len(digest) == 71:
+        try:
+            packed: bytes = bytes.fromhex(digest[7:])
+        except ValueError:
+            pass
+        else:
+            if packed.hex() == digest[7:]:
+                return packed
+    return digest.encode()
+
+
+def unpack_digest(packed: bytes) -> str:
+    """Get a digest back from its compact form"""
+
+    if len(packed) == SHA256_SIZE:
+        return f"{SHA256_PREFIX}{packed.hex()}"
+    return packed.decode()
+
+
+class ImageTag:
+    """Docker image tag, passed between stages instead of 'image:tag' strings
+
+    The repository name is interned (stored once for all its tags) and never
+    split again from the tag. `str()` gives the 'image:tag' reference.
+    """
+
+    __slots__ = ("image", "tag")
+
+    def __init__(self, image: str, tag: str) -> None:
+        self.image: str = intern(image)
+        self.tag: str = tag
+
+    @classmethod
+    def parse(cls, reference: str) -> "ImageTag":
+        """Parse an 'image[:tag]' reference (default tag: latest)
+
+        A registry port ('host:5000/image') is not mistaken for a tag.
+        """
+
+        image, separator, tag = reference.rpartition(":")
+        if not separator or "/" in tag:
+            return cls(image=reference, tag="latest")
+        return cls(image=image, tag=tag)
+
+    def __str__(self) -> str:
+        return f"{self.image}:{self.tag}"
+
+    def __repr__(self) -> str:
+        return f"ImageTag({self.image!r}, {self.tag!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ImageTag):
+            return NotImplemented
+        return self.image == other.image and self.tag == other.tag
+
+    def __hash__(self) -> int:
+        return hash((self.image, self.tag))
+
+
+class DigestTable:
+    """Tags of one Docker image with their manifest digests, array backed
+
+    One row per tag: its name and its digest, 32 raw bytes in one shared
+    bytearray (no object per digest). Other digests are kept aside as text.
+    Rows are grouped by digest once, when every digest is known.
+    """
+
+    __slots__ = ("tags", "digests", "texts")
+
+    def __init__(self) -> None:
+        self.tags: list[str] = []
+        self.digests: bytearray = bytearray()
+        self.texts: dict[int, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    def add(self, tag: str, digest: str) -> None:
+        """Add a tag and its digest"""
+
+        packed: bytes = pack_digest(digest=digest)
+        if len(packed) != SHA256_SIZE:
+            self.texts[len(self.tags)] = packed
+            packed = bytes(SHA256_SIZE)
+        self.tags.append(tag)
+        self.digests += packed
+
+    def __packed(self, row: int) -> bytes:
+        if row in self.texts:
+            return self.texts[row]
+        start: int = row * SHA256_SIZE
+        end: int = start + SHA256_SIZE
+        return bytes(self.digests[start:end])
+
+    def __prefix(self, row: int) -> int:
+        start: int = row * SHA256_SIZE
+        end: int = start + 8
+        return int.from_bytes(self.digests[start:end], byteorder="big")
+
+    def groups(self) -> Iterator[tuple[bytes, list[str]]]:
+        """Yield (packed digest, tags) groups, ordered by `get_digest_order`
+
+        Rows are sorted by the first 8 bytes of their digest (small sort keys),
+        then by whole digest within a run of rows sharing them (text digests).
+        """
+
+        rows: list[int] = sorted(range(len(self.tags)), key=self.__prefix)
+        for _, run in groupby(rows, key=self.__prefix):
+            for packed, group in groupby(
+                sorted(run, key=self.__packed), key=self.__packed
+            ):
+                yield packed, [self.tags[row] for row in group]
+
+
+def get_digest_order(packed: bytes) -> tuple[int, bytes]:
+    """Get the sort key of a packed digest in `DigestTable.groups`"""
+
+    if len(packed) != SHA256_SIZE:
+        return 0, packed
+    return int.from_bytes(packed[:8], byteorder="big"), packed
+
+
+def join_digests(
+    candidates: DigestTable, retained: DigestTable
+) -> Iterator[tuple[str, list[str], Optional[str]]]:
+    """Yield (digest, candidate tags, a retained tag with this digest or None)
+
+    Both tables are grouped and merged in digest order (no lookup table).
+    """
+
+    retained_groups: Iterator[tuple[bytes, list[str]]] = retained.groups()
+    retained_group: Optional[tuple[bytes, list[str]]] = next(retained_groups, None)
+    for packed, tags in candidates.groups():
+        order: tuple[int, bytes] = get_digest_order(packed=packed)
+        while retained_group is not None and (
+            get_digest_order(packed=retained_group[0]) < order
+        ):
+            retained_group = next(retained_groups, None)
+        yield unpack_digest(packed=packed), tags, (
+            retained_group[1][0]
+            if retained_group is not None and retained_group[0] == packed
+            else None
+        )
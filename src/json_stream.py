@@ -0,0 +1,132 @@
+"""Incremental JSON Parsing (Large Catalog And Tags List Responses)"""
+
+from json import loads
+from typing import Any, Iterator, Optional, Protocol
+
+CHUNK_SIZE: int = 64 * 1024
+
+STRUCTURAL: frozenset[int] = frozenset(b"{}[]:,")
+WHITESPACE: frozenset[int] = frozenset(b" \t\r\n")
+QUOTE: int = ord('"')
+
+
+class Readable(Protocol):  # pylint: disable=too-few-public-methods
+    """Binary stream read into a caller buffer (e.g. http.client.HTTPResponse)"""
+
+    def readinto(self, buffer: bytearray, /) -> Optional[int]:
+        """Read bytes into buffer, return the number of bytes read (0: end)"""
+
+
+def iter_tokens(
+    stream: Readable, chunk_size: int = CHUNK_SIZE
+) -> Iterator[tuple[str, Any]]:
+    """Yield the JSON tokens of a stream: (kind, value)
+
+    Kinds are the structural characters (`{`, `}`, `[`, `]`, `:`, `,`, no
+    value), "string" (decoded str) and "scalar" (number, true, false, null).
+    The stream is read into one reusable buffer of `chunk_size` bytes: only a
+    string or scalar spanning two chunks is copied aside.
+    """
+
+    buffer: bytearray = bytearray(chunk_size)
+    token: bytearray = bytearray()
+    in_string: bool = False
+    in_scalar: bool = False
+    escaped: bool = False  # Buffer ended right after a backslash
+    has_escape: bool = False
+
+    while size := stream.readinto(buffer):
+        index: int = 0
+        while index < size:
+            if in_string:
+                if escaped:
+                    token.append(buffer[index])
+                    index += 1
+                    escaped = False
+                    continue
+                quote: int = buffer.find(b'"', index, size)
+                end: int = size if quote < 0 else quote
+                backslash: int = buffer.find(b"\\", index, end)
+                if backslash >= 0:
+                    has_escape = True
+                    if backslash + 1 < size:
+                        escape_end: int = backslash + 2
+                        token += buffer[index:escape_end]
+                        index = escape_end
+                    else:
+                        token += buffer[index:size]
+                        index = size
+                        escaped = True
+                    continue
+                token += buffer[index:end]
+                index = end
+                if quote < 0:
+                    continue
+                index += 1
+                in_string = False
+                yield "string", (
+                    loads(b'"' + token + b'"') if has_escape else token.decode()
+                )
+                token.clear()
+                continue
+
+            byte: int = buffer[index]
+            if in_scalar:
+                if byte not in STRUCTURAL and byte not in WHITESPACE:
+                    token.append(byte)
+                    index += 1
+                    continue
+                in_scalar = False
+                yield "scalar", loads(token)
+                token.clear()
+            if byte in WHITESPACE:
+                pass
+            elif byte in STRUCTURAL:
+                yield chr(byte), None
+            elif byte == QUOTE:
+                in_string = True
+                has_escape = False
+            else:
+                in_scalar = True
+                token.append(byte)
+            index += 1
+
+    if in_string:
+        raise ValueError("Unterminated JSON string")
+    if in_scalar:
+        yield "scalar", loads(token)
+
+
+def iter_json_strings(
+    stream: Readable, key: str, chunk_size: int = CHUNK_SIZE
+) -> Iterator[str]:
+    """Yield the strings of an array member of a JSON object, one at a time
+
+    E.g. `repositories` of a catalog page or `tags` of a tags list page:
+    memory is bounded by `chunk_size`, not by the response size. Other
+    members are skipped; a missing or null member yields nothing.
+    """
+
+    depth: int = 0
+    member: Optional[str] = None
+    in_member: bool = False
+    previous: str = ""
+    for kind, value in iter_tokens(stream=stream, chunk_size=chunk_size):
+        if kind in ("{", "["):
+            depth += 1
+            if depth == 2:
+                in_member = kind == "[" and member == key
+        elif kind in ("}", "]"):
+            depth -= 1
+            if depth < 0:
+                raise ValueError(f"Unexpected JSON token '{kind}'")
+            if depth < 2:
+                in_member = False
+        elif kind == "string":
+            if in_member and depth == 2:
+                yield value
+            elif depth == 1 and previous in ("{", ","):
+                member = value
+        previous = kind
+    if depth:
+        raise ValueError("Truncated JSON document")
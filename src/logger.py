@@ -1,12 +1,16 @@
 """Logging Configuration"""
 
 from logging import getLogger, basicConfig
-from config import LOGGING_LEVEL
-
-basicConfig(
-    format="%(asctime)s %(message)s",
-    encoding="utf-8",
-    datefmt="%Y-%m-%dT%H:%M:%S%z",  # 1996-12-19T16:39:57-08:00
-    level=LOGGING_LEVEL.upper(),
-)
+
 logger = getLogger(__name__)
+
+
+def setup_logging(level: str = "INFO") -> None:
+    """Configure the root logger (once, by the command line entry point)"""
+
+    basicConfig(
+        format="%(asctime)s %(message)s",
+        encoding="utf-8",
+        datefmt="%Y-%m-%dT%H:%M:%S%z",  # 1996-12-19T16:39:57-08:00
+        level=level.upper(),
+    )
@@ -1,126 +1,715 @@
-"""Docker Registry Cleaner Main"""
+"""Docker Registry Cleaner Main (Command Line Interface)
+
+Subcommands only import the modules they need (e.g. `stats` never loads the
+HTTP client and `list` never loads the cleanup pipeline): keep imports of
+this module light and import the others inside the functions using them.
+"""
+
+# pylint: disable=import-outside-toplevel
 
 import sys
-from docker_registry_client import DockerRegistryClient
-from logger import logger
-from utils import is_valid_url, get_percentage, is_dangerous_regex, str2bool
-import config
+from argparse import ArgumentParser, Namespace
+from contextlib import AbstractContextManager, nullcontext
+from typing import TYPE_CHECKING, Callable, Optional
+from config import Config, load_registries
+from logger import logger, setup_logging
+
+if TYPE_CHECKING:
+    from docker_registry_client import DockerRegistryClient
+    from matcher import Matcher
+    from metrics import Metrics
+    from pipeline import CleanerPipeline
+    from profiler import Profiler
+    from protected_index import ProtectedIndex
+    from scheduler import FairScheduler
+    from tag_index import TagIndex
+    from tags_cache import TagsListCache
+
+# Exit codes
+EXIT_SUCCESS: int = 0
+EXIT_FAILURES: int = 1
+EXIT_USAGE: int = 2
+
+
+def time_phase(profiler: Optional["Profiler"], name: str) -> AbstractContextManager:
+    """Time a phase of the run (if profiling)"""
+
+    return nullcontext() if profiler is None else profiler.phase(name=name)
+
+
+def get_filters(
+    config: Config, profiler: Optional["Profiler"] = None
+) -> dict[str, "Matcher"]:
+    """Compile (and validate) Docker images and tags filters once
+
+    With a profiler, matches are timed (`filter_images`, `filter_tags` phases).
+    """
+
+    from matcher import Matcher
+
+    filters: dict[str, Matcher] = {
+        "images": Matcher.from_string(
+            includes=config.docker_images_filter,
+            excludes=config.docker_images_exclude,
+        ),
+        "tags": Matcher.from_string(
+            includes=config.docker_tags_filter, excludes=config.docker_tags_exclude
+        ),
+    }
+    if profiler is None:
+        return filters
+
+    from profiler import ProfiledMatcher
+
+    return {
+        kind: ProfiledMatcher(matcher=matcher, profiler=profiler, name=f"filter_{kind}")
+        for kind, matcher in filters.items()
+    }
+
 
+def check_filters(
+    filters: dict[str, "Matcher"], force: bool, interactive: bool = False
+) -> bool:
+    """Check filters are not dangerous (or forced, or confirmed if interactive)"""
 
-def log_summary(deleted: list[str], failed: list[str]) -> None:
-    """Function that logs summary information"""
+    from utils import is_dangerous_regex, str2bool
 
-    total: int = len(deleted) + len(failed)
-    for kind, images, emoji in [
-        ("deleted", deleted, "🟢"),
-        ("failed", failed, "🔴"),
-    ]:
-        if not images:
+    for kind, matcher in filters.items():
+        logger.info(msg=f"🧐 Checking filter ({kind=} ({matcher=})")
+        warnings: list[str] = [
+            f"Dangerous filter regex pattern detected: '{pattern}'"
+            for pattern in matcher.includes or ("",)
+            if not pattern or is_dangerous_regex(pattern=pattern)
+        ] + [
+            f"Pathological filter regex pattern detected: '{pattern}'"
+            for pattern in matcher.pathological_patterns
+        ]
+        for warning in warnings:
+            logger.info(msg=warning)
+        if not warnings or force:
             continue
+        if not interactive:
+            logger.error(msg="❌ Refusing dangerous filters without --force/$FORCE")
+            return False
+        if not str2bool(string=input("Are you sure? (y/n): ")):
+            logger.info(msg="Exit...")
+            return False
+    return True
 
-        logger.info(
-            msg=(
-                f"{emoji} Total {kind} Docker images: {len(images):>3} "
-                f"({get_percentage(nbr_a=len(images), nbr_b=total):.2%})"
-                f" -> {sorted(images)}"
-            )
-        )
 
+def get_client_factory(
+    config: Config,
+    metrics: Optional["Metrics"] = None,
+    tags_cache: Optional["TagsListCache"] = None,
+    profiler: Optional["Profiler"] = None,
+) -> Callable[[], "DockerRegistryClient"]:
+    """Get a factory of registry clients sharing rate limit, retries and tokens
 
-def main() -> None:
-    """Main Function"""
+    With a profiler, the client methods (catalog, tags, digests, deletes...)
+    are timed.
+    """
 
-    if not is_valid_url(url=config.DOCKER_REGISTRY_URL):
+    from auth import TokenAuthenticator
+    from docker_registry_client import DockerRegistryClient, get_ssl_context
+    from rate_limiter import AdaptiveRateLimiter, RetryPolicy
+    from utils import is_valid_url
+
+    if not is_valid_url(url=config.docker_registry_url):
         raise ValueError(
             "Unvalid Docker registry URL ($DOCKER_REGISTRY_URL), "
             "it needs to start with 'https://'."
         )
 
-    for kind, pattern in {
-        "images": config.DOCKER_IMAGES_FILTER,
-        "tags": config.DOCKER_TAGS_FILTER,
-    }.items():
-        logger.info(msg=f"🧐 Checking filter ({kind=} ({pattern=})")
-        if is_dangerous_regex(pattern=pattern):
-            logger.info(msg=f"Dangerous filter regex pattern detected: '{pattern}'")
-            if not config.FORCE and not str2bool(string=input("Are you sure? (y/n): ")):
-                logger.info(msg="Exit...")
-                sys.exit(0)
+    # Rate limiter shared by all workers
+    rate_limiter: Optional[AdaptiveRateLimiter] = (
+        AdaptiveRateLimiter(max_rate=config.rate_limit) if config.rate_limit else None
+    )
+    retry_policy = RetryPolicy(
+        max_retries=config.retry_max, backoff_base=config.retry_backoff_base
+    )
 
-    client = DockerRegistryClient(
-        registry_url=config.DOCKER_REGISTRY_URL,
-        timeout=config.HTTPS_CONNECTION_TIMEOUT,
-        ca_file=config.DOCKER_REGISTRY_CA_FILE,
+    # Token cache shared by all workers
+    authenticator = TokenAuthenticator(
+        username=config.docker_registry_username,
+        password=config.docker_registry_password,
+        ssl_context=get_ssl_context(ca_file=config.docker_registry_ca_file),
+        timeout=config.https_connection_timeout,
     )
 
-    image_tags_deleted: list[str] = []
-    image_tags_failed: list[str] = []
+    def client_factory() -> DockerRegistryClient:
+        client = DockerRegistryClient(
+            registry_url=config.docker_registry_url,
+            timeout=config.https_connection_timeout,
+            ca_file=config.docker_registry_ca_file,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            authenticator=authenticator,
+            metrics=metrics,
+            tags_cache=tags_cache,
+        )
+        return client if profiler is None else profiler.instrument(obj=client)
+
+    return client_factory
+
+
+def open_tags_cache(config: Config) -> Optional["TagsListCache"]:
+    """Open the tags list cache ($TAGS_CACHE_FILE), if any"""
+
+    if not config.tags_cache_file:
+        return None
+
+    from tags_cache import TagsListCache
+
+    return TagsListCache(path=config.tags_cache_file)
 
-    # Get Docker images
-    images: list[str] = client.get_images(
-        number_max=config.IMAGE_LIST_NBR_MAX, pattern=config.DOCKER_IMAGES_FILTER
-    )
 
-    logger.info(msg=f"💡 Number of Docker images: {len(images)}")
+def load_protected(config: Config) -> Optional["ProtectedIndex"]:
+    """Load the protected digests and tags ($PROTECTED_FILE), if any"""
 
-    for image in images:
-        # Get all tags of Docker image
-        image_tags: list[str] = client.get_image_tags(
-            image=image, pattern=config.DOCKER_TAGS_FILTER
+    if not config.protected_file:
+        return None
+
+    from time import monotonic
+    from protected_index import ProtectedIndex
+
+    started: float = monotonic()
+    protected = ProtectedIndex.load(
+        path=config.protected_file, registry_url=config.docker_registry_url
+    )
+    logger.info(
+        msg=(
+            f"🛡️ Protected: {len(protected.fingerprints)} digests, "
+            f"{len(protected.image_tags)} tags ({monotonic() - started:.3f}s)"
         )
+    )
+    return protected
+
+
+def log_state_report(
+    tag_index: "TagIndex", images_filter: "Matcher", tags_filter: "Matcher"
+) -> None:
+    """Function that logs what would be deleted according to the local index"""
+
+    total: int = 0
+    for image, digest, tags in tag_index.get_deletion_candidates(
+        images_pattern=images_filter, tags_pattern=tags_filter
+    ):
+        total += len(tags)
+        logger.info(msg=f"📒 Would delete '{image}' tags {tags} ({digest})")
+    logger.info(msg=f"📒 Total Docker image tags that would be deleted: {total}")
+
+
+def list_images(
+    config: Config,
+    filters: dict[str, "Matcher"],
+    tags: bool,
+    profiler: Optional["Profiler"] = None,
+) -> int:
+    """`list` subcommand: print matching Docker images (or image tags)"""
+
+    if not tags:
+        client: DockerRegistryClient = get_client_factory(
+            config=config, profiler=profiler
+        )()
+        for image in client.get_images(
+            number_max=config.image_list_nbr_max, pattern=filters["images"]
+        ):
+            print(image)
+        return EXIT_SUCCESS
+
+    from crawler import crawl_tags
+
+    tags_cache: Optional[TagsListCache] = open_tags_cache(config=config)
+    client_factory = get_client_factory(
+        config=config, tags_cache=tags_cache, profiler=profiler
+    )
+    try:
+        for image, image_tags in crawl_tags(
+            client_factory=client_factory,
+            images=client_factory().get_images(
+                number_max=config.image_list_nbr_max, pattern=filters["images"]
+            ),
+            concurrency=config.cleaner_concurrency,
+            number_max=config.tag_list_nbr_max,
+        ):
+            for tag in image_tags:
+                if filters["tags"](tag):
+                    print(f"{image}:{tag}")
+    finally:
+        if tags_cache is not None:
+            tags_cache.close()
+    return EXIT_SUCCESS
+
+
+def show_stats(config: Config, filters: dict[str, "Matcher"]) -> int:
+    """`stats` subcommand: report the local index (no network calls)"""
 
+    from tag_index import TagIndex
+
+    if not config.state_file:
+        logger.error(msg="❌ The stats subcommand needs a local index ($STATE_FILE)")
+        return EXIT_USAGE
+    with TagIndex(path=config.state_file, digest_ttl=config.state_digest_ttl) as index:
+        counts: dict[str, int] = index.get_counts(pattern=filters["images"])
         logger.info(
             msg=(
-                "💡 Number of Docker tags marked as deletion"
-                f" for '{image}': {len(image_tags)}"
+                f"📒 Known Docker images: {counts['images']}, "
+                f"tags: {counts['tags']}, digests: {counts['digests']}"
             )
         )
+        log_state_report(
+            tag_index=index,
+            images_filter=filters["images"],
+            tags_filter=filters["tags"],
+        )
+    return EXIT_SUCCESS
 
-        # No Docker image tags found
-        if not image_tags:
-            tags_filer: str = config.DOCKER_TAGS_FILTER
-            logger.warning(msg=f"🤡 No Docker tags found ({image=} {tags_filer=})")
-            continue
 
-        for image_tag in sorted(image_tags):
-            # Get Docker image digest
-            if (digest := client.get_image_tag_digest(image_tag=image_tag)) is None:
-                logger.warning(
-                    msg=f"❌ Error: cannot get digest for Docker image '{image_tag}"
-                )
-                image_tags_failed.append(f"{image_tag}")
-                continue
+def run_pipeline(  # pylint: disable=too-many-arguments
+    config: Config,
+    filters: dict[str, "Matcher"],
+    dry_run: bool,
+    plan_file: Optional[str] = None,
+    scheduler: Optional["FairScheduler"] = None,
+    name: str = "default",
+    profiler: Optional["Profiler"] = None,
+) -> "CleanerPipeline":
+    """Run the cleanup pipeline of one registry
 
-            (name, tag) = image_tag.split(":")
+    A dry run writes the manifests it would delete to `plan_file` (if given).
+    """
+
+    from time import monotonic
+    from events import EventWriter
+    from gc_estimate import BlobIndex
+    from metrics import Metrics
+    from pipeline import CleanerPipeline, export_metrics
+    from plan import PlanWriter
+    from retention_policy import RetentionPolicy
+    from sharding import Checkpoint, filter_shard
+    from tag_index import TagIndex
+
+    # Loaded first: a protection file error stops the run before any request
+    protected: Optional[ProtectedIndex] = load_protected(config=config)
+    # Request metrics shared by all workers
+    metrics: Optional[Metrics] = (
+        Metrics() if config.metrics_file or config.metrics_pushgateway_url else None
+    )
+    tags_cache: Optional[TagsListCache] = open_tags_cache(config=config)
+    client_factory = get_client_factory(
+        config=config, metrics=metrics, tags_cache=tags_cache, profiler=profiler
+    )
+
+    tag_index: Optional[TagIndex] = (
+        TagIndex(path=config.state_file, digest_ttl=config.state_digest_ttl)
+        if config.state_file
+        else None
+    )
+
+    # Resume an interrupted run (same shard and filters only)
+    checkpoint: Optional[Checkpoint] = (
+        Checkpoint(
+            path=config.checkpoint_file,
+            key=(
+                f"shard={config.shard_index}/{config.shard_count} "
+                f"images={filters['images']!r} tags={filters['tags']!r}"
+            ),
+        )
+        if config.checkpoint_file
+        else None
+    )
+    last: Optional[str] = checkpoint.last if checkpoint is not None else None
+    if last:
+        logger.info(msg=f"⏩ Resuming after Docker image '{last}'")
+
+    pipeline = CleanerPipeline(
+        client_factory=client_factory,
+        concurrency=config.cleaner_concurrency,
+        tags_filter=filters["tags"],
+        dry_run=dry_run,
+        tags_page_size=config.tag_list_nbr_max,
+        tag_index=tag_index,
+        retention_policy=RetentionPolicy(
+            keep_last=config.retention_keep_last,
+            older_than_days=config.retention_older_than_days,
+            keep_semver=config.retention_keep_semver,
+        ),
+        events=(
+            EventWriter.open(path=config.events_file) if config.events_file else None
+        ),
+        failures_max=config.summary_failures_max,
+        checkpoint=checkpoint,
+        blob_index=BlobIndex() if config.gc_estimate else None,
+        gc_batch_size=config.gc_batch_size,
+        plan=(
+            PlanWriter.open(path=plan_file, registry=config.docker_registry_url)
+            if plan_file and dry_run
+            else None
+        ),
+        scheduler=scheduler,
+        name=name,
+        delete_pipeline_depth=config.delete_pipeline_depth,
+        protected=protected,
+    )
 
-            message: str = (
-                f"🔫 Deleting Docker image '{name}:{tag}' using digest '{digest}'"
+    # Get Docker images (streamed page by page into the pipeline)
+    started: float = monotonic()
+    success: bool = False
+    try:
+        pipeline.run(
+            images=filter_shard(
+                images=client_factory().get_images(
+                    number_max=config.image_list_nbr_max,
+                    pattern=filters["images"],
+                    last=last,
+                ),
+                index=config.shard_index,
+                count=config.shard_count,
             )
+        )
+        success = True
+        if checkpoint is not None:
+            checkpoint.clear()
+    finally:
+        if tag_index is not None:
+            tag_index.close()
+        if tags_cache is not None:
+            tags_cache.close()
+        if pipeline.events is not None:
+            pipeline.events.close()
+        if pipeline.plan is not None:
+            pipeline.plan.close()
+            logger.info(
+                msg=(
+                    f"📝 Plan of {pipeline.plan.entries} manifests written to "
+                    f"'{plan_file}'"
+                )
+            )
+        if metrics is not None:
+            export_metrics(
+                metrics=metrics,
+                summary=pipeline.summary,
+                images=pipeline.images,
+                duration=monotonic() - started,
+                success=success,
+                config=config,
+                blob_index=pipeline.blob_index,
+            )
+    return pipeline
 
-            if config.DRY_RUN:
-                logger.info(msg=f"{message} (DRY-RUN)")
-                continue
 
-            logger.info(msg=message)
+def clean(
+    config: Config,
+    filters: dict[str, "Matcher"],
+    dry_run: bool,
+    plan_file: Optional[str] = None,
+    profiler: Optional["Profiler"] = None,
+) -> int:
+    """`plan` (dry run) and `delete` subcommands: clean one registry"""
+
+    from pipeline import log_gc_estimate, log_summary
+
+    pipeline: CleanerPipeline = run_pipeline(
+        config=config,
+        filters=filters,
+        dry_run=dry_run,
+        plan_file=plan_file,
+        profiler=profiler,
+    )
+    log_summary(summary=pipeline.summary)
+    if pipeline.blob_index is not None:
+        log_gc_estimate(blob_index=pipeline.blob_index)
+    return EXIT_FAILURES if pipeline.summary.failed else EXIT_SUCCESS
+
 
-            # Delete Docker image using digest
-            if client.delete_image(image=image, digest=digest):
-                logger.info(
-                    msg=f"✅ Docker image '{image_tag}' ({digest}) deleted successfully"
+def clean_registries(
+    registries: dict[str, tuple[Config, dict[str, "Matcher"]]],
+    dry_run: Optional[bool],
+    budget: int,
+    profiler: Optional["Profiler"] = None,
+) -> int:
+    """`plan` and `delete` subcommands: clean several registries in one process
+
+    Each registry runs its own pipeline (connections, rate limiter, workers)
+    in its own thread, under a fair scheduler sharing `budget` concurrent
+    tasks. `dry_run` None: each registry setting is used.
+    """
+
+    from concurrent.futures import Future, ThreadPoolExecutor
+    from pipeline import log_gc_estimate
+    from scheduler import FairScheduler
+
+    scheduler = FairScheduler(budget=budget)
+    with ThreadPoolExecutor(
+        max_workers=len(registries), thread_name_prefix="registry"
+    ) as executor:
+        futures: dict[str, Future] = {
+            name: executor.submit(
+                run_pipeline,
+                config=config,
+                filters=filters,
+                dry_run=config.dry_run if dry_run is None else dry_run,
+                scheduler=scheduler,
+                name=name,
+                profiler=profiler,
+            )
+            for name, (config, filters) in registries.items()
+        }
+
+    # Summary per registry (a failed registry does not stop the others)
+    exit_code: int = EXIT_SUCCESS
+    for name, future in futures.items():
+        try:
+            pipeline: CleanerPipeline = future.result()
+        except Exception as exception:  # pylint: disable=broad-exception-caught
+            logger.error(msg=f"❌ Registry '{name}' run failed: {exception!r}")
+            exit_code = EXIT_FAILURES
+            continue
+        logger.info(
+            msg=(
+                f"📊 Registry '{name}': {pipeline.images} images, "
+                + ", ".join(
+                    f"{count} {result}"
+                    for result, count in pipeline.summary.counts.items()
                 )
-                image_tags_deleted.append(f"{image_tag} ({digest})")
-            else:
-                logger.warning(
-                    msg=(
-                        "❌ Error while trying to delete Docker image "
-                        f"'{image_tag}' ({digest})"
-                    )
+                + " tags"
+            )
+        )
+        if pipeline.summary.failures:
+            logger.info(
+                msg=(
+                    f"🔴 Registry '{name}' first {len(pipeline.summary.failures)} "
+                    f"failures -> {pipeline.summary.failures}"
                 )
-                image_tags_failed.append(f"{image_tag} ({digest})")
+            )
+        if pipeline.summary.failed:
+            exit_code = EXIT_FAILURES
+        if pipeline.blob_index is not None:
+            log_gc_estimate(blob_index=pipeline.blob_index)
+    return exit_code
+
+
+def apply_plan(
+    config: Config, plan_file: str, profiler: Optional["Profiler"] = None
+) -> int:
+    """`apply` subcommand: delete the manifests of a plan (digests re-checked)"""
+
+    from time import monotonic
+    from events import EventWriter
+    from metrics import Metrics
+    from pipeline import export_metrics, log_summary
+    from plan import PlanApplier, read_plan
+    from tag_index import TagIndex
+
+    protected: Optional[ProtectedIndex] = load_protected(config=config)
+    metrics: Optional[Metrics] = (
+        Metrics() if config.metrics_file or config.metrics_pushgateway_url else None
+    )
+    applier = PlanApplier(
+        client_factory=get_client_factory(
+            config=config, metrics=metrics, profiler=profiler
+        ),
+        concurrency=config.cleaner_concurrency,
+        tag_index=(
+            TagIndex(path=config.state_file, digest_ttl=config.state_digest_ttl)
+            if config.state_file
+            else None
+        ),
+        events=(
+            EventWriter.open(path=config.events_file) if config.events_file else None
+        ),
+        failures_max=config.summary_failures_max,
+        protected=protected,
+    )
+
+    started: float = monotonic()
+    success: bool = False
+    # pylint: disable-next=consider-using-with
+    stream = sys.stdin if plan_file == "-" else open(plan_file, encoding="utf-8")
+    try:
+        applier.run(
+            entries=read_plan(stream=stream, registry=config.docker_registry_url)
+        )
+        success = True
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if applier.tag_index is not None:
+            applier.tag_index.close()
+        if applier.events is not None:
+            applier.events.close()
+        if metrics is not None:
+            export_metrics(
+                metrics=metrics,
+                summary=applier.summary,
+                images=applier.entries,
+                duration=monotonic() - started,
+                success=success,
+                config=config,
+            )
+
+    log_summary(summary=applier.summary)
+    return EXIT_FAILURES if applier.summary.failed else EXIT_SUCCESS
+
+
+def get_parser() -> ArgumentParser:
+    """Get the command line parser"""
+
+    parser = ArgumentParser(
+        prog="docker-registry-cleaner",
+        description=(
+            "Delete Docker image tags matching filters from a Docker registry. "
+            "Settings come from environment variables (see README). Without "
+            "subcommand, $DRY_RUN selects plan or delete ($STATE_REPORT: stats)."
+        ),
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Accept dangerous filter patterns (same as $FORCE)",
+    )
+    parser.add_argument(
+        "--config",
+        metavar="FILE",
+        help="TOML file of several registries (same as $CONFIG_FILE)",
+    )
+    parser.add_argument(
+        "--registry", metavar="NAME", help="Only use this registry of --config"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report the time spent per phase at the end (same as $PROFILE)",
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="FILE",
+        help=(
+            "Also write a cProfile (pstats) file, or collapsed stacks for a "
+            "'.collapsed' or '.folded' FILE (same as $PROFILE_FILE)"
+        ),
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    list_parser = subparsers.add_parser("list", help="List matching Docker images")
+    list_parser.add_argument(
+        "--tags", action="store_true", help="List matching image tags instead"
+    )
+    plan_parser = subparsers.add_parser(
+        "plan", help="Show what would be deleted (dry run)"
+    )
+    plan_parser.add_argument(
+        "--output", metavar="PLAN", help="Write a deletion plan (JSON lines, '-')"
+    )
+    subparsers.add_parser("delete", help="Delete matching Docker image tags")
+    apply_parser = subparsers.add_parser(
+        "apply", help="Delete the manifests of a plan (digests re-checked)"
+    )
+    apply_parser.add_argument("plan", metavar="PLAN", help="Plan file ('-': stdin)")
+    subparsers.add_parser("stats", help="Report the local index ($STATE_FILE)")
+    return parser
+
+
+def run_command(
+    arguments: Namespace, config: Config, profiler: Optional["Profiler"] = None
+) -> int:
+    """Run the subcommand of parsed arguments (returns the exit code)"""
+
+    command: Optional[str] = arguments.command
+    if command is None:
+        # Former single code path: environment variables select the action
+        if config.state_report and config.state_file:
+            command = "stats"
+        else:
+            command = "plan" if config.dry_run else "delete"
+
+    with time_phase(profiler=profiler, name="setup"):
+        registries: dict[str, Config] = {"default": config}
+        budget: int = config.cleaner_concurrency
+        if config_file := arguments.config or config.config_file:
+            budget, registries = load_registries(path=config_file, base=config)
+        if arguments.registry:
+            if arguments.registry not in registries:
+                logger.error(msg=f"❌ Unknown registry '{arguments.registry}'")
+                return EXIT_USAGE
+            registries = {arguments.registry: registries[arguments.registry]}
+        if len(registries) > 1 and (
+            command not in ("plan", "delete") or getattr(arguments, "output", None)
+        ):
+            logger.error(msg=f"❌ The {command} subcommand needs --registry")
+            return EXIT_USAGE
+
+        selected: dict[str, tuple[Config, dict[str, Matcher]]] = {
+            name: (registry, get_filters(config=registry, profiler=profiler))
+            for name, registry in registries.items()
+        }
+        for name, (registry, filters) in selected.items():
+            # Read-only subcommands accept any filter
+            if command in ("plan", "delete") and not check_filters(
+                filters=filters,
+                force=arguments.force or registry.force,
+                # Only the former code path asks, and only a terminal can answer
+                interactive=arguments.command is None and sys.stdin.isatty(),
+            ):
+                logger.info(msg=f"Registry '{name}' filters refused")
+                return EXIT_SUCCESS if arguments.command is None else EXIT_USAGE
+
+    with time_phase(profiler=profiler, name=f"run_{command}"):
+        if len(selected) > 1:
+            exit_code: int = clean_registries(
+                registries=selected,
+                dry_run=None if arguments.command is None else command == "plan",
+                budget=budget,
+                profiler=profiler,
+            )
+            return exit_code if arguments.command is not None else EXIT_SUCCESS
+
+        config, filters = next(iter(selected.values()))
+        if command == "list":
+            return list_images(
+                config=config, filters=filters, tags=arguments.tags, profiler=profiler
+            )
+        if command == "stats":
+            return show_stats(config=config, filters=filters)
+        if command == "apply":
+            # The plan was reviewed: filters are not used
+            return apply_plan(
+                config=config, plan_file=arguments.plan, profiler=profiler
+            )
+        exit_code = clean(
+            config=config,
+            filters=filters,
+            dry_run=command == "plan",
+            plan_file=getattr(arguments, "output", None),
+            profiler=profiler,
+        )
+    return exit_code if arguments.command is not None else EXIT_SUCCESS
+
+
+def main(argv: Optional[list[str]] = None, config: Optional[Config] = None) -> int:
+    """Main Function (returns the exit code)
+
+    With --profile/$PROFILE, the time spent per phase (setup, subcommand,
+    registry requests, filters, logging) is reported at the end.
+    """
+
+    arguments: Namespace = get_parser().parse_args(args=argv)
+    if config is None:
+        config = Config.from_env()
+    setup_logging(level=config.logging_level)
+
+    profile_file: Optional[str] = arguments.profile_output or config.profile_file
+    if not (arguments.profile or config.profile or profile_file):
+        return run_command(arguments=arguments, config=config)
+
+    from profiler import Profiler
 
-    # Log summary
-    log_summary(deleted=image_tags_deleted, failed=image_tags_failed)
+    profiler = Profiler(output=profile_file)
+    try:
+        with profiler:
+            return run_command(arguments=arguments, config=config, profiler=profiler)
+    finally:
+        profiler.log_report()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""Precompiled Image/Tag Filter Matcher"""
+
+from functools import lru_cache
+from re import compile as re_compile, error as RegexError, Pattern
+from typing import Iterable
+
+REGEX_SPECIAL_CHARS: frozenset[str] = frozenset(r".^$*+?{}[]\|()")
+MATCH_ALL_PATTERNS: frozenset[str] = frozenset(("", ".*", "^.*", "^.*$", ".+", "^"))
+UNBOUNDED_REPEAT_PATTERN: Pattern = re_compile(r"[*+]|\{\d*,\}")
+
+
+def is_literal(pattern: str) -> bool:
+    """Check if a pattern has no regex special characters"""
+
+    return not REGEX_SPECIAL_CHARS.intersection(pattern)
+
+
+def get_patterns(string: str) -> list[str]:
+    """Get the patterns of a filter: one per line, blank lines ignored"""
+
+    return [line for line in string.splitlines() if line.strip()]
+
+
+def get_unbounded_repeat_end(pattern: str, index: int) -> int:
+    """Get the end of an unbounded quantifier (*, +, {n,}) at index (0: none)"""
+
+    match = UNBOUNDED_REPEAT_PATTERN.match(pattern, index)
+    return match.end() if match else 0
+
+
+def get_class_end(pattern: str, index: int) -> int:
+    """Get the end of a character class starting at index ('[')"""
+
+    index += 1
+    if pattern.startswith("^", index):
+        index += 1
+    if pattern.startswith("]", index):
+        index += 1
+    while index < len(pattern) and pattern[index] != "]":
+        index += 2 if pattern[index] == "\\" else 1
+    return index + 1
+
+
+def is_pathological_regex(pattern: str) -> bool:
+    """Check if a regex pattern may lead to catastrophic backtracking
+
+    Looks for nested unbounded quantifiers: a group repeated without bound
+    that itself contains an unbounded repeat, e.g. (a+)+, (.*)*, ([a-z]+-?)*.
+    The pattern is scanned as text, escapes and character classes skipped.
+    """
+
+    # One entry per open group: it contains an unbounded repeat
+    groups: list[bool] = [False]
+    index: int = 0
+    while index < len(pattern):
+        char: str = pattern[index]
+        if char == "\\":
+            index += 2
+        elif char == "[":
+            index = get_class_end(pattern=pattern, index=index)
+        elif char == "(":
+            groups.append(False)
+            index += 1
+            continue
+        else:
+            index += 1
+        repeated: bool = False
+        if char == ")" and len(groups) > 1:
+            repeated = groups.pop()
+            groups[-1] = groups[-1] or repeated
+        if end := get_unbounded_repeat_end(pattern=pattern, index=index):
+            if repeated:
+                return True
+            groups[-1] = True
+            index = end
+    return False
+
+
+class Matcher:
+    """Filter compiled once: include/exclude patterns with literal fast paths
+
+    A string matches when it matches one of the include patterns (or there is
+    none) and none of the exclude patterns. Literal patterns (`abc`, `^abc`,
+    `^abc$`) are matched with substring, prefix or set lookups instead of
+    regular expressions.
+    """
+
+    def __init__(self, includes: Iterable[str] = (), excludes: Iterable[str] = ()):
+        self.includes: tuple[str, ...] = tuple(includes)
+        self.excludes: tuple[str, ...] = tuple(excludes)
+        self.__include = self.__compile(patterns=self.includes, default=True)
+        self.__exclude = self.__compile(patterns=self.excludes, default=False)
+
+    @classmethod
+    def from_string(cls, includes: str = "", excludes: str = "") -> "Matcher":
+        """Get a Matcher from pattern lists, one pattern per line
+
+        Spaces are part of the patterns (a one line filter is one regex).
+        """
+
+        return cls(
+            includes=get_patterns(string=includes),
+            excludes=get_patterns(string=excludes),
+        )
+
+    @property
+    def pathological_patterns(self) -> list[str]:
+        """Patterns that may lead to catastrophic backtracking"""
+
+        return [
+            pattern
+            for pattern in (*self.includes, *self.excludes)
+            if not is_literal(pattern=pattern) and is_pathological_regex(pattern)
+        ]
+
+    @staticmethod
+    def __compile(patterns: tuple[str, ...], default: bool):
+        if not patterns:
+            return lambda _: default
+
+        exact: set[str] = set()
+        prefixes: list[str] = []
+        substrings: list[str] = []
+        regexes: list[Pattern] = []
+        for pattern in patterns:
+            if pattern in MATCH_ALL_PATTERNS:
+                return lambda _: True
+            body: str = pattern.removeprefix("^")
+            anchored: bool = body != pattern
+            if anchored and body.endswith("$") and is_literal(pattern=body[:-1]):
+                exact.add(body[:-1])
+            elif anchored and is_literal(pattern=body):
+                prefixes.append(body)
+            elif is_literal(pattern=pattern):
+                substrings.append(pattern)
+            else:
+                try:
+                    regexes.append(re_compile(pattern))
+                except RegexError as error:
+                    raise ValueError(
+                        f"Invalid filter regex pattern '{pattern}': {error}"
+                    ) from error
+
+        prefixes_tuple: tuple[str, ...] = tuple(prefixes)
+        searches = tuple(regex.search for regex in regexes)
+
+        def matches(string: str) -> bool:
+            return (
+                string in exact
+                or (bool(prefixes_tuple) and string.startswith(prefixes_tuple))
+                or any(substring in string for substring in substrings)
+                or any(search(string) for search in searches)
+            )
+
+        return matches
+
+    def __repr__(self) -> str:
+        return f"Matcher(includes={self.includes}, excludes={self.excludes})"
+
+    def matches(self, string: str) -> bool:
+        """Check if a string (image or tag name) matches the filter"""
+
+        return self.__include(string) and not self.__exclude(string)
+
+    __call__ = matches
+
+
+@lru_cache(maxsize=64)
+def _get_matcher(pattern: str) -> Matcher:
+    return Matcher.from_string(includes=pattern)
+
+
+def get_matcher(pattern: str | Matcher) -> Matcher:
+    """Get (cached) Matcher of an include patterns list (one per line)"""
+
+    return pattern if isinstance(pattern, Matcher) else _get_matcher(pattern=pattern)
@@ -0,0 +1,267 @@
+"""Request Metrics (Prometheus/OpenMetrics Text Export)"""
+
+from bisect import bisect_left
+from math import inf
+from os import getpid, replace
+from threading import Lock
+from typing import Optional
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+from logger import logger
+
+PREFIX: str = "docker_registry_cleaner"
+DURATION_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+CONTENT_TYPES: dict[bool, str] = {
+    False: "text/plain; version=0.0.4; charset=utf-8",
+    True: "application/openmetrics-text; version=1.0.0; charset=utf-8",
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def get_endpoint(url: str) -> str:
+    """Get the registry API endpoint of an URL (metrics label)"""
+
+    path: str = url.partition("?")[0]
+    if path.endswith("/v2/_catalog"):
+        return "catalog"
+    if path.endswith("/tags/list"):
+        return "tags_list"
+    if "/manifests/" in path:
+        return "manifest"
+    if "/blobs/" in path:
+        return "blob"
+    return "other"
+
+
+def format_value(value: float) -> str:
+    """Format a sample value"""
+
+    if value == inf:
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def escape_label_value(value: str) -> str:
+    """Escape a label value (backslash, double quote and line feed)"""
+
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def format_labels(labels: Labels) -> str:
+    """Format (and escape) sample labels"""
+
+    if not labels:
+        return ""
+    escaped: list[str] = [
+        f'{name}="{escape_label_value(value=value)}"' for name, value in labels
+    ]
+    return "{" + ",".join(escaped) + "}"
+
+
+class MetricsHook:
+    """DockerRegistryClient instrumentation hook (no-op)
+
+    Subclass it (see Metrics) to record requests, retries, redirects and
+    reconnections.
+    """
+
+    def on_request(
+        self,
+        url: str,
+        method: str,
+        status: Optional[int],
+        duration: float,
+        size: int = 0,
+    ) -> None:
+        """Response received (status None: network error) after `duration`"""
+
+    def on_retry(self, url: str, method: str) -> None:
+        """Request about to be retried"""
+
+    def on_redirect(self, url: str, location: str) -> None:
+        """Redirect followed"""
+
+    def on_reconnect(self, url: str) -> None:
+        """Broken connection closed (reopened by the next request)"""
+
+
+class Metrics(MetricsHook):
+    """Thread-safe counters, gauges and histograms of registry requests"""
+
+    def __init__(self, buckets: tuple[float, ...] = DURATION_BUCKETS) -> None:
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self.__lock = Lock()
+        self.__families: dict[str, tuple[str, str]] = {}
+        self.__values: dict[str, dict[Labels, float]] = {}
+        self.__histograms: dict[str, dict[Labels, list[float]]] = {}
+
+    def __declare(self, name: str, kind: str, description: str) -> None:
+        self.__families.setdefault(name, (kind, description))
+
+    def inc(self, name: str, description: str, value: float = 1, **labels) -> None:
+        """Increment a counter (name ending with '_total')"""
+
+        with self.__lock:
+            self.__declare(name=name, kind="counter", description=description)
+            values: dict[Labels, float] = self.__values.setdefault(name, {})
+            key: Labels = tuple(sorted(labels.items()))
+            values[key] = values.get(key, 0) + value
+
+    def set(self, name: str, description: str, value: float, **labels) -> None:
+        """Set a gauge"""
+
+        with self.__lock:
+            self.__declare(name=name, kind="gauge", description=description)
+            self.__values.setdefault(name, {})[tuple(sorted(labels.items()))] = value
+
+    def observe(self, name: str, description: str, value: float, **labels) -> None:
+        """Observe a histogram value"""
+
+        with self.__lock:
+            self.__declare(name=name, kind="histogram", description=description)
+            state: list[float] = self.__histograms.setdefault(name, {}).setdefault(
+                tuple(sorted(labels.items())), [0.0] * (len(self.buckets) + 3)
+            )
+            state[bisect_left(self.buckets, value)] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def get(self, name: str, **labels) -> float:
+        """Get a counter or gauge value (0 if unknown)"""
+
+        with self.__lock:
+            return self.__values.get(name, {}).get(tuple(sorted(labels.items())), 0)
+
+    def on_request(
+        self,
+        url: str,
+        method: str,
+        status: Optional[int],
+        duration: float,
+        size: int = 0,
+    ) -> None:
+        endpoint: str = get_endpoint(url=url)
+        self.inc(
+            name=f"{PREFIX}_requests_total",
+            description="Registry requests.",
+            endpoint=endpoint,
+            method=method,
+            status=str(status) if status is not None else "error",
+        )
+        self.observe(
+            name=f"{PREFIX}_request_duration_seconds",
+            description="Registry request duration (until response headers).",
+            value=duration,
+            endpoint=endpoint,
+            method=method,
+        )
+        if size:
+            self.inc(
+                name=f"{PREFIX}_received_bytes_total",
+                description="Registry response bytes (Content-Length).",
+                value=size,
+                endpoint=endpoint,
+            )
+
+    def on_retry(self, url: str, method: str) -> None:
+        self.inc(
+            name=f"{PREFIX}_retries_total",
+            description="Registry requests retried.",
+            endpoint=get_endpoint(url=url),
+            method=method,
+        )
+
+    def on_redirect(self, url: str, location: str) -> None:
+        self.inc(
+            name=f"{PREFIX}_redirects_total",
+            description="Registry redirects followed.",
+            endpoint=get_endpoint(url=url),
+        )
+
+    def on_reconnect(self, url: str) -> None:
+        self.inc(
+            name=f"{PREFIX}_reconnects_total",
+            description="Registry connections reopened after an error.",
+        )
+
+    def render(self, openmetrics: bool = False) -> str:
+        """Render metrics (Prometheus text format 0.0.4 or OpenMetrics)"""
+
+        lines: list[str] = []
+        with self.__lock:
+            for name, (kind, description) in sorted(self.__families.items()):
+                family: str = (
+                    name.removesuffix("_total")
+                    if openmetrics and kind == "counter"
+                    else name
+                )
+                lines.append(f"# HELP {family} {description}")
+                lines.append(f"# TYPE {family} {kind}")
+                if kind != "histogram":
+                    lines.extend(
+                        f"{name}{format_labels(labels=labels)} {format_value(value)}"
+                        for labels, value in sorted(self.__values[name].items())
+                    )
+                    continue
+                for labels, state in sorted(self.__histograms[name].items()):
+                    cumulative: float = 0
+                    for bound, count in zip((*self.buckets, inf), state):
+                        cumulative += count
+                        bucket_labels: Labels = (*labels, ("le", format_value(bound)))
+                        lines.append(
+                            f"{name}_bucket{format_labels(labels=bucket_labels)} "
+                            f"{format_value(cumulative)}"
+                        )
+                    lines.append(
+                        f"{name}_sum{format_labels(labels=labels)} "
+                        f"{format_value(state[-2])}"
+                    )
+                    lines.append(
+                        f"{name}_count{format_labels(labels=labels)} "
+                        f"{format_value(state[-1])}"
+                    )
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str, openmetrics: bool = False) -> None:
+        """Write metrics atomically (node-exporter textfile collector)"""
+
+        temporary_path: str = f"{path}.{getpid()}.tmp"
+        with open(temporary_path, mode="w", encoding="utf-8") as file:
+            file.write(self.render(openmetrics=openmetrics))
+        replace(temporary_path, path)
+
+    def push(
+        self, url: str, job: str, openmetrics: bool = False, timeout: int = 3
+    ) -> bool:
+        """Push metrics to a Pushgateway (replaces the job metrics group)"""
+
+        request = Request(
+            url=f"{url.rstrip('/')}/metrics/job/{quote(job, safe='')}",
+            data=self.render(openmetrics=openmetrics).encode(encoding="utf-8"),
+            headers={"Content-Type": CONTENT_TYPES[openmetrics]},
+            method="PUT",
+        )
+        try:
+            with urlopen(  # nosemgrep: dynamic-urllib-use-detected
+                request, timeout=timeout
+            ) as response:
+                response.read()
+        except OSError as exception:
+            logger.warning(msg=f"❌ Cannot push metrics to '{url}': {exception}")
+            return False
+        return True
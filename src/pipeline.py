@@ -0,0 +1,763 @@
+"""Docker Image Cleanup Pipeline"""
+
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from http.client import HTTPException
+from math import ceil
+from queue import Empty, Queue
+from threading import local
+from time import monotonic, time
+from typing import Any, Callable, Iterable, Iterator, Optional
+from config import Config
+from docker_registry_client import DELETE_BATCH_SIZE, DeleteResult, DockerRegistryClient
+from events import EventWriter, RunSummary
+from gc_estimate import BlobIndex
+from image_tag import DigestTable, ImageTag, join_digests, unpack_digest
+from logger import logger
+from matcher import Matcher, get_matcher
+from metrics import PREFIX as METRICS_PREFIX, Metrics
+from plan import PlanWriter
+from protected_index import ProtectedIndex
+from retention_policy import RetentionEvaluator, RetentionPolicy
+from scheduler import FairScheduler
+from sharding import Checkpoint
+from tag_index import TagIndex
+from utils import get_human_size, get_percentage
+
+
+def log_summary(summary: RunSummary) -> None:
+    """Function that logs summary information"""
+
+    total: int = summary.deleted + summary.failed
+    for kind, count, emoji in [
+        ("deleted", summary.deleted, "🟢"),
+        ("failed", summary.failed, "🔴"),
+    ]:
+        if not count:
+            continue
+
+        logger.info(
+            msg=(
+                f"{emoji} Total {kind} Docker images: {count:>3} "
+                f"({get_percentage(nbr_a=count, nbr_b=total):.2%})"
+            )
+        )
+    if summary.counts["dry_run"]:
+        logger.info(
+            msg=(
+                "🟡 Total Docker images that would be deleted (DRY-RUN): "
+                f"{summary.counts['dry_run']:>3}"
+            )
+        )
+    if summary.failures:
+        logger.info(
+            msg=f"🔴 First {len(summary.failures)} failures -> {summary.failures}"
+        )
+        logger.info(msg=f"🔴 Failures by reason -> {summary.reasons}")
+
+
+def log_gc_estimate(blob_index: BlobIndex) -> None:
+    """Function that logs what the registry garbage collector could reclaim
+
+    An upper bound: only blobs of repositories with deletion candidates are
+    known, other repositories may still reference them.
+    """
+
+    reclaimable: dict[str, tuple[int, int]] = blob_index.get_reclaimable()
+    for repository, (blobs, size) in sorted(
+        reclaimable.items(), key=lambda item: item[1][1], reverse=True
+    ):
+        logger.info(
+            msg=(
+                f"♻️ At most reclaimable by registry GC for '{repository}': "
+                f"{blobs} blobs, {get_human_size(size=size)}"
+            )
+        )
+    logger.info(
+        msg=(
+            "♻️ Total at most reclaimable by registry GC: "
+            f"{sum(blobs for blobs, _ in reclaimable.values())} blobs "
+            f"(out of {len(blob_index)} known), "
+            f"{get_human_size(size=sum(size for _, size in reclaimable.values()))}"
+        )
+    )
+    logger.info(
+        msg=(
+            "♻️ Upper bound, not space freed: blobs may still be referenced by "
+            "repositories without deletion candidates (not scanned)"
+        )
+    )
+
+
+def export_metrics(  # pylint: disable=too-many-arguments
+    metrics: Metrics,
+    summary: RunSummary,
+    images: int,
+    duration: float,
+    success: bool,
+    config: Config,
+    blob_index: Optional[BlobIndex] = None,
+) -> None:
+    """Function that writes and/or pushes run and request metrics"""
+
+    gauges: list[tuple[str, str, float]] = [
+        ("run_duration_seconds", "Cleaner run duration.", duration),
+        ("run_success", "Cleaner run completed without error.", int(success)),
+        ("last_run_timestamp_seconds", "Cleaner run end time.", time()),
+        ("images", "Docker images processed.", images),
+        ("deleted_tags", "Docker image tags deleted.", summary.deleted),
+        ("failed_tags", "Docker image tags not deleted.", summary.failed),
+    ]
+    if blob_index is not None:
+        reclaimable: dict[str, tuple[int, int]] = blob_index.get_reclaimable()
+        gauges.append(
+            (
+                "gc_reclaimable_bytes",
+                "Upper bound of the bytes reclaimable by registry GC.",
+                sum(size for _, size in reclaimable.values()),
+            )
+        )
+    for name, description, value in gauges:
+        metrics.set(
+            name=f"{METRICS_PREFIX}_{name}", description=description, value=value
+        )
+
+    openmetrics: bool = config.metrics_format.lower() == "openmetrics"
+    if config.metrics_file:
+        metrics.write_textfile(path=config.metrics_file, openmetrics=openmetrics)
+        logger.info(msg=f"📈 Metrics written to '{config.metrics_file}'")
+    if config.metrics_pushgateway_url and metrics.push(
+        url=config.metrics_pushgateway_url,
+        job=config.metrics_job,
+        openmetrics=openmetrics,
+        timeout=config.https_connection_timeout,
+    ):
+        logger.info(msg=f"📈 Metrics pushed to '{config.metrics_pushgateway_url}'")
+
+
+class ImageTagsState:  # pylint: disable=too-few-public-methods
+    """Tags of one Docker image grouped by manifest digest (array backed)"""
+
+    def __init__(self, evaluator: Optional[RetentionEvaluator] = None) -> None:
+        self.evaluator = evaluator
+        self.tags_listed: bool = False
+        self.pending_created: int = 0
+        self.listed: bool = False
+        self.pending: int = 0
+        self.tags: list[str] = []
+        self.candidates_count: int = 0
+        self.unresolved: list[ImageTag] = []
+        self.candidates: DigestTable = DigestTable()
+        self.retained: list[ImageTag] = []
+        self.retained_digests: DigestTable = DigestTable()
+        self.retained_unknown: bool = False
+
+
+class CleanerPipeline:
+    """Pipelined tag listing, digest resolution and deletion over a worker pool
+
+    Every worker thread owns its own DockerRegistryClient (and thus its own
+    HTTPS connection). Stages stream their results to the calling thread
+    which runs the next stage callbacks, counts results (summary) and writes
+    one event per tag and action (if an event stream is given).
+    Matching tags are evaluated by the retention policy (if any) and grouped
+    by digest: each manifest is deleted once, and only if no tag outside of
+    the filter (or kept by the policy) still references it.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], DockerRegistryClient],
+        concurrency: int = 1,
+        tags_filter: str | Matcher = r".*",
+        dry_run: bool = True,
+        tags_page_size: Optional[int] = None,
+        tag_index: Optional[TagIndex] = None,
+        retention_policy: Optional[RetentionPolicy] = None,
+        events: Optional[EventWriter] = None,
+        failures_max: int = 10,
+        checkpoint: Optional[Checkpoint] = None,
+        blob_index: Optional[BlobIndex] = None,
+        gc_batch_size: int = 16,
+        plan: Optional[PlanWriter] = None,
+        scheduler: Optional[FairScheduler] = None,
+        name: str = "default",
+        delete_pipeline_depth: int = 1,
+        protected: Optional[ProtectedIndex] = None,
+    ) -> None:
+        self.client_factory = client_factory
+        self.concurrency = max(1, concurrency)
+        self.tags_filter: Matcher = get_matcher(pattern=tags_filter)
+        self.dry_run = dry_run
+        self.tags_page_size = tags_page_size
+        self.tag_index = tag_index
+        self.retention_policy = retention_policy
+        self.images: int = 0
+        self.events = events
+        self.summary = RunSummary(failures_max=failures_max)
+        self.checkpoint = checkpoint
+        self.blob_index = blob_index
+        self.gc_batch_size = max(1, gc_batch_size)
+        self.plan = plan
+        # Concurrency budget shared with other registries (name: scheduler key)
+        self.scheduler = scheduler
+        self.name = name
+        # Bulk deletions: DELETE requests in flight per connection (pipelining)
+        self.delete_pipeline_depth = delete_pipeline_depth
+        # Digests and tags in use (e.g. by running workloads), never deleted
+        self.protected = protected
+        self.__local = local()
+        self.__events: Queue[tuple[Callable[[Any], None], Any]] = Queue()
+        self.__outstanding: int = 0
+        self.__images_state: dict[str, ImageTagsState] = {}
+        self.__deleting: dict[str, int] = {}
+        self.__executor: Optional[ThreadPoolExecutor] = None
+
+    def __client(self) -> DockerRegistryClient:
+        client: Optional[DockerRegistryClient] = getattr(self.__local, "client", None)
+        if client is None:
+            client = self.__local.client = self.client_factory()
+        return client
+
+    def __submit(
+        self,
+        function: Callable[..., Any],
+        callback: Callable[[Any], None],
+        on_done: Optional[Callable[[], None]] = None,
+        **kwargs,
+    ) -> None:
+        if self.__executor is None:
+            raise RuntimeError("Pipeline is not running")
+        self.__outstanding += 1
+        self.__executor.submit(self.__work, function, callback, on_done, kwargs)
+
+    def __work(
+        self,
+        function: Callable[..., Any],
+        callback: Callable[[Any], None],
+        on_done: Optional[Callable[[], None]],
+        kwargs: dict[str, Any],
+    ) -> None:
+        """Worker side: stream stage results (each yielded item) as events"""
+
+        try:
+            with (
+                self.scheduler.slot(key=self.name)
+                if self.scheduler is not None
+                else nullcontext()
+            ):
+                result: Any = function(**kwargs)
+                if isinstance(result, Iterator):
+                    for item in result:
+                        self.__events.put((callback, item))
+                else:
+                    self.__events.put((callback, result))
+        except Exception as exception:  # pylint: disable=broad-exception-caught
+            self.__events.put((self.__raise, exception))
+        self.__events.put((self.__done, on_done))
+
+    @staticmethod
+    def __raise(exception: Exception) -> None:
+        raise exception
+
+    def __done(self, on_done: Optional[Callable[[], None]]) -> None:
+        self.__outstanding -= 1
+        if on_done is not None:
+            on_done()
+
+    def __process_events(self, block: bool) -> None:
+        """Run next stage callbacks (waiting for one event at least if block)"""
+
+        while self.__outstanding:
+            try:
+                callback, value = self.__events.get(block=block)
+            except Empty:
+                return
+            block = False
+            callback(value)
+
+    def __list_tags(self, image: str) -> Iterator[ImageTag]:
+        # Every tag is needed to know which digests are still referenced
+        return self.__client().get_image_tags(
+            image=image, number_max=self.tags_page_size
+        )
+
+    def __get_created(self, image_tag: ImageTag) -> Optional[datetime]:
+        return self.__client().get_image_tag_created(image_tag=image_tag)
+
+    def __get_digest(self, image_tag: ImageTag) -> Optional[str]:
+        return self.__client().get_image_tag_digest(image_tag=image_tag)
+
+    def __delete(self, image: str, digest: str) -> tuple[bool, float]:
+        started: float = monotonic()
+        result: bool = self.__client().delete_image(image=image, digest=digest)
+        return result, monotonic() - started
+
+    def __delete_bulk(self, image: str, digests: list[str]) -> Iterator[DeleteResult]:
+        return self.__client().delete_images(
+            items=((image, digest) for digest in digests),
+            depth=self.delete_pipeline_depth,
+        )
+
+    def __get_blobs(
+        self, image: str, digests: list[str]
+    ) -> Iterator[list[tuple[str, int]]]:
+        client: DockerRegistryClient = self.__client()
+        for digest in digests:
+            try:
+                yield client.get_image_blobs(image=image, digest=digest)
+            except (OSError, HTTPException, KeyError, TypeError, ValueError) as error:
+                logger.warning(msg=f"Cannot get blobs of '{image}@{digest}': {error}")
+
+    def __estimate_gc(
+        self,
+        image: str,
+        deleted: list[str],
+        retained: list[str],
+        on_deleted_blobs: Callable[[], None],
+    ) -> None:
+        """Count blob references of deleted and retained manifests (batched)
+
+        Manifests are only deleted (on_deleted_blobs) once the blobs of all
+        of them are known: deleted manifests answer 404.
+        """
+
+        batches: list[int] = [ceil(len(deleted) / self.gc_batch_size)]
+
+        def on_batch_done() -> None:
+            batches[0] -= 1
+            if not batches[0]:
+                on_deleted_blobs()
+
+        for digests, is_retained in ((deleted, False), (retained, True)):
+            for start in range(0, len(digests), self.gc_batch_size):
+                end: int = start + self.gc_batch_size
+                self.__submit(
+                    self.__get_blobs,
+                    lambda blobs, retained=is_retained: self.blob_index.add(
+                        repository=image, blobs=blobs, retained=retained
+                    ),
+                    on_done=None if is_retained else on_batch_done,
+                    image=image,
+                    digests=digests[start:end],
+                )
+
+    def __record(  # pylint: disable=too-many-arguments
+        self,
+        image: str,
+        tags: list[str],
+        digest: Optional[str],
+        result: str,
+        latency: Optional[float] = None,
+        reason: Optional[str] = None,
+    ) -> None:
+        for tag in tags:
+            self.summary.record(
+                image_tag=ImageTag(image=image, tag=tag), result=result, reason=reason
+            )
+            if self.events is not None:
+                self.events.write(
+                    image=image,
+                    tag=tag,
+                    digest=digest,
+                    result=result,
+                    latency_ms=(
+                        round(latency * 1000, 3) if latency is not None else None
+                    ),
+                    reason=reason,
+                )
+
+    def __resolve_digest(
+        self,
+        image: str,
+        image_tag: ImageTag,
+        on_digest: Callable[..., None],
+        cached: bool = False,
+    ) -> None:
+        self.__images_state[image].pending += 1
+        if self.tag_index is None:
+            self.__submit(
+                self.__get_digest,
+                lambda digest: on_digest(
+                    image=image, image_tag=image_tag, digest=digest
+                ),
+                image_tag=image_tag,
+            )
+            return
+
+        # Known digest (tags list unchanged): no HEAD request needed
+        if (
+            cached
+            and (digest := self.tag_index.get_digest(image=image, tag=image_tag.tag))
+            is not None
+        ):
+            on_digest(image=image, image_tag=image_tag, digest=digest)
+            return
+
+        def on_resolved_digest(digest: Optional[str]) -> None:
+            if digest is not None:
+                self.tag_index.set_digest(image=image, tag=image_tag.tag, digest=digest)
+            on_digest(image=image, image_tag=image_tag, digest=digest)
+
+        self.__submit(self.__get_digest, on_resolved_digest, image_tag=image_tag)
+
+    def __on_tag(self, image: str, image_tag: ImageTag) -> None:
+        state: ImageTagsState = self.__images_state[image]
+        state.tags.append(image_tag.tag)
+        if not self.tags_filter(image_tag.tag):
+            state.retained.append(image_tag)
+            return
+        if state.evaluator is None:
+            self.__add_candidate(image=image, image_tag=image_tag)
+            return
+        if not self.retention_policy.needs_created:
+            self.__on_created(image=image, image_tag=image_tag, created=None)
+            return
+
+        # Creation date (config blob) only fetched for tags matching the filter
+        state.pending_created += 1
+        self.__submit(
+            self.__get_created,
+            lambda created: self.__on_created(
+                image=image, image_tag=image_tag, created=created, fetched=True
+            ),
+            image_tag=image_tag,
+        )
+
+    def __on_created(
+        self,
+        image: str,
+        image_tag: ImageTag,
+        created: Optional[datetime],
+        fetched: bool = False,
+    ) -> None:
+        state: ImageTagsState = self.__images_state[image]
+        if fetched:
+            state.pending_created -= 1
+        for deletable_image_tag in state.evaluator.feed(
+            tag=image_tag.tag, item=image_tag, created=created
+        ):
+            self.__add_candidate(image=image, image_tag=deletable_image_tag)
+        self.__finish_listing(image=image)
+
+    def __add_candidate(self, image: str, image_tag: ImageTag) -> None:
+        state: ImageTagsState = self.__images_state[image]
+        state.candidates_count += 1
+        # Cached digests are only trusted once the whole tags list is known
+        if self.tag_index is not None:
+            state.unresolved.append(image_tag)
+            return
+        self.__resolve_digest(
+            image=image, image_tag=image_tag, on_digest=self.__on_candidate_digest
+        )
+
+    def __on_tags_listed(self, image: str) -> None:
+        self.__images_state[image].tags_listed = True
+        self.__finish_listing(image=image)
+
+    def __finish_listing(self, image: str) -> None:
+        """Once tags are listed and evaluated, resolve digests of retained tags"""
+
+        state: ImageTagsState = self.__images_state[image]
+        if not state.tags_listed or state.pending_created:
+            return
+        if state.evaluator is not None:
+            kept: list[ImageTag] = state.evaluator.finish()
+            logger.info(
+                msg=(
+                    "🛡️ Number of Docker tags kept by retention policy"
+                    f" for '{image}': {len(kept)}"
+                )
+            )
+            state.retained.extend(kept)
+        cached: bool = False
+        if self.tag_index is not None:
+            if not self.tag_index.is_tags_changed(image=image, tags=state.tags):
+                logger.debug(msg=f"Tags list of '{image}' unchanged since last run")
+                cached = True
+            self.tag_index.update_tags(image=image, tags=state.tags)
+        logger.info(
+            msg=(
+                "💡 Number of Docker tags marked as deletion"
+                f" for '{image}': {state.candidates_count}"
+            )
+        )
+
+        # No Docker image tags found
+        if not state.candidates_count:
+            tags_filter: Matcher = self.tags_filter
+            logger.warning(msg=f"🤡 No Docker tags found ({image=} {tags_filter=})")
+            del self.__images_state[image]
+            self.__on_image_done(image=image)
+            return
+
+        for image_tag in state.unresolved:
+            self.__resolve_digest(
+                image=image,
+                image_tag=image_tag,
+                on_digest=self.__on_candidate_digest,
+                cached=cached,
+            )
+        state.unresolved.clear()
+
+        # Digests of the other tags are needed before deleting any manifest,
+        # always resolved again: a kept tag may have moved onto a candidate
+        for image_tag in state.retained:
+            self.__resolve_digest(
+                image=image, image_tag=image_tag, on_digest=self.__on_retained_digest
+            )
+        state.listed = True
+        self.__delete_digests(image=image)
+
+    def __on_candidate_digest(
+        self, image: str, image_tag: ImageTag, digest: Optional[str]
+    ) -> None:
+        state: ImageTagsState = self.__images_state[image]
+        state.pending -= 1
+        if digest is None:
+            logger.warning(
+                msg=f"❌ Error: cannot get digest for Docker image '{image_tag}"
+            )
+            self.__record(
+                image=image,
+                tags=[image_tag.tag],
+                digest=None,
+                result="failed",
+                reason="digest unknown",
+            )
+        else:
+            state.candidates.add(tag=image_tag.tag, digest=digest)
+        self.__delete_digests(image=image)
+
+    def __on_retained_digest(
+        self, image: str, image_tag: ImageTag, digest: Optional[str]
+    ) -> None:
+        state: ImageTagsState = self.__images_state[image]
+        state.pending -= 1
+        if digest is None:
+            logger.warning(
+                msg=f"❌ Error: cannot get digest for Docker image '{image_tag}"
+            )
+            state.retained_unknown = True
+        else:
+            state.retained_digests.add(tag=image_tag.tag, digest=digest)
+        self.__delete_digests(image=image)
+
+    def __delete_digests(self, image: str) -> None:
+        """Delete each manifest digest once, when all digests of image are known"""
+
+        state: ImageTagsState = self.__images_state[image]
+        if not state.listed or state.pending:
+            return
+        del self.__images_state[image]
+
+        deleted: list[str] = []
+        deleting: dict[str, list[str]] = {}
+        for digest, tags, retained_tag in join_digests(
+            candidates=state.candidates, retained=state.retained_digests
+        ):
+            names: list[str] = [f"{image}:{tag}" for tag in tags]
+            if state.retained_unknown:
+                logger.warning(
+                    msg=(
+                        f"❌ Error: cannot check Docker image tags {names} "
+                        f"({digest}) are not referenced by other tags"
+                    )
+                )
+                self.__record(
+                    image=image,
+                    tags=tags,
+                    digest=digest,
+                    result="failed",
+                    reason="referencing tags unknown",
+                )
+                continue
+
+            if retained_tag is not None:
+                logger.info(
+                    msg=(
+                        f"🛡️ Keeping Docker image tags {names} ({digest}), "
+                        f"digest still referenced by '{image}:{retained_tag}'"
+                    )
+                )
+                self.__record(
+                    image=image,
+                    tags=tags,
+                    digest=digest,
+                    result="kept",
+                    reason=f"referenced by '{image}:{retained_tag}'",
+                )
+                continue
+
+            if self.protected is not None and (
+                reason := self.protected.get_reason(
+                    image=image, digest=digest, tags=tags
+                )
+            ):
+                logger.info(
+                    msg=f"🛡️ Keeping Docker image tags {names} ({digest}), {reason}"
+                )
+                self.__record(
+                    image=image,
+                    tags=tags,
+                    digest=digest,
+                    result="kept",
+                    reason=reason,
+                )
+                continue
+
+            deleted.append(digest)
+            message: str = (
+                f"🔫 Deleting Docker image tags {names} using digest '{digest}'"
+            )
+
+            if self.dry_run:
+                logger.info(msg=f"{message} (DRY-RUN)")
+                self.__record(image=image, tags=tags, digest=digest, result="dry_run")
+                if self.plan is not None:
+                    self.plan.write(image=image, digest=digest, tags=tags)
+                continue
+
+            logger.info(msg=message)
+
+            # Deleted once for all its tags (once the GC estimate has its blobs)
+            self.__deleting[image] = self.__deleting.get(image, 0) + 1
+            deleting[digest] = tags
+
+        if self.blob_index is not None and deleted:
+            self.__estimate_gc(
+                image=image,
+                deleted=deleted,
+                retained=[
+                    unpack_digest(packed=packed)
+                    for packed, _ in state.retained_digests.groups()
+                ],
+                on_deleted_blobs=lambda: self.__submit_deletes(
+                    image=image, deleting=deleting
+                ),
+            )
+        else:
+            self.__submit_deletes(image=image, deleting=deleting)
+
+        if image not in self.__deleting:
+            self.__on_image_done(image=image)
+
+    def __submit_deletes(self, image: str, deleting: dict[str, list[str]]) -> None:
+        """Delete manifests one per task, or in batches of pipelined requests"""
+
+        if self.delete_pipeline_depth <= 1:
+            for digest, tags in deleting.items():
+                self.__submit(
+                    self.__delete,
+                    lambda result, digest=digest, tags=tags: self.__on_delete(
+                        image=image, tags=tags, digest=digest, result=result
+                    ),
+                    image=image,
+                    digest=digest,
+                )
+            return
+
+        # Bulk deletions: batches run by several workers, pipelined requests
+        digests: list[str] = list(deleting)
+        for start in range(0, len(digests), DELETE_BATCH_SIZE):
+            end: int = start + DELETE_BATCH_SIZE
+            self.__submit(
+                self.__delete_bulk,
+                lambda result: self.__on_delete(
+                    image=image,
+                    tags=deleting[result.digest],
+                    digest=result.digest,
+                    result=(result.deleted, result.latency),
+                ),
+                image=image,
+                digests=digests[start:end],
+            )
+
+    def __on_image_done(self, image: str) -> None:
+        if self.checkpoint is not None:
+            self.checkpoint.done(image=image)
+
+    def __on_delete(
+        self,
+        image: str,
+        tags: list[str],
+        digest: str,
+        result: tuple[bool, float],
+    ) -> None:
+        deleted, latency = result
+        names: list[str] = [f"{image}:{tag}" for tag in tags]
+        if deleted:
+            if self.tag_index is not None:
+                self.tag_index.delete_tags(
+                    image=image,
+                    tags=tags,
+                )
+            logger.info(
+                msg=f"✅ Docker image tags {names} ({digest}) deleted successfully"
+            )
+            self.__record(
+                image=image,
+                tags=tags,
+                digest=digest,
+                result="deleted",
+                latency=latency,
+            )
+        else:
+            logger.warning(
+                msg=(
+                    "❌ Error while trying to delete Docker image tags "
+                    f"{names} ({digest})"
+                )
+            )
+            self.__record(
+                image=image,
+                tags=tags,
+                digest=digest,
+                result="failed",
+                latency=latency,
+                reason="delete failed",
+            )
+
+        self.__deleting[image] -= 1
+        if not self.__deleting[image]:
+            del self.__deleting[image]
+            self.__on_image_done(image=image)
+
+    def run(self, images: Iterable[str]) -> None:
+        """Process Docker images through the pipeline until every stage is done
+
+        Images are consumed lazily (e.g. from a paginated catalog) so that
+        the first deletions start before the whole catalog has been listed.
+        """
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="cleaner"
+        ) as self.__executor:
+            for image in images:
+                self.images += 1
+                if self.checkpoint is not None:
+                    self.checkpoint.start(image=image)
+                self.__images_state[image] = ImageTagsState(
+                    evaluator=(
+                        self.retention_policy.evaluator()
+                        if self.retention_policy and self.retention_policy.is_enabled
+                        else None
+                    )
+                )
+                self.__submit(
+                    self.__list_tags,
+                    lambda image_tag, image=image: self.__on_tag(
+                        image=image, image_tag=image_tag
+                    ),
+                    on_done=lambda image=image: self.__on_tags_listed(image=image),
+                    image=image,
+                )
+                # Backpressure: do not list more images than workers can follow
+                self.__process_events(block=self.__outstanding > self.concurrency)
+
+            while self.__outstanding:
+                self.__process_events(block=True)
+        self.__executor = None
+
+        logger.info(msg=f"💡 Number of Docker images: {self.images}")
@@ -0,0 +1,261 @@
+"""Serialized Deletion Plan (JSON Lines) And Concurrent Apply"""
+
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from json import JSONDecodeError, dumps, loads
+from threading import local
+from time import monotonic
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, TextIO
+from docker_registry_client import DockerRegistryClient
+from events import EventWriter, RunSummary
+from image_tag import ImageTag
+from logger import logger
+from protected_index import ProtectedIndex
+from tag_index import TagIndex
+
+PLAN_VERSION: int = 1
+
+
+class PlanEntry(NamedTuple):
+    """One manifest to delete: its digest and the tags referencing it"""
+
+    image: str
+    digest: str
+    tags: list[str]
+
+
+class PlanWriter:
+    """Deletion plan stream: a header line, then one line per manifest
+
+    The header records the registry the plan was made for; apply refuses a
+    plan made for another registry.
+    """
+
+    def __init__(self, stream: TextIO, registry: str) -> None:
+        self.stream = stream
+        self.entries: int = 0
+        self.__write(
+            plan=PLAN_VERSION,
+            registry=registry,
+            created=datetime.now(tz=timezone.utc).isoformat(timespec="seconds"),
+        )
+
+    @classmethod
+    def open(cls, path: str, registry: str) -> "PlanWriter":
+        """Open a plan stream on a file (truncated) or stdout ('-')"""
+
+        if path == "-":
+            return cls(stream=sys.stdout, registry=registry)
+        # pylint: disable=consider-using-with
+        return cls(stream=open(path, mode="w", encoding="utf-8"), registry=registry)
+
+    def __enter__(self) -> "PlanWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __write(self, **fields: Any) -> None:
+        self.stream.write(dumps(obj=fields, separators=(",", ":")) + "\n")
+
+    def write(self, image: str, digest: str, tags: list[str]) -> None:
+        """Write one manifest to delete"""
+
+        self.entries += 1
+        self.__write(image=image, digest=digest, tags=tags)
+
+    def close(self) -> None:
+        """Flush the stream (and close it unless it is stdout)"""
+
+        if self.stream is sys.stdout:
+            self.stream.flush()
+        else:
+            self.stream.close()
+
+
+def read_plan(stream: Iterable[str], registry: str) -> Iterator[PlanEntry]:
+    """Read a deletion plan lazily (header checked against `registry`)"""
+
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record: dict[str, Any] = loads(line)
+        except JSONDecodeError as exception:
+            raise ValueError(f"Invalid plan line {number}: {exception}") from None
+        if number == 1:
+            if record.get("plan") != PLAN_VERSION:
+                raise ValueError(f"Unsupported plan header: {line.strip()}")
+            if record.get("registry") != registry:
+                raise ValueError(
+                    f"Plan made for another registry ({record.get('registry')})"
+                )
+            continue
+        try:
+            yield PlanEntry(
+                image=record["image"], digest=record["digest"], tags=record["tags"]
+            )
+        except (KeyError, TypeError):
+            raise ValueError(f"Invalid plan line {number}: {line.strip()}") from None
+
+
+class PlanApplier:
+    """Concurrent deletion of the manifests of a plan (streamed)
+
+    Tags are resolved again before deleting: tags re-pushed (or deleted)
+    since the plan was made are kept, and a manifest none of its planned tags
+    still references is not deleted. Tags pointed at a planned manifest after
+    the plan was made are not detected: apply plans soon after review.
+    Protected manifests (digest or tags in use) are kept without requests.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        client_factory: Callable[[], DockerRegistryClient],
+        concurrency: int = 1,
+        tag_index: Optional[TagIndex] = None,
+        events: Optional[EventWriter] = None,
+        failures_max: int = 10,
+        protected: Optional[ProtectedIndex] = None,
+    ) -> None:
+        self.client_factory = client_factory
+        self.concurrency = max(1, concurrency)
+        self.tag_index = tag_index
+        self.events = events
+        self.summary = RunSummary(failures_max=failures_max)
+        self.entries: int = 0
+        self.protected = protected
+        self.__local = local()
+
+    def __client(self) -> DockerRegistryClient:
+        client: Optional[DockerRegistryClient] = getattr(self.__local, "client", None)
+        if client is None:
+            client = self.__local.client = self.client_factory()
+        return client
+
+    def __apply(
+        self, entry: PlanEntry
+    ) -> tuple[PlanEntry, list[str], Optional[bool], float]:
+        """Worker side: check tags digests, then delete the manifest"""
+
+        client: DockerRegistryClient = self.__client()
+        current: list[str] = [
+            tag
+            for tag in entry.tags
+            if client.get_image_tag_digest(
+                image_tag=ImageTag(image=entry.image, tag=tag)
+            )
+            == entry.digest
+        ]
+        if not current:
+            return entry, current, None, 0.0
+        started: float = monotonic()
+        deleted: bool = client.delete_image(image=entry.image, digest=entry.digest)
+        return entry, current, deleted, monotonic() - started
+
+    def __record(  # pylint: disable=too-many-arguments
+        self,
+        entry: PlanEntry,
+        tags: list[str],
+        result: str,
+        latency: Optional[float] = None,
+        reason: Optional[str] = None,
+    ) -> None:
+        for tag in tags:
+            self.summary.record(
+                image_tag=ImageTag(image=entry.image, tag=tag),
+                result=result,
+                reason=reason,
+            )
+            if self.events is not None:
+                self.events.write(
+                    image=entry.image,
+                    tag=tag,
+                    digest=entry.digest,
+                    result=result,
+                    latency_ms=(
+                        round(latency * 1000, 3) if latency is not None else None
+                    ),
+                    reason=reason,
+                )
+
+    def __on_applied(
+        self, result: tuple[PlanEntry, list[str], Optional[bool], float]
+    ) -> None:
+        entry, current, deleted, latency = result
+        image_tags: list[str] = [f"{entry.image}:{tag}" for tag in current]
+        if changed := [tag for tag in entry.tags if tag not in current]:
+            logger.warning(
+                msg=(
+                    f"🛡️ Keeping Docker image tags {changed} of '{entry.image}', "
+                    f"digest changed since plan ({entry.digest})"
+                )
+            )
+            self.__record(
+                entry=entry,
+                tags=changed,
+                result="kept",
+                reason="digest changed since plan",
+            )
+        if deleted is None:
+            return
+        if deleted:
+            if self.tag_index is not None:
+                self.tag_index.delete_tags(image=entry.image, tags=current)
+            logger.info(
+                msg=(
+                    f"✅ Docker image tags {image_tags} ({entry.digest}) "
+                    "deleted successfully"
+                )
+            )
+            self.__record(entry=entry, tags=current, result="deleted", latency=latency)
+        else:
+            logger.warning(
+                msg=(
+                    "❌ Error while trying to delete Docker image tags "
+                    f"{image_tags} ({entry.digest})"
+                )
+            )
+            self.__record(
+                entry=entry,
+                tags=current,
+                result="failed",
+                latency=latency,
+                reason="delete failed",
+            )
+
+    def run(self, entries: Iterable[PlanEntry]) -> None:
+        """Apply plan entries, read lazily (bounded number of pending entries)"""
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="apply"
+        ) as executor:
+            pending: set[Future] = set()
+            for entry in entries:
+                self.entries += 1
+                if self.protected is not None and (
+                    reason := self.protected.get_reason(
+                        image=entry.image, digest=entry.digest, tags=entry.tags
+                    )
+                ):
+                    logger.info(
+                        msg=(
+                            f"🛡️ Keeping Docker image tags {entry.tags} of "
+                            f"'{entry.image}' ({entry.digest}), {reason}"
+                        )
+                    )
+                    self.__record(
+                        entry=entry, tags=entry.tags, result="kept", reason=reason
+                    )
+                    continue
+                pending.add(executor.submit(self.__apply, entry))
+                # Backpressure: do not read more entries than workers can follow
+                if len(pending) >= 2 * self.concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self.__on_applied(result=future.result())
+            for future in wait(pending).done:
+                self.__on_applied(result=future.result())
+
+        logger.info(msg=f"💡 Number of Docker manifests in plan: {self.entries}")
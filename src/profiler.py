@@ -0,0 +1,318 @@
+"""Run Profiling (Per-Phase Timing Report, cProfile And Collapsed Stacks)"""
+
+import sys
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from math import ceil
+from os import path as os_path
+from threading import Event, Lock, Thread, current_thread, enumerate as threads, local
+from threading import setprofile as threading_setprofile
+from time import perf_counter, thread_time
+from typing import Any, Callable, Generator, Iterator, Mapping, Optional, TypeVar
+from logger import logger
+from matcher import Matcher
+
+# DockerRegistryClient methods timed by `Profiler.instrument`: method -> phase
+CLIENT_PHASES: dict[str, str] = {
+    "get_images": "catalog",
+    "get_image_tags": "tags",
+    "get_image_tag_digest": "digest",
+    "get_image_tag_created": "created",
+    "get_image_blobs": "blobs",
+    "delete_image": "delete",
+    "delete_images": "delete",
+}
+# Profile files written as collapsed stacks (flamegraph.pl, speedscope...)
+COLLAPSED_EXTENSIONS: tuple[str, ...] = (".collapsed", ".folded")
+SAMPLE_INTERVAL: float = 0.005
+
+T = TypeVar("T")
+
+
+class PhaseTimings:  # pylint: disable=too-few-public-methods
+    """Wall time of each call of a phase (compact array), CPU time summed"""
+
+    __slots__ = ("walls", "cpu")
+
+    def __init__(self) -> None:
+        self.walls: array = array("d")
+        self.cpu: float = 0.0
+
+
+def get_percentile(values: list[float], percentile: float) -> float:
+    """Get a percentile (nearest rank) of sorted values"""
+
+    if not values:
+        return 0.0
+    return values[max(0, ceil(len(values) * percentile / 100) - 1)]
+
+
+def get_thread_group(name: str) -> str:
+    """Get the name of a thread without its pool number (cleaner_3 -> cleaner)"""
+
+    return name.rstrip("0123456789").rstrip("_-") or name
+
+
+class Profiler:
+    """Timers of the run phases, reported at the end of the run
+
+    Each call of a phase records its wall time and the CPU time of its
+    thread: the difference is time spent waiting (network, locks, sleeps).
+    A phase called again within itself (recursion, bulk deletes falling
+    back to single deletes) is only counted once. With an output file, the
+    run is also profiled: cProfile statistics (pstats), or stacks of every
+    thread sampled every few milliseconds for '.collapsed'/'.folded' files.
+    """
+
+    def __init__(
+        self, output: Optional[str] = None, interval: float = SAMPLE_INTERVAL
+    ) -> None:
+        self.output = output
+        self.interval = interval
+        self.phases: dict[str, PhaseTimings] = {}
+        self.stacks: Counter[str] = Counter()
+        self.__lock = Lock()
+        self.__local = local()
+        self.__profiles: list[Any] = []
+        self.__sampler: Optional[Thread] = None
+        self.__stopped = Event()
+
+    @property
+    def collapsed(self) -> bool:
+        """Output file is written as collapsed stacks (not pstats)"""
+
+        return bool(self.output) and self.output.endswith(COLLAPSED_EXTENSIONS)
+
+    def record(self, name: str, wall: float, cpu: float) -> None:
+        """Record one call of a phase"""
+
+        with self.__lock:
+            timings: PhaseTimings = self.phases.setdefault(name, PhaseTimings())
+            timings.walls.append(wall)
+            timings.cpu += cpu
+
+    def __enter_phase(self, name: str) -> bool:
+        active: set[str] = getattr(self.__local, "active", None) or set()
+        self.__local.active = active
+        if name in active:
+            return False
+        active.add(name)
+        return True
+
+    def __exit_phase(self, name: str) -> None:
+        self.__local.active.discard(name)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block: `with profiler.phase(name="setup"): ...`"""
+
+        started: float = perf_counter()
+        started_cpu: float = thread_time()
+        try:
+            yield
+        finally:
+            self.record(
+                name=name,
+                wall=perf_counter() - started,
+                cpu=thread_time() - started_cpu,
+            )
+
+    def wrap(self, name: str, function: Callable[..., T]) -> Callable[..., T]:
+        """Time the calls of a function (generators: until exhausted)"""
+
+        @wraps(function)
+        def timed(*args, **kwargs) -> T:
+            if not self.__enter_phase(name=name):
+                return function(*args, **kwargs)
+            started: float = perf_counter()
+            started_cpu: float = thread_time()
+            try:
+                result: Any = function(*args, **kwargs)
+            finally:
+                wall: float = perf_counter() - started
+                cpu: float = thread_time() - started_cpu
+                self.__exit_phase(name=name)
+            if isinstance(result, Generator):
+                return self.__wrap_generator(
+                    name=name, generator=result, wall=wall, cpu=cpu
+                )
+            self.record(name=name, wall=wall, cpu=cpu)
+            return result
+
+        return timed
+
+    def __wrap_generator(
+        self, name: str, generator: Generator, wall: float, cpu: float
+    ) -> Iterator[Any]:
+        """Time each step of a generator, recorded as one call"""
+
+        try:
+            while True:
+                nested: bool = not self.__enter_phase(name=name)
+                started: float = perf_counter()
+                started_cpu: float = thread_time()
+                try:
+                    item: Any = next(generator)
+                except StopIteration:
+                    return
+                finally:
+                    if not nested:
+                        wall += perf_counter() - started
+                        cpu += thread_time() - started_cpu
+                        self.__exit_phase(name=name)
+                yield item
+        finally:
+            generator.close()
+            self.record(name=name, wall=wall, cpu=cpu)
+
+    def instrument(self, obj: T, phases: Optional[Mapping[str, str]] = None) -> T:
+        """Time methods of an object (method name -> phase name), in place
+
+        Default phases: `CLIENT_PHASES` (DockerRegistryClient methods).
+        """
+
+        for method, name in (CLIENT_PHASES if phases is None else phases).items():
+            if hasattr(obj, method):
+                function: Callable[..., Any] = getattr(obj, method)
+                setattr(obj, method, self.wrap(name=name, function=function))
+        return obj
+
+    def start(self) -> None:
+        """Start timing log records output, and profiling to the output file"""
+
+        # Root logger handlers (restored by `stop`)
+        for handler in logger.root.handlers:
+            handler.emit = self.wrap(name="logging", function=handler.emit)
+        if not self.output:
+            return
+        if self.collapsed:
+            self.__stopped.clear()
+            self.__sampler = Thread(target=self.__sample, name="profiler", daemon=True)
+            self.__sampler.start()
+            return
+
+        # pylint: disable-next=import-outside-toplevel
+        from cProfile import Profile
+
+        self.__profiles = [Profile()]
+        self.__profiles[0].enable()
+        if sys.version_info < (3, 12):
+            # One profile per thread (Python 3.12+: a profile sees every thread)
+            threading_setprofile(self.__profile_thread)
+
+    def __profile_thread(self, *_) -> None:
+        # pylint: disable-next=import-outside-toplevel
+        from cProfile import Profile
+
+        sys.setprofile(None)
+        profile = Profile()
+        with self.__lock:
+            self.__profiles.append(profile)
+        profile.enable()
+
+    def __sample(self) -> None:
+        """Sample the stacks of the other threads (collapsed stack lines)"""
+
+        sampler: Optional[int] = current_thread().ident
+        while not self.__stopped.wait(timeout=self.interval):
+            names: dict[Optional[int], str] = {
+                thread.ident: get_thread_group(name=thread.name) for thread in threads()
+            }
+            # pylint: disable-next=protected-access
+            for ident, frame in sys._current_frames().items():
+                if ident == sampler:
+                    continue
+                frames: list[str] = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(
+                        f"{code.co_qualname} "
+                        f"({os_path.basename(code.co_filename)}:{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                thread: str = names.get(ident, "thread")
+                self.stacks[";".join((thread, *reversed(frames)))] += 1
+
+    def stop(self) -> None:
+        """Stop timing log records output, and profiling (output file written)"""
+
+        for handler in logger.root.handlers:
+            if "emit" in vars(handler):
+                del handler.emit
+        if not self.output:
+            return
+        if self.collapsed:
+            self.__stopped.set()
+            if self.__sampler is not None:
+                self.__sampler.join()
+            with open(self.output, mode="w", encoding="utf-8") as file:
+                for stack, count in sorted(self.stacks.items()):
+                    file.write(f"{stack} {count}\n")
+        else:
+            # pylint: disable-next=import-outside-toplevel
+            from pstats import Stats
+
+            threading_setprofile(None)
+            self.__profiles[0].disable()
+            with self.__lock:
+                Stats(*self.__profiles).dump_stats(self.output)
+        logger.info(msg=f"⏱️ Profile written to '{self.output}'")
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def report(self) -> list[str]:
+        """Per-phase report lines (slowest phases first)"""
+
+        lines: list[str] = [
+            f"{'phase':<12} {'calls':>8} {'total s':>10} {'mean ms':>10} "
+            f"{'p99 ms':>10} {'cpu s':>10} {'wait s':>10}"
+        ]
+        with self.__lock:
+            phases: list[tuple[str, list[float], float]] = [
+                (name, sorted(timings.walls), timings.cpu)
+                for name, timings in self.phases.items()
+            ]
+        for name, walls, cpu in sorted(phases, key=lambda phase: -sum(phase[1])):
+            total: float = sum(walls)
+            lines.append(
+                f"{name:<12} {len(walls):>8} {total:>10.3f} "
+                f"{total / len(walls) * 1000:>10.3f} "
+                f"{get_percentile(values=walls, percentile=99) * 1000:>10.3f} "
+                f"{cpu:>10.3f} {max(0.0, total - cpu):>10.3f}"
+            )
+        return lines
+
+    def log_report(self) -> None:
+        """Log the per-phase report"""
+
+        logger.info(
+            msg="⏱️ Profile (summed over threads, wait: network, locks, sleeps)"
+        )
+        for line in self.report():
+            logger.info(msg=f"⏱️ {line}")
+
+
+class ProfiledMatcher(Matcher):
+    """Matcher timing its matches (phase `name`, CPU only)"""
+
+    def __init__(self, matcher: Matcher, profiler: Profiler, name: str) -> None:
+        super().__init__(includes=matcher.includes, excludes=matcher.excludes)
+        self.profiler = profiler
+        self.name = name
+
+    def matches(self, string: str) -> bool:
+        started: float = perf_counter()
+        try:
+            return super().matches(string)
+        finally:
+            duration: float = perf_counter() - started
+            self.profiler.record(name=self.name, wall=duration, cpu=duration)
+
+    __call__ = matches
@@ -0,0 +1,172 @@
+"""Protected Digests And Tags (Images In Use By Running Workloads)"""
+
+from array import array
+from bisect import bisect_left
+from itertools import filterfalse
+from re import compile as re_compile
+from sys import byteorder
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+from image_tag import ImageTag
+
+# Bytes read at once (rounded up to the end of a line)
+CHUNK_SIZE: int = 4 * 1024 * 1024
+# Digests anywhere (bare, 'image@sha256:...', 'docker-pullable://...'):
+# matched on their first 60 bits (a collision keeps an image, never deletes)
+FINGERPRINT_BITS: int = 60
+DIGEST_PATTERN = re_compile(rb"sha256:([0-9a-f]{15})")
+# One reference per line: its first digest, the rest of the line skipped
+LINE_DIGEST_PATTERN = re_compile(rb"sha256:([0-9a-f]{15})[^\n]*")
+COMMENT_PATTERN = re_compile(rb"#[^\n]*")
+# Whitespace within lines: several references per line
+SEPARATORS: tuple[bytes, ...] = (b" ", b"\t", b"\r", b"\x0b", b"\x0c")
+# Fingerprints per directory bucket (average)
+BUCKET_SIZE: int = 64
+
+
+def get_fingerprint(digest: str) -> Optional[int]:
+    """Get the 60 bits fingerprint of a 'sha256:<hex>' digest (None: other)"""
+
+    if not digest.startswith("sha256:") or len(digest) != 71:
+        return None
+    try:
+        return int(digest[7:22], 16)
+    except ValueError:
+        return None
+
+
+def get_registry_host(url: str) -> str:
+    """Get the host[:port] of a registry URL as written in image references"""
+
+    return urlparse(url).netloc.removesuffix(":443")
+
+
+def parse_reference(reference: str, registry_host: str) -> Optional[ImageTag]:
+    """Parse an '[host/]image[:tag]' reference of this registry (None: other)
+
+    References without host are kept (they may come from this registry).
+    """
+
+    reference = reference.rpartition("://")[2]
+    first, separator, rest = reference.partition("/")
+    if separator and ("." in first or ":" in first or first == "localhost"):
+        if first.removesuffix(":443") != registry_host:
+            return None
+        reference = rest
+    if not reference:
+        return None
+    return ImageTag.parse(reference=reference)
+
+
+def split_chunk(chunk: bytes) -> tuple[list[bytes], Iterable[bytes]]:
+    """Split lines into digests (hex prefixes) and the tokens without digest
+
+    With one reference per line, the lines are only tokenized if some of
+    them have no digest.
+    """
+
+    if any(separator in chunk for separator in SEPARATORS):
+        hexes: list[bytes] = DIGEST_PATTERN.findall(chunk)
+    else:
+        hexes = LINE_DIGEST_PATTERN.findall(chunk)
+        if len(hexes) == chunk.count(b"\n") + (not chunk.endswith(b"\n")):
+            return hexes, ()
+    return hexes, filterfalse(DIGEST_PATTERN.search, chunk.split())
+
+
+def sort_fingerprints(fingerprints: array) -> array:
+    """Sort fingerprints (below 2**62) without one Python int each
+
+    Their bits read as doubles are positive finite numbers in the same
+    order, and a list of floats sorts faster than a list of big ints.
+    """
+
+    doubles: list[float] = memoryview(fingerprints).cast("B").cast("d").tolist()
+    doubles.sort()
+    return array("Q", array("d", doubles).tobytes())
+
+
+class ProtectedIndex:
+    """Digests and tags never deleted, e.g. images of running workloads
+
+    Loaded from a file of whitespace separated references ('#' comments):
+    digests (`sha256:...`, `image@sha256:...`, `docker-pullable://...`)
+    protect a manifest whatever its tags, `[host/]image[:tag]` references
+    protect the manifest of a tag of this registry. Digests are kept as
+    60 bits fingerprints in one sorted array (8 bytes each) with a bucket
+    directory: lookups are O(1), no object per digest.
+    """
+
+    def __init__(
+        self, fingerprints: Iterable[int] = (), image_tags: Iterable[str] = ()
+    ) -> None:
+        self.fingerprints: array = sort_fingerprints(
+            fingerprints=array("Q", fingerprints)
+        )
+        self.image_tags: frozenset[str] = frozenset(image_tags)
+        # Buckets: fingerprints sharing their high `bits` bits
+        bits: int = (len(self.fingerprints) // BUCKET_SIZE).bit_length()
+        self.__shift: int = FINGERPRINT_BITS - bits
+        self.__offsets: array = array(
+            "Q",
+            (
+                bisect_left(self.fingerprints, bucket << self.__shift)
+                for bucket in range(1 << bits)
+            ),
+        )
+        self.__offsets.append(len(self.fingerprints))
+
+    def __len__(self) -> int:
+        return len(self.fingerprints) + len(self.image_tags)
+
+    @classmethod
+    def load(cls, path: str, registry_url: str = "") -> "ProtectedIndex":
+        """Load a protection file (references of other registries ignored)"""
+
+        registry_host: str = get_registry_host(url=registry_url)
+        fingerprints: array = array("Q")
+        image_tags: set[str] = set()
+        with open(path, mode="rb") as file:
+            while chunk := file.read(CHUNK_SIZE) + file.readline():
+                if b"#" in chunk:
+                    chunk = COMMENT_PATTERN.sub(b"", chunk)
+                hexes, tokens = split_chunk(chunk=chunk)
+                # Digests: parsed in bulk (zero padded hex prefixes -> big endian)
+                if hexes:
+                    fingerprints.frombytes(
+                        bytes.fromhex((b"0" + b"0".join(hexes)).decode())
+                    )
+                # Other tokens: 'image[:tag]' references (each parsed once)
+                for token in set(tokens):
+                    if b"@" in token or token.startswith(b"sha256:"):
+                        continue
+                    image_tag: Optional[ImageTag] = parse_reference(
+                        reference=token.decode(), registry_host=registry_host
+                    )
+                    if image_tag is not None:
+                        image_tags.add(str(image_tag))
+        if byteorder == "little":
+            fingerprints.byteswap()
+        return cls(fingerprints=fingerprints, image_tags=image_tags)
+
+    def protects_digest(self, digest: str) -> bool:
+        """Check if a manifest digest is protected"""
+
+        fingerprint: Optional[int] = get_fingerprint(digest=digest)
+        if fingerprint is None:
+            return False
+        bucket: int = fingerprint >> self.__shift
+        start: int = self.__offsets[bucket]
+        end: int = self.__offsets[bucket + 1]
+        index: int = bisect_left(self.fingerprints, fingerprint, start, end)
+        return index < end and self.fingerprints[index] == fingerprint
+
+    def get_reason(self, image: str, digest: str, tags: Iterable[str]) -> Optional[str]:
+        """Get why a manifest must be kept (None: not protected)"""
+
+        if self.protects_digest(digest=digest):
+            return "protected digest"
+        for tag in tags:
+            if f"{image}:{tag}" in self.image_tags:
+                return f"protected '{image}:{tag}'"
+        return None
@@ -0,0 +1,110 @@
+"""Adaptive Rate Limiter And Retry Policy"""
+
+from random import uniform
+from threading import Lock
+from time import monotonic, sleep
+from typing import Callable, Optional
+
+RETRYABLE_STATUSES: frozenset[int] = frozenset((429, 502, 503, 504))
+# Longest Retry-After (seconds) blocking every worker
+RETRY_AFTER_MAX: float = 30
+
+
+class AdaptiveRateLimiter:
+    """Thread-safe token bucket adapting its rate (AIMD) to the registry
+
+    The rate is halved when the registry throttles (429) and slowly
+    decreased when latency degrades; it grows back additively on fast
+    successful responses, up to `max_rate` requests per second.
+    """
+
+    def __init__(
+        self,
+        max_rate: float,
+        min_rate: float = 1.0,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = monotonic,
+        sleeper: Callable[[float], None] = sleep,
+    ) -> None:
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.rate = max_rate
+        self.burst = burst if burst is not None else max(1.0, max_rate)
+        self.latency: Optional[float] = None
+        self.latency_baseline: Optional[float] = None
+        self.__clock = clock
+        self.__sleep = sleeper
+        self.__tokens = self.burst
+        self.__updated = clock()
+        self.__blocked_until: float = 0.0
+        self.__lock = Lock()
+
+    def acquire(self) -> float:
+        """Wait for a token, returns the time spent waiting"""
+
+        with self.__lock:
+            now: float = self.__clock()
+            self.__tokens = min(
+                self.burst, self.__tokens + (now - self.__updated) * self.rate
+            )
+            self.__updated = now
+            self.__tokens -= 1
+            # Reserve the token now, wait outside of the lock
+            wait: float = max(
+                -self.__tokens / self.rate if self.__tokens < 0 else 0.0,
+                self.__blocked_until - now,
+            )
+        if wait > 0:
+            self.__sleep(wait)
+        return wait
+
+    def on_success(self, latency: float) -> None:
+        """Feedback: successful response received after `latency` seconds"""
+
+        with self.__lock:
+            self.latency = (
+                latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            )
+            if self.latency_baseline is None or self.latency < self.latency_baseline:
+                self.latency_baseline = self.latency
+            if self.latency > 2 * self.latency_baseline:
+                # Registry slowing down: back off gently
+                self.rate = max(self.min_rate, self.rate * 0.95)
+            else:
+                self.rate = min(self.max_rate, self.rate + 0.05 * self.max_rate)
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        """Feedback: registry answered 429 (Too Many Requests)
+
+        `Retry-After` blocks every worker, at most RETRY_AFTER_MAX seconds.
+        """
+
+        with self.__lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.__tokens = min(self.__tokens, 0.0)
+            if retry_after:
+                self.__blocked_until = max(
+                    self.__blocked_until,
+                    self.__clock() + min(retry_after, RETRY_AFTER_MAX),
+                )
+
+
+class RetryPolicy:  # pylint: disable=too-few-public-methods
+    """Retries with jittered ("full jitter") exponential backoff"""
+
+    def __init__(
+        self, max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def get_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before retry number `attempt` (0 based), `Retry-After` first
+
+        `Retry-After` is capped to `backoff_max` (e.g. an hour sent by a proxy).
+        """
+
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
@@ -0,0 +1,140 @@
+"""Retention Policy Engine"""
+
+from datetime import datetime, timedelta, timezone
+from heapq import heappush, heappushpop
+from re import compile as re_compile, Pattern
+from typing import Any, Iterator, Optional
+
+SEMVER_PATTERN: Pattern = re_compile(
+    r"^v?(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)"
+    r"(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?(?:\+[0-9A-Za-z.-]+)?$"
+)
+
+
+def parse_semver(tag: str) -> Optional[tuple]:
+    """Get a sortable semantic version key from a tag (None if not semver)"""
+
+    if (match := SEMVER_PATTERN.match(tag)) is None:
+        return None
+    major, minor, patch, prerelease = match.groups()
+    # A pre-release version has a lower precedence than the release itself
+    prerelease_key: tuple = (
+        (1,)
+        if prerelease is None
+        else (
+            0,
+            *(
+                (0, int(identifier), "") if identifier.isdigit() else (1, 0, identifier)
+                for identifier in prerelease.split(".")
+            ),
+        )
+    )
+    return (int(major), int(minor), int(patch), prerelease_key)
+
+
+class RetentionPolicy:  # pylint: disable=too-few-public-methods
+    """Retention Policy (keep-last-N, age-based and semver-aware rules)
+
+    A tag matching the tags filter is deleted only if it is neither one of
+    the `keep_last` newest tags, nor one of the `keep_semver` highest semantic
+    versions, and (when `older_than_days` is set) is older than that.
+    """
+
+    def __init__(
+        self,
+        keep_last: int = 0,
+        older_than_days: int = 0,
+        keep_semver: int = 0,
+    ) -> None:
+        self.keep_last = keep_last
+        self.older_than_days = older_than_days
+        self.keep_semver = keep_semver
+
+    @property
+    def is_enabled(self) -> bool:
+        """At least one retention rule configured"""
+
+        return bool(self.keep_last or self.older_than_days or self.keep_semver)
+
+    @property
+    def needs_created(self) -> bool:
+        """Image creation date (config blob) needed by the rules"""
+
+        return bool(self.keep_last or self.older_than_days)
+
+    def evaluator(self, now: Optional[datetime] = None) -> "RetentionEvaluator":
+        """Get a single pass evaluator for the tags of one Docker image"""
+
+        return RetentionEvaluator(policy=self, now=now)
+
+
+class RetentionEvaluator:
+    """Single pass, bounded memory evaluation of a RetentionPolicy
+
+    Tags are fed one by one; a tag is yielded as soon as it is evicted from
+    every "keep" ranking it takes part in (it can never be kept anymore).
+    Tags still ranked when `finish` is called are kept.
+    """
+
+    def __init__(self, policy: RetentionPolicy, now: Optional[datetime] = None):
+        self.policy = policy
+        self.older_than: Optional[datetime] = (
+            (now or datetime.now(tz=timezone.utc))
+            - timedelta(days=policy.older_than_days)
+            if policy.older_than_days
+            else None
+        )
+        self.__kept: list[Any] = []
+        self.__newest: list[tuple[datetime, str, Any]] = []
+        self.__highest: list[tuple[tuple, str, Any]] = []
+        self.__rankings: dict[str, int] = {}
+        self.__too_recent: set[str] = set()
+
+    def __evicted(self, tag: str, item: Any) -> Iterator[Any]:
+        self.__rankings[tag] -= 1
+        if self.__rankings[tag]:
+            return
+        del self.__rankings[tag]
+        if tag in self.__too_recent:
+            self.__too_recent.discard(tag)
+            self.__kept.append(item)
+        else:
+            yield item
+
+    def feed(
+        self, tag: str, item: Any, created: Optional[datetime] = None
+    ) -> Iterator[Any]:
+        """Feed a tag, yield items (tags) that can be deleted"""
+
+        if self.older_than is not None and (
+            created is None or created > self.older_than
+        ):
+            self.__too_recent.add(tag)
+
+        rankings: list[tuple[list, int, Any]] = []
+        if self.policy.keep_last:
+            oldest: datetime = datetime.min.replace(tzinfo=timezone.utc)
+            rankings.append((self.__newest, self.policy.keep_last, created or oldest))
+        if self.policy.keep_semver and (semver := parse_semver(tag=tag)) is not None:
+            rankings.append((self.__highest, self.policy.keep_semver, semver))
+
+        self.__rankings[tag] = len(rankings) + 1
+        for heap, size, key in rankings:
+            if len(heap) < size:
+                heappush(heap, (key, tag, item))
+                continue
+            _, evicted_tag, evicted_item = heappushpop(heap, (key, tag, item))
+            yield from self.__evicted(tag=evicted_tag, item=evicted_item)
+        yield from self.__evicted(tag=tag, item=item)
+
+    def finish(self) -> list[Any]:
+        """Get items (tags) kept by the policy"""
+
+        for heap in (self.__newest, self.__highest):
+            self.__kept.extend(item for _, tag, item in heap if tag in self.__rankings)
+            heap.clear()
+        kept: list[Any] = list(dict.fromkeys(self.__kept))
+        self.__kept.clear()
+        self.__rankings.clear()
+        self.__too_recent.clear()
+        return kept
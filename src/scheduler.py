@@ -0,0 +1,71 @@
+"""Fair Concurrency Budget Shared By Several Registries"""
+
+from contextlib import contextmanager
+from itertools import count
+from threading import Condition
+from typing import Iterator
+
+
+class FairScheduler:
+    """Global number of concurrent registry tasks, shared fairly
+
+    Every task runs in a slot. When a slot is free, it goes to the waiting
+    task whose registry holds the fewest slots (oldest task first): a slow
+    registry, whose tasks hold their slots longer, cannot starve the others,
+    and an idle registry leaves its share to the busy ones.
+    """
+
+    def __init__(self, budget: int) -> None:
+        self.budget = max(1, budget)
+        self.running: dict[str, int] = {}
+        self.__condition = Condition()
+        self.__tickets = count()
+        self.__waiting: dict[int, str] = {}
+        self.__in_use: int = 0
+
+    @property
+    def waiting(self) -> int:
+        """Number of tasks waiting for a slot"""
+
+        with self.__condition:
+            return len(self.__waiting)
+
+    def __is_next(self, ticket: int) -> bool:
+        if self.__in_use >= self.budget:
+            return False
+        return ticket == min(
+            self.__waiting,
+            key=lambda waiting: (self.running.get(self.__waiting[waiting], 0), waiting),
+        )
+
+    def acquire(self, key: str) -> None:
+        """Wait for a slot (key: registry name)"""
+
+        with self.__condition:
+            ticket: int = next(self.__tickets)
+            self.__waiting[ticket] = key
+            while not self.__is_next(ticket=ticket):
+                self.__condition.wait()
+            del self.__waiting[ticket]
+            self.running[key] = self.running.get(key, 0) + 1
+            self.__in_use += 1
+            # Another waiting task may be next (slots left)
+            self.__condition.notify_all()
+
+    def release(self, key: str) -> None:
+        """Free a slot"""
+
+        with self.__condition:
+            self.running[key] -= 1
+            self.__in_use -= 1
+            self.__condition.notify_all()
+
+    @contextmanager
+    def slot(self, key: str) -> Iterator[None]:
+        """Run a task in a slot"""
+
+        self.acquire(key=key)
+        try:
+            yield
+        finally:
+            self.release(key=key)
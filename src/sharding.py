@@ -0,0 +1,88 @@
+"""Sharded And Resumable Cleanup Runs"""
+
+from hashlib import blake2b
+from json import JSONDecodeError, dumps, loads
+from os import getpid, remove, replace
+from typing import Any, Iterable, Iterator, Optional
+from logger import logger
+
+
+def get_shard(name: str, count: int) -> int:
+    """Get the shard (0 to count - 1) of a Docker image (stable hash)"""
+
+    digest: bytes = blake2b(name.encode(encoding="utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, byteorder="big") % count
+
+
+def filter_shard(images: Iterable[str], index: int, count: int) -> Iterator[str]:
+    """Keep the Docker images of one shard"""
+
+    if not 0 <= index < count:
+        raise ValueError(f"Invalid shard {index=} ({count=})")
+    if count == 1:
+        return iter(images)
+    return (image for image in images if get_shard(name=image, count=count) == index)
+
+
+class Checkpoint:
+    """Last completed Docker image of an interrupted run (catalog order)
+
+    Images are processed concurrently and complete out of order: the
+    checkpoint only moves forward once every image started before it is
+    done, so that resuming after it (catalog `last` parameter) skips
+    completed images only. `key` identifies the run settings (shard and
+    filters); a checkpoint written with other settings is ignored.
+    """
+
+    def __init__(self, path: str, key: str) -> None:
+        self.path = path
+        self.key = key
+        self.last: Optional[str] = None
+        self.__started: dict[str, bool] = {}
+        try:
+            with open(path, encoding="utf-8") as file:
+                data: dict[str, Any] = loads(file.read())
+        except FileNotFoundError:
+            return
+        except (OSError, JSONDecodeError) as exception:
+            logger.warning(msg=f"❌ Cannot read checkpoint '{path}': {exception}")
+            return
+        if data.get("key") != key:
+            logger.warning(
+                msg=f"⚠️ Checkpoint '{path}' ignored (other shard or filters)"
+            )
+            return
+        self.last = data.get("last")
+
+    def start(self, image: str) -> None:
+        """Docker image processing started"""
+
+        self.__started[image] = False
+
+    def done(self, image: str) -> None:
+        """Docker image processing completed (checkpoint saved if it moved)"""
+
+        self.__started[image] = True
+        last: Optional[str] = None
+        while self.__started and next(iter(self.__started.values())):
+            last = next(iter(self.__started))
+            del self.__started[last]
+        if last is not None:
+            self.last = last
+            self.__save()
+
+    def __save(self) -> None:
+        temporary_path: str = f"{self.path}.{getpid()}.tmp"
+        with open(temporary_path, mode="w", encoding="utf-8") as file:
+            file.write(dumps(obj={"key": self.key, "last": self.last}))
+        replace(temporary_path, self.path)
+
+    def clear(self) -> None:
+        """Run completed: the next run starts from the beginning"""
+
+        self.last = None
+        self.__started.clear()
+        try:
+            remove(self.path)
+        except FileNotFoundError:
+            pass
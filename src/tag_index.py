@@ -0,0 +1,161 @@
+"""Persistent Docker Image Tag Index (SQLite)"""
+
+from hashlib import sha256
+from sqlite3 import Connection, connect
+from time import time
+from typing import Iterator, Optional
+from matcher import Matcher, get_matcher
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS images (
+    image TEXT PRIMARY KEY,
+    tags_hash TEXT NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tags (
+    image TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (image, tag)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_digest ON tags (image, digest);
+"""
+
+
+def get_tags_hash(tags: list[str]) -> str:
+    """Get a stable hash of a tags list (order independent)"""
+
+    return sha256("\n".join(sorted(tags)).encode(encoding="utf-8")).hexdigest()
+
+
+class TagIndex:
+    """Local image -> tag -> digest index used for incremental cleanup runs
+
+    Digests older than `digest_ttl` seconds are considered unknown so that
+    re-pushed (mutable) tags get resolved again from the registry.
+    """
+
+    connection: Connection
+
+    def __init__(self, path: str, digest_ttl: int = 604800) -> None:
+        self.path = path
+        self.digest_ttl = digest_ttl
+        self.connection = connect(database=path)
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> "TagIndex":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Commit pending changes and close the index"""
+
+        self.connection.commit()
+        self.connection.close()
+
+    def get_digest(self, image: str, tag: str) -> Optional[str]:
+        """Get known (not expired) digest of a Docker image tag"""
+
+        row: Optional[tuple[str]] = self.connection.execute(
+            "SELECT digest FROM tags WHERE image = ? AND tag = ? AND last_seen >= ?",
+            (image, tag, time() - self.digest_ttl),
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_digest(self, image: str, tag: str, digest: str) -> None:
+        """Record digest of a Docker image tag"""
+
+        self.connection.execute(
+            "INSERT OR REPLACE INTO tags (image, tag, digest, last_seen) "
+            "VALUES (?, ?, ?, ?)",
+            (image, tag, digest, time()),
+        )
+
+    def is_tags_changed(self, image: str, tags: list[str]) -> bool:
+        """Check if tags list of a Docker image changed since the last run"""
+
+        row: Optional[tuple[str]] = self.connection.execute(
+            "SELECT tags_hash FROM images WHERE image = ?", (image,)
+        ).fetchone()
+        return row is None or row[0] != get_tags_hash(tags=tags)
+
+    def update_tags(self, image: str, tags: list[str]) -> None:
+        """Record the current tags list of a Docker image (stale tags removed)"""
+
+        self.connection.execute(
+            "INSERT OR REPLACE INTO images (image, tags_hash, last_seen) "
+            "VALUES (?, ?, ?)",
+            (image, get_tags_hash(tags=tags), time()),
+        )
+        known: set[str] = {
+            tag
+            for (tag,) in self.connection.execute(
+                "SELECT tag FROM tags WHERE image = ?", (image,)
+            )
+        }
+        self.connection.executemany(
+            "DELETE FROM tags WHERE image = ? AND tag = ?",
+            ((image, tag) for tag in known.difference(tags)),
+        )
+        self.connection.commit()
+
+    def delete_tags(self, image: str, tags: list[str]) -> None:
+        """Forget deleted Docker image tags"""
+
+        self.connection.executemany(
+            "DELETE FROM tags WHERE image = ? AND tag = ?",
+            ((image, tag) for tag in tags),
+        )
+        # Tags list changed: force a refresh of the image on the next run
+        self.connection.execute("DELETE FROM images WHERE image = ?", (image,))
+        self.connection.commit()
+
+    def get_images(self, pattern: str | Matcher = r".*") -> Iterator[str]:
+        """Get known Docker images"""
+
+        matcher: Matcher = get_matcher(pattern=pattern)
+        for (image,) in self.connection.execute("SELECT image FROM images ORDER BY 1"):
+            if matcher(image):
+                yield image
+
+    def get_counts(self, pattern: str | Matcher = r".*") -> dict[str, int]:
+        """Get the number of known Docker images, tags and digests"""
+
+        counts: dict[str, int] = {"images": 0, "tags": 0, "digests": 0}
+        for image in list(self.get_images(pattern=pattern)):
+            tags, digests = self.connection.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT digest) FROM tags WHERE image = ?",
+                (image,),
+            ).fetchone()
+            counts["images"] += 1
+            counts["tags"] += tags
+            counts["digests"] += digests
+        return counts
+
+    def get_deletion_candidates(
+        self,
+        images_pattern: str | Matcher = r".*",
+        tags_pattern: str | Matcher = r".*",
+    ) -> Iterator[tuple[str, str, list[str]]]:
+        """Get (image, digest, tags) that would be deleted (no network calls)
+
+        Digests still referenced by a tag outside of the filter are skipped.
+        """
+
+        tags_matcher: Matcher = get_matcher(pattern=tags_pattern)
+        for image in list(self.get_images(pattern=images_pattern)):
+            candidates: dict[str, list[str]] = {}
+            retained: set[str] = set()
+            for tag, digest in self.connection.execute(
+                "SELECT tag, digest FROM tags WHERE image = ? ORDER BY tag", (image,)
+            ):
+                if tags_matcher(tag):
+                    candidates.setdefault(digest, []).append(tag)
+                else:
+                    retained.add(digest)
+            for digest, tags in candidates.items():
+                if digest not in retained:
+                    yield image, digest, tags
@@ -0,0 +1,90 @@
+"""Persistent Tags List Cache (SQLite, Conditional Requests)"""
+
+from sqlite3 import Connection, connect
+from threading import Lock
+from typing import NamedTuple, Optional
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS tags_pages (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    tags TEXT NOT NULL,
+    next_url TEXT
+) WITHOUT ROWID;
+"""
+
+
+class CachedTagsPage(NamedTuple):
+    """One tags list page, its validators and the next page URL"""
+
+    etag: Optional[str]
+    last_modified: Optional[str]
+    tags: list[str]
+    next_url: Optional[str]
+
+
+class TagsListCache:
+    """Tags list pages keyed by URL, revalidated with conditional requests
+
+    Pages are stored with their `ETag`/`Last-Modified` validators: a `304 Not
+    Modified` answer reuses the stored tags (no body downloaded or parsed).
+    Tags are stored one per line (tag names cannot contain line feeds). Shared
+    by the worker threads; changes are committed when the cache is closed.
+    """
+
+    connection: Connection
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.__lock = Lock()
+        self.connection = connect(database=path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> "TagsListCache":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Commit pending changes and close the cache"""
+
+        with self.__lock:
+            self.connection.commit()
+            self.connection.close()
+
+    def get(self, url: str) -> Optional[CachedTagsPage]:
+        """Get a cached tags list page"""
+
+        with self.__lock:
+            row: Optional[tuple[Optional[str], ...]] = self.connection.execute(
+                "SELECT etag, last_modified, tags, next_url FROM tags_pages "
+                "WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, tags, next_url = row
+        return CachedTagsPage(
+            etag=etag,
+            last_modified=last_modified,
+            tags=tags.split("\n") if tags else [],
+            next_url=next_url,
+        )
+
+    def set(self, url: str, page: CachedTagsPage) -> None:
+        """Record a tags list page"""
+
+        with self.__lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO tags_pages "
+                "(url, etag, last_modified, tags, next_url) VALUES (?, ?, ?, ?, ?)",
+                (
+                    url,
+                    page.etag,
+                    page.last_modified,
+                    "\n".join(page.tags),
+                    page.next_url,
+                ),
+            )
@@ -1,5 +1,10 @@
 """Utils"""
 
+from datetime import datetime, timezone
+from re import search
+from typing import Optional
+from urllib.parse import urlparse, ParseResult
+
 
 def str2bool(string: str) -> bool:
     """Convert String to Boolean"""
@@ -29,3 +34,53 @@ def get_percentage(nbr_a: int, nbr_b: int) -> float:
         return nbr_a / nbr_b
     except ZeroDivisionError:
         return 0
+
+
+def get_human_size(size: float) -> str:
+    """Get Human Readable Size (binary units)"""
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if abs(size) < 1024 or unit == "TiB":
+            break
+        size /= 1024
+    return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+
+
+def get_next_link(link_header: Optional[str]) -> Optional[str]:
+    """Get 'next' page URL (path and query) from a Link header"""
+
+    if not link_header:
+        return None
+    for link in link_header.split(","):
+        url, _, params = link.partition(";")
+        if search(pattern=r"rel=\"?next\"?", string=params):
+            parse_result: ParseResult = urlparse(url=url.strip().strip("<>"))
+            query: str = f"?{parse_result.query}" if parse_result.query else ""
+            return f"{parse_result.path}{query}"
+    return None
+
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse RFC 3339 date (e.g. image config 'created') as an aware datetime"""
+
+    if not value:
+        return None
+    parsed: datetime = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse 'Retry-After' header (seconds or HTTP date) as a delay in seconds"""
+
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    # HTTP dates are rare: email.utils is only imported when needed (startup)
+    # pylint: disable-next=import-outside-toplevel
+    from email.utils import parsedate_to_datetime
+
+    try:
+        date: datetime = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (date - datetime.now(tz=timezone.utc)).total_seconds())
@@ -0,0 +1,208 @@
+"""Asynchronous Docker Client Tests"""
+
+from asyncio import StreamReader, StreamWriter, open_connection, start_server
+from json import dumps
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+from hashlib import sha256
+from async_docker_registry_client import AsyncDockerRegistryClient
+from docker_registry_client import REDIRECTS_MAX
+
+docker_image_tag_fake_digest: str = sha256(b"Pouet").hexdigest()
+
+
+async def open_plain_connection(host: str, port: int, **_):
+    """Open a plain TCP connection instead of a TLS one"""
+
+    return await open_connection(host=host, port=port)
+
+
+class FakeRegistryServer:
+    """Plain HTTP/1.1 fake Docker registry (keep-alive aware)"""
+
+    def __init__(
+        self,
+        close_after_response: bool = False,
+        redirects: dict[str, tuple[int, str]] | None = None,
+    ) -> None:
+        self.close_after_response = close_after_response
+        self.redirects = redirects if redirects else {}
+        self.connections: int = 0
+        self.urls: list[str] = []
+        self.hosts: list[str] = []
+        self.port: int = 0
+        self.server = None
+
+    async def __aenter__(self) -> "FakeRegistryServer":
+        self.server = await start_server(self.handle, host="127.0.0.1", port=0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    def route(self, method: str, url: str) -> tuple[int, dict[str, str], bytes]:
+        """Fake Registry Routes"""
+
+        self.urls.append(url)
+        if url in self.redirects:
+            status, location = self.redirects[url]
+            return status, {"Location": location}, b""
+        if url.startswith("/v2/_catalog"):
+            body = {"repositories": ["fake-alpine", "fake-ubuntu", "fake-python"]}
+            return 200, {}, dumps(obj=body).encode()
+        if url.endswith("/tags/list"):
+            body = {"name": "fake-alpine", "tags": ["a", "b", "c"]}
+            return 200, {}, dumps(obj=body).encode()
+        if "/manifests/" in url and method == "HEAD":
+            if "fake-missing" in url:
+                return 404, {}, b""
+            return 200, {"Docker-Content-Digest": docker_image_tag_fake_digest}, b""
+        if "/manifests/" in url and method == "DELETE":
+            return 202, {}, b""
+        return 404, {}, b""
+
+    async def handle(self, reader: StreamReader, writer: StreamWriter) -> None:
+        """Handle one client connection"""
+
+        self.connections += 1
+        while request_line := await reader.readline():
+            method, url, _ = request_line.decode().split(" ")
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode().partition(":")
+                if name.lower() == "host":
+                    self.hosts.append(value.strip())
+            status, headers, body = self.route(method=method, url=url)
+            headers["Content-Length"] = str(len(body))
+            writer.write(
+                (
+                    f"HTTP/1.1 {status} Fake\r\n"
+                    + "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+                    + "\r\n"
+                ).encode()
+                + (body if method != "HEAD" else b"")
+            )
+            await writer.drain()
+            if self.close_after_response:
+                break
+        writer.close()
+
+
+@patch(target="async_docker_registry_client.open_connection", new=open_plain_connection)
+class AsyncDockerRegistryClientTests(IsolatedAsyncioTestCase):
+    """Asynchronous Docker Client Tests Class"""
+
+    async def test_api(self):
+        """Async Docker Client API Test (keep-alive connection reuse)"""
+
+        async with FakeRegistryServer() as server:
+            async with AsyncDockerRegistryClient(
+                registry_url=f"https://127.0.0.1:{server.port}", limit_per_host=1
+            ) as client:
+                self.assertEqual(
+                    first=[image async for image in client.get_images(pattern="ne")],
+                    second=["fake-alpine"],
+                )
+                self.assertEqual(
+                    first=[
+                        str(tag)
+                        async for tag in client.get_image_tags(image="fake-alpine")
+                    ],
+                    second=["fake-alpine:a", "fake-alpine:b", "fake-alpine:c"],
+                )
+                self.assertEqual(
+                    first=await client.get_image_tag_digest(image_tag="fake-alpine:a"),
+                    second=docker_image_tag_fake_digest,
+                )
+                self.assertIsNone(
+                    obj=await client.get_image_tag_digest(image_tag="fake-missing:a")
+                )
+                self.assertTrue(
+                    expr=await client.delete_image(image="fake-alpine", digest="x")
+                )
+                self.assertEqual(first=client.connection_pool.opened, second=1)
+            self.assertEqual(first=server.connections, second=1)
+
+    async def test_half_closed_connection(self):
+        """Async Docker Client Recovers From Half-Closed Keep-Alive Connections"""
+
+        async with FakeRegistryServer(close_after_response=True) as server:
+            async with AsyncDockerRegistryClient(
+                registry_url=f"https://127.0.0.1:{server.port}"
+            ) as client:
+                for _ in range(3):
+                    self.assertEqual(
+                        first=await client.get_image_tag_digest(
+                            image_tag="fake-alpine:a"
+                        ),
+                        second=docker_image_tag_fake_digest,
+                    )
+            self.assertEqual(first=server.connections, second=3)
+
+    async def test_redirect(self):
+        """Async Docker Client Follows Redirects To Other Hosts (Bounded)"""
+
+        async with FakeRegistryServer() as mirror:
+            async with FakeRegistryServer(
+                redirects={
+                    "/v2/_catalog?n=500": (
+                        307,
+                        f"https://127.0.0.1:{mirror.port}/v2/_catalog?n=500",
+                    ),
+                    "/v2/loop/manifests/x": (307, "/v2/loop/manifests/x"),
+                }
+            ) as server:
+                async with AsyncDockerRegistryClient(
+                    registry_url=f"https://127.0.0.1:{server.port}"
+                ) as client:
+                    self.assertEqual(
+                        first=[image async for image in client.get_images()],
+                        second=["fake-alpine", "fake-ubuntu", "fake-python"],
+                    )
+                    self.assertFalse(
+                        expr=await client.delete_image(image="loop", digest="x")
+                    )
+            self.assertEqual(first=mirror.urls, second=["/v2/_catalog?n=500"])
+            self.assertEqual(
+                first=server.urls,
+                second=["/v2/_catalog?n=500"]
+                + ["/v2/loop/manifests/x"] * (REDIRECTS_MAX + 1),
+            )
+
+    async def test_host_header(self):
+        """Async Docker Client Host Header (Default HTTPS Port Omitted)"""
+
+        async with FakeRegistryServer() as mirror:
+
+            async def open_mirror_connection(host: str, port: int, **_):
+                return await open_plain_connection(
+                    host=host, port=mirror.port if port == 443 else port
+                )
+
+            async with FakeRegistryServer(
+                redirects={
+                    "/v2/_catalog?n=500": (307, "https://localhost/v2/_catalog?n=500")
+                }
+            ) as server:
+                with patch(
+                    target="async_docker_registry_client.open_connection",
+                    new=open_mirror_connection,
+                ):
+                    async with AsyncDockerRegistryClient(
+                        registry_url=f"https://127.0.0.1:{server.port}"
+                    ) as client:
+                        self.assertEqual(
+                            first=len([image async for image in client.get_images()]),
+                            second=3,
+                        )
+            self.assertEqual(first=server.hosts, second=[f"127.0.0.1:{server.port}"])
+            self.assertEqual(first=mirror.hosts, second=["localhost"])
+
+    def test_init(self):
+        """Async Docker Client Initialization Test"""
+
+        with self.assertRaises(expected_exception=ValueError):
+            AsyncDockerRegistryClient(
+                registry_url="http://insecure.registry.example.com:8080"
+            )
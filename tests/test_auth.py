@@ -0,0 +1,214 @@
+"""Token Authentication Tests"""
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from json import dumps
+from os import path
+from ssl import PROTOCOL_TLS_SERVER, SSLContext, create_default_context
+from subprocess import run
+from tempfile import TemporaryDirectory
+from threading import Thread
+from unittest import TestCase
+from urllib.parse import parse_qs, urlparse
+from auth import TokenAuthenticator, get_url_scope, parse_www_authenticate, widen_scope
+from logger import logger
+
+
+class FakeTokenHandler(BaseHTTPRequestHandler):
+    """FakeTokenHandler Class (stub token server)"""
+
+    requests: list[tuple[dict[str, list[str]], str]] = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """FakeTokenHandler GET Method"""
+
+        query: dict[str, list[str]] = parse_qs(urlparse(self.path).query)
+        self.requests.append((query, self.headers.get("Authorization", "")))
+        body: bytes = dumps(
+            obj={"token": f"token-{len(self.requests)}", "expires_in": 300}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_):  # pylint: disable=arguments-differ
+        """FakeTokenHandler Quiet Logs"""
+
+
+class FakeClock:  # pylint: disable=too-few-public-methods
+    """FakeClock Class"""
+
+    def __init__(self) -> None:
+        self.now: float = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TokenAuthenticatorTests(TestCase):
+    """Token Authenticator Tests Class"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = TemporaryDirectory()  # pylint: disable=consider-using-with
+        cert_file: str = path.join(cls.directory.name, "token.crt")
+        key_file: str = path.join(cls.directory.name, "token.key")
+        run(
+            args=[
+                *"openssl req -x509 -newkey rsa:2048 -nodes -days 1".split(),
+                *("-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1"),
+                *("-keyout", key_file, "-out", cert_file),
+            ],
+            check=True,
+            capture_output=True,
+        )
+        server_context = SSLContext(PROTOCOL_TLS_SERVER)
+        server_context.load_cert_chain(certfile=cert_file, keyfile=key_file)
+        cls.ssl_context = create_default_context(cafile=cert_file)
+        cls.server = HTTPServer(("127.0.0.1", 0), FakeTokenHandler)
+        cls.server.socket = server_context.wrap_socket(
+            cls.server.socket, server_side=True
+        )
+        cls.thread = Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.realm = f"https://127.0.0.1:{cls.server.server_port}/token"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.directory.cleanup()
+
+    def setUp(self):
+        FakeTokenHandler.requests.clear()
+        self.clock = FakeClock()
+        self.authenticator = TokenAuthenticator(
+            username="user",
+            password="secret",
+            ssl_context=self.ssl_context,
+            clock=self.clock,
+        )
+
+    def challenge(self, scope: str) -> str:
+        """Get a Bearer challenge for a scope"""
+
+        return f'Bearer realm="{self.realm}",service="registry",scope="{scope}"'
+
+    def test_parse_www_authenticate(self):
+        """Parse WWW-Authenticate Header"""
+
+        self.assertEqual(
+            first=parse_www_authenticate(
+                value='Bearer realm="https://auth/token",service="reg",scope="a:b:c,d"'
+            ),
+            second=(
+                "bearer",
+                {"realm": "https://auth/token", "service": "reg", "scope": "a:b:c,d"},
+            ),
+        )
+        self.assertEqual(
+            first=parse_www_authenticate(value='Basic realm="Registry"'),
+            second=("basic", {"realm": "Registry"}),
+        )
+
+    def test_scopes(self):
+        """URL Scopes And Widened Challenge Scopes"""
+
+        self.assertEqual(
+            first=get_url_scope(url="/v2/_catalog?n=10"), second="registry:catalog:*"
+        )
+        self.assertEqual(
+            first=get_url_scope(url="/path/v2/team/app/manifests/latest"),
+            second="repository:team/app:pull,delete",
+        )
+        self.assertIsNone(obj=get_url_scope(url="/v2/"))
+        self.assertEqual(
+            first=widen_scope(scope="repository:team/app:pull"),
+            second="repository:team/app:pull,delete",
+        )
+        self.assertEqual(
+            first=widen_scope(scope="registry:catalog:*"), second="registry:catalog:*"
+        )
+
+    def test_token_cache(self):
+        """One Token Request Per Repository Scope"""
+
+        url: str = "/v2/app/tags/list"
+        self.assertIsNone(obj=self.authenticator.get_authorization(url=url))
+        self.assertTrue(
+            expr=self.authenticator.on_challenge(
+                url=url, www_authenticate=self.challenge(scope="repository:app:pull")
+            )
+        )
+        for reference in ("v1", "v2", "latest"):
+            self.assertEqual(
+                first=self.authenticator.get_authorization(
+                    url=f"/v2/app/manifests/{reference}"
+                ),
+                second="Bearer token-1",
+            )
+        self.assertEqual(first=self.authenticator.fetched, second=1)
+        query, authorization = FakeTokenHandler.requests[0]
+        self.assertEqual(first=query["scope"], second=["repository:app:pull,delete"])
+        self.assertEqual(first=query["service"], second=["registry"])
+        self.assertTrue(expr=authorization.startswith("Basic "))
+
+        # Known realm: another repository gets its token without a challenge
+        self.assertEqual(
+            first=self.authenticator.get_authorization(url="/v2/other/tags/list"),
+            second="Bearer token-2",
+        )
+        self.assertEqual(first=self.authenticator.fetched, second=2)
+
+    def test_token_refresh(self):
+        """Token Refreshed Before It Expires"""
+
+        url: str = "/v2/app/tags/list"
+        self.authenticator.on_challenge(
+            url=url, www_authenticate=self.challenge(scope="repository:app:pull")
+        )
+        self.clock.now += 280
+        self.assertEqual(
+            first=self.authenticator.get_authorization(url=url),
+            second="Bearer token-1",
+        )
+        self.clock.now += 15
+        self.assertEqual(
+            first=self.authenticator.get_authorization(url=url),
+            second="Bearer token-2",
+        )
+
+    def test_basic_challenge(self):
+        """Basic Challenge Uses Credentials"""
+
+        url: str = "/v2/_catalog"
+        self.assertTrue(
+            expr=self.authenticator.on_challenge(
+                url=url, www_authenticate='Basic realm="Registry"'
+            )
+        )
+        self.assertEqual(
+            first=self.authenticator.get_authorization(url=url),
+            second="Basic dXNlcjpzZWNyZXQ=",
+        )
+        self.assertFalse(
+            expr=TokenAuthenticator().on_challenge(
+                url=url, www_authenticate='Basic realm="Registry"'
+            )
+        )
+
+    def test_http_realm(self):
+        """Plain HTTP Token Realm Refused (Credentials Never Sent)"""
+
+        url: str = "/v2/app/tags/list"
+        realm: str = self.realm.replace("https://", "http://", 1)
+        with self.assertLogs(logger=logger, level="WARNING"):
+            self.assertFalse(
+                expr=self.authenticator.on_challenge(
+                    url=url,
+                    www_authenticate=f'Bearer realm="{realm}",service="registry"',
+                )
+            )
+        self.assertIsNone(obj=self.authenticator.get_authorization(url=url))
+        self.assertEqual(first=FakeTokenHandler.requests, second=[])
@@ -0,0 +1,85 @@
+"""Config Tests"""
+
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from config import Config, load_registries
+
+
+class ConfigTests(TestCase):
+    """Config Tests Class"""
+
+    def test_from_env(self):
+        """Config Parsed From Environment Variables (Typed, Defaults)"""
+
+        self.assertEqual(first=Config.from_env(environ={}), second=Config())
+        config = Config.from_env(
+            environ={
+                "DOCKER_REGISTRY_URL": "https://registry.example.com",
+                "HTTP_CONNECTION_TIMEOUT": "10",
+                "DRY_RUN": "no",
+                "RATE_LIMIT": "2.5",
+                "STATE_FILE": "/tmp/state.db",
+            }
+        )
+        self.assertEqual(
+            first=config.docker_registry_url, second="https://registry.example.com"
+        )
+        self.assertEqual(first=config.https_connection_timeout, second=10)
+        self.assertFalse(expr=config.dry_run)
+        self.assertEqual(first=config.rate_limit, second=2.5)
+        self.assertEqual(first=config.state_file, second="/tmp/state.db")
+        self.assertIsNone(obj=config.metrics_file)
+
+    def test_load_registries(self):
+        """Config Registries Loaded From TOML (Defaults, Types, Files)"""
+
+        with TemporaryDirectory() as directory:
+            config_path: str = path.join(directory, "registries.toml")
+
+            def load(content: str) -> tuple[int, dict[str, Config]]:
+                with open(config_path, mode="w", encoding="utf-8") as file:
+                    file.write(content)
+                return load_registries(
+                    path=config_path, base=Config(retry_max=5, rate_limit=1.0)
+                )
+
+            budget, registries = load("""
+[defaults]
+docker_tags_filter = "^old-"
+cleaner_concurrency = 2
+
+[registries.prod]
+docker_registry_url = "https://prod.example.com"
+rate_limit = 10
+state_file = "prod.db"
+
+[registries.dev]
+docker_registry_url = "https://dev.example.com"
+cleaner_concurrency = 4
+dry_run = false
+""")
+            self.assertEqual(first=budget, second=6)
+            self.assertEqual(first=list(registries), second=["prod", "dev"])
+            self.assertEqual(first=registries["prod"].rate_limit, second=10.0)
+            self.assertEqual(
+                first=registries["prod"].docker_tags_filter, second="^old-"
+            )
+            self.assertEqual(first=registries["prod"].retry_max, second=5)
+            self.assertEqual(first=registries["dev"].cleaner_concurrency, second=4)
+            self.assertFalse(expr=registries["dev"].dry_run)
+            self.assertIsNone(obj=registries["dev"].state_file)
+
+            budget, _ = load("concurrency = 3\n[registries.a]\n[registries.b]\n")
+            self.assertEqual(first=budget, second=3)
+            for content in (
+                "[registries.a]\ncleaner_concurrency = true\n",
+                "[registries.a]\ndry_run = 1\n",
+                "[registries.a]\nunknown = 1\n",
+                "[registry.a]\n",
+                "concurrency = 0\n[registries.a]\n",
+                "",
+                '[defaults]\nstate_file = "x.db"\n[registries.a]\n[registries.b]\n',
+            ):
+                with self.assertRaises(expected_exception=ValueError):
+                    load(content)
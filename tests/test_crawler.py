@@ -0,0 +1,43 @@
+"""Crawler Tests"""
+
+from threading import get_ident
+from typing import Iterator, Optional
+from unittest import TestCase
+from crawler import crawl_tags
+from image_tag import ImageTag
+
+
+class FakeDockerRegistryClient:
+    """FakeDockerRegistryClient Class"""
+
+    threads: set[int] = set()
+
+    def get_image_tags(
+        self, image: str, number_max: Optional[int] = None
+    ) -> Iterator[ImageTag]:
+        """FakeDockerRegistryClient Get Image Tags Method"""
+
+        self.threads.add(get_ident())
+        for number in range(int(image.rpartition("-")[2]) % 3):
+            yield ImageTag(image=image, tag=str(number))
+
+
+class CrawlerTests(TestCase):
+    """Crawler Tests Class"""
+
+    def test_crawl_tags(self):
+        """Tags Lists Crawled Concurrently, Yielded In Catalog Order"""
+
+        images: list[str] = [f"image-{number}" for number in range(20)]
+        crawled: list[tuple[str, list[str]]] = list(
+            crawl_tags(
+                client_factory=FakeDockerRegistryClient,
+                images=iter(images),
+                concurrency=4,
+            )
+        )
+
+        self.assertEqual(first=[image for image, _ in crawled], second=images)
+        self.assertEqual(first=crawled[2], second=("image-2", ["0", "1"]))
+        self.assertEqual(first=crawled[3], second=("image-3", []))
+        self.assertLessEqual(a=len(FakeDockerRegistryClient.threads), b=4)
@@ -1,16 +1,35 @@
 """Docker Client Tests"""
 
+# pylint: disable=too-many-lines
+
+from io import BytesIO
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
 from typing import Any, Optional
 from json import dumps
-from http.client import HTTPException
+from http.client import HTTPConnection, HTTPException
 from hashlib import sha256
-from docker_registry_client import DockerRegistryClient
+from datetime import datetime, timezone
+from docker_registry_client import (
+    DockerRegistryClient,
+    MANIFEST_MEDIA_TYPES,
+    get_redirect_url,
+)
+from metrics import Metrics
+from rate_limiter import RetryPolicy
+from tags_cache import TagsListCache
 
 docker_image_tag_fake_digest: str = sha256(b"Pouet").hexdigest()
 
 
+def set_body(response: MagicMock, body: str | bytes) -> None:
+    """Back the read methods of a fake response with a body"""
+
+    stream: BytesIO = BytesIO(body.encode() if isinstance(body, str) else body)
+    response.read.side_effect = stream.read
+    response.readinto.side_effect = stream.readinto
+
+
 class FakeHTTPSConnection:
     """FakeHTTPSConnection Class"""
 
@@ -36,6 +55,8 @@ class FakeHTTPResponse:  # pylint: disable=too-few-public-methods
         self.status = status
         self.url = url
         self.headers = headers
+        self.reason = "Error"
+        self.body: Optional[BytesIO] = None
 
         if status == 200:
             self.reason = "OK"
@@ -52,9 +73,27 @@ class FakeHTTPResponse:  # pylint: disable=too-few-public-methods
     def __to_json(self, obj: Any) -> str:
         return dumps(obj=obj)
 
-    def read(self) -> str:
+    def read(self, amt: Optional[int] = None) -> bytes:
         """FakeHTTPResponse Read Method"""
 
+        if self.body is None:
+            self.body = BytesIO(self.__get_body().encode())
+        return self.body.read(amt)
+
+    def isclosed(self) -> bool:
+        """FakeHTTPResponse Isclosed Method (body read)"""
+
+        return self.body is not None and self.body.tell() == len(self.body.getbuffer())
+
+    def readinto(self, buffer: bytearray) -> int:
+        """FakeHTTPResponse Readinto Method"""
+
+        if self.body is None:
+            self.body = BytesIO(self.__get_body().encode())
+        return self.body.readinto(buffer)
+
+    def __get_body(self) -> str:
+
         # Get Docker images
         if "/v2/_catalog" in self.url:
             return self.__to_json(
@@ -78,6 +117,253 @@ class FakeHTTPResponse:  # pylint: disable=too-few-public-methods
         return self.headers.get(name)
 
 
+class FakePaginatedHTTPSConnection(FakeHTTPSConnection):
+    """FakePaginatedHTTPSConnection Class (Link header pagination)"""
+
+    pages: dict[str, tuple[list[str], Optional[str]]] = {
+        "/v2/_catalog?n=2": (
+            ["fake-alpine", "fake-ubuntu"],
+            "/v2/_catalog?last=b&n=2",
+        ),
+        "/v2/_catalog?last=b&n=2": (["fake-python"], None),
+        "/v2/fake-alpine/tags/list?n=2": (
+            ["a", "b"],
+            "/v2/fake-alpine/tags/list?n=2&last=b",
+        ),
+        "/v2/fake-alpine/tags/list?n=2&last=b": (["c"], None),
+    }
+
+    def getresponse(self):
+        """FakePaginatedHTTPSConnection getresponse Method"""
+
+        items, next_url = self.pages[self.url]
+        headers: dict[str, str] = {}
+        if next_url:
+            headers["link"] = f'<https://fake.example.com{next_url}>; rel="next"'
+        response: MagicMock = MagicMock(status=200)
+        response.getheader = lambda name: headers.get(name, None)
+        key: str = "tags" if "/tags/list" in self.url else "repositories"
+        set_body(response=response, body=dumps(obj={key: items}))
+        return response
+
+
+class FakeRecordingHTTPSConnection(FakeHTTPSConnection):
+    """FakeRecordingHTTPSConnection Class (records request headers)"""
+
+    def __init__(self, status: int = 200, headers: dict[str, str] | None = None):
+        super().__init__(status=status, headers=headers)
+        self.requests: list[dict[str, str]] = []
+
+    def request(self, url: str, **kwargs):
+        """FakeRecordingHTTPSConnection Request Method"""
+
+        super().request(url=url)
+        self.requests.append(kwargs.get("headers", {}))
+
+
+class FakeRoutedHTTPSConnection(FakeRecordingHTTPSConnection):
+    """FakeRoutedHTTPSConnection Class (JSON body per URL)"""
+
+    def __init__(self, routes: dict[str, Any]):
+        super().__init__()
+        self.routes = routes
+
+    def getresponse(self):
+        """FakeRoutedHTTPSConnection getresponse Method"""
+
+        response: MagicMock = MagicMock(status=200 if self.url in self.routes else 404)
+        response.getheader.return_value = None
+        set_body(response=response, body=dumps(obj=self.routes.get(self.url, {})))
+        return response
+
+
+class FakeFlakyHTTPSConnection(FakeRecordingHTTPSConnection):
+    """FakeFlakyHTTPSConnection Class (fails before answering)"""
+
+    def __init__(self, failures: list[int | Exception], **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+
+    def getresponse(self):
+        """FakeFlakyHTTPSConnection getresponse Method"""
+
+        if self.failures:
+            failure: int | Exception = self.failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return FakeHTTPResponse(
+                url=self.url, status=failure, headers={"retry-after": "0"}
+            )
+        return super().getresponse()
+
+    def close(self):
+        """FakeFlakyHTTPSConnection close Method"""
+
+
+class FakeScriptedHTTPSConnection(FakeRecordingHTTPSConnection):
+    """FakeScriptedHTTPSConnection Class (status, headers and body per URL)"""
+
+    def __init__(
+        self, host: str, routes: dict[str, tuple[int, dict[str, str], Any]], **_
+    ):
+        super().__init__()
+        self.host = host
+        self.routes = routes
+        self.urls: list[str] = []
+
+    def request(self, url: str, **kwargs):
+        """FakeScriptedHTTPSConnection Request Method"""
+
+        super().request(url=url, **kwargs)
+        self.urls.append(url)
+
+    def getresponse(self):
+        """FakeScriptedHTTPSConnection getresponse Method"""
+
+        status, headers, body = self.routes.get(self.url, (404, {}, {}))
+        response: MagicMock = MagicMock(status=status, reason="Fake")
+        response.getheader = lambda name: headers.get(name, None)
+        set_body(response=response, body=dumps(obj=body))
+        return response
+
+
+class FakeConditionalHTTPSConnection(FakeRecordingHTTPSConnection):
+    """FakeConditionalHTTPSConnection Class (ETag per URL, 304 if unchanged)"""
+
+    def __init__(self, pages: dict[str, tuple[str, list[str], Optional[str]]], **_):
+        super().__init__()
+        self.pages = pages
+
+    def getresponse(self):
+        """FakeConditionalHTTPSConnection getresponse Method"""
+
+        etag, tags, next_url = self.pages[self.url]
+        headers: dict[str, str] = {"etag": etag}
+        if next_url:
+            headers["link"] = f'<{next_url}>; rel="next"'
+        not_modified: bool = self.requests[-1].get("If-None-Match") == etag
+        response: MagicMock = MagicMock(status=304 if not_modified else 200)
+        response.getheader = lambda name: headers.get(name, None)
+        set_body(
+            response=response, body=b"" if not_modified else dumps(obj={"tags": tags})
+        )
+        return response
+
+
+class FakeChallengeHTTPSConnection(FakeRecordingHTTPSConnection):
+    """FakeChallengeHTTPSConnection Class (401 without Authorization header)"""
+
+    def getresponse(self):
+        """FakeChallengeHTTPSConnection getresponse Method"""
+
+        if "Authorization" not in self.requests[-1]:
+            return FakeHTTPResponse(
+                url=self.url,
+                status=401,
+                headers={"www-authenticate": 'Bearer realm="https://auth/token"'},
+            )
+        return super().getresponse()
+
+
+class FakePipelinedSocket:
+    """FakePipelinedSocket Class (answers pipelined DELETE requests in order)"""
+
+    def __init__(
+        self,
+        statuses: dict[str, int],
+        close_after: Optional[int] = None,
+        broken: bool = False,
+    ):
+        self.statuses = statuses
+        self.close_after = close_after
+        self.broken = broken
+        self.urls: list[str] = []
+        self.responses: BytesIO = BytesIO()
+
+    def sendall(self, data: bytes) -> None:
+        """FakePipelinedSocket sendall Method"""
+
+        for request in data.split(b"\r\n\r\n")[:-1]:
+            _, url, _ = request.split(b"\r\n")[0].decode().split(" ")
+            self.urls.append(url)
+            if self.close_after is not None and len(self.urls) > self.close_after:
+                continue
+            status: int = self.statuses.get(url.rpartition("/")[2], 202)
+            close: str = (
+                "Connection: close\r\n"
+                if len(self.urls) == self.close_after and not self.broken
+                else ""
+            )
+            body: str = "" if status == 202 else '{"errors": []}'
+            position: int = self.responses.tell()
+            self.responses.seek(0, 2)
+            self.responses.write(
+                (
+                    f"HTTP/1.1 {status} Fake\r\n{close}"
+                    + (
+                        f"Transfer-Encoding: chunked\r\n\r\n{len(body):x}\r\n{body}"
+                        "\r\n0\r\n\r\n"
+                        if status == 404
+                        else f"Content-Length: {len(body)}\r\n\r\n{body}"
+                    )
+                ).encode()
+            )
+            self.responses.seek(position)
+
+    def makefile(self, **_) -> BytesIO:
+        """FakePipelinedSocket makefile Method"""
+
+        return self.responses
+
+    def close(self) -> None:
+        """FakePipelinedSocket close Method"""
+
+
+class FakeKeepAliveSocket:
+    """FakeKeepAliveSocket Class (real http.client connection, status per URL)"""
+
+    def __init__(self, routes: dict[str, tuple[int, Any]]):
+        self.routes = routes
+        self.responses: list[bytes] = []
+
+    def sendall(self, data: bytes) -> None:
+        """FakeKeepAliveSocket sendall Method"""
+
+        _, url, _ = data.split(b"\r\n")[0].decode().split(" ")
+        status, body = self.routes.get(url, (404, {"errors": []}))
+        content: bytes = dumps(obj=body).encode()
+        self.responses.append(
+            f"HTTP/1.1 {status} Fake\r\nContent-Length: {len(content)}\r\n\r\n".encode()
+            + content
+        )
+
+    def makefile(self, *_, **__) -> BytesIO:
+        """FakeKeepAliveSocket makefile Method (one response per file)"""
+
+        return BytesIO(self.responses.pop(0))
+
+    def close(self) -> None:
+        """FakeKeepAliveSocket close Method"""
+
+
+class FakeAuthenticator:
+    """FakeAuthenticator Class"""
+
+    def __init__(self) -> None:
+        self.challenges: list[str] = []
+
+    def get_authorization(self, url: str) -> Optional[str]:
+        """FakeAuthenticator get_authorization Method"""
+
+        return f"Bearer {url}" if self.challenges else None
+
+    def on_challenge(self, url: str, www_authenticate: str) -> bool:
+        """FakeAuthenticator on_challenge Method"""
+
+        self.challenges.append(f"{url} {www_authenticate}")
+        return True
+
+
 class DockerRegistryClientTests(TestCase):
     """Docker Client Tests Class"""
 
@@ -123,7 +409,7 @@ class DockerRegistryClientTests(TestCase):
             registry_url="https://fake.registry.example.com:12345"
         )
         self.assertEqual(
-            first=my_fake_docker_registry_client.get_images(),
+            first=list(my_fake_docker_registry_client.get_images()),
             second=["fake-alpine", "fake-ubuntu", "fake-python"],
         )
 
@@ -138,11 +424,18 @@ class DockerRegistryClientTests(TestCase):
             registry_url="https://fake.registry.example.com:12345"
         )
         self.assertEqual(
-            first=my_fake_docker_registry_client.get_image_tags(image="fake-no-tags"),
+            first=list(
+                my_fake_docker_registry_client.get_image_tags(image="fake-no-tags")
+            ),
             second=[],
         )
         self.assertEqual(
-            first=my_fake_docker_registry_client.get_image_tags(image="fake-alpine"),
+            first=list(
+                map(
+                    str,
+                    my_fake_docker_registry_client.get_image_tags(image="fake-alpine"),
+                )
+            ),
             second=["fake-alpine:a", "fake-alpine:b", "fake-alpine:c"],
         )
 
@@ -157,7 +450,7 @@ class DockerRegistryClientTests(TestCase):
             registry_url="https://fake.registry.example.com:12345"
         )
         with self.assertRaises(expected_exception=HTTPException):
-            my_fake_docker_registry_client.get_image_tags(image="pouet")
+            list(my_fake_docker_registry_client.get_image_tags(image="pouet"))
 
     @patch(
         target="docker_registry_client.HTTPSConnection",
@@ -175,7 +468,7 @@ class DockerRegistryClientTests(TestCase):
         )
 
         self.assertEqual(
-            first=my_fake_docker_registry_client.get_images(),
+            first=list(my_fake_docker_registry_client.get_images()),
             second=["fake-alpine", "fake-ubuntu", "fake-python"],
         )
 
@@ -243,6 +536,110 @@ class DockerRegistryClientTests(TestCase):
             second=True,
         )
 
+    @patch(
+        target="docker_registry_client.HTTPSConnection",
+        new=MagicMock(return_value=FakeHTTPSConnection(status=202)),
+    )
+    def test_delete_images(self):
+        """Docker Client Bulk Delete (Pipelined, Grouped By Repository)"""
+
+        sockets: list[FakePipelinedSocket] = []
+
+        def connect(**_) -> FakePipelinedSocket:
+            sockets.append(
+                FakePipelinedSocket(
+                    statuses={"missing": 404, "gone": 404, "busy": 503},
+                    close_after=None if sockets else 4,
+                )
+            )
+            return sockets[-1]
+
+        my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+            registry_url="https://fake.registry.example.com:12345"
+        )
+        items: list[tuple[str, str]] = [
+            ("b", "d1"),
+            ("a", "d2"),
+            ("b", "missing"),
+            ("a", "busy"),
+            ("b", "d3"),
+            ("a", "gone"),
+        ]
+        with patch(
+            target="docker_registry_client.open_pipelined_connection", new=connect
+        ):
+            results = list(
+                my_fake_docker_registry_client.delete_images(items=items, depth=2)
+            )
+
+        # 'busy' (503) is retried alone, the closed connection reopened: 'missing'
+        # is sent again, never processed by the closed connection (404: failed)
+        self.assertEqual(
+            first=[(result.image, result.digest, result.deleted) for result in results],
+            second=[
+                ("a", "d2", True),
+                ("a", "gone", False),
+                ("b", "d1", True),
+                ("b", "missing", False),
+                ("b", "d3", True),
+                ("a", "busy", True),
+            ],
+        )
+        self.assertEqual(
+            first=[socket.urls for socket in sockets],
+            second=[
+                [
+                    "/v2/a/manifests/d2",
+                    "/v2/a/manifests/busy",
+                    "/v2/a/manifests/gone",
+                    "/v2/b/manifests/d1",
+                    "/v2/b/manifests/missing",
+                ],
+                ["/v2/b/manifests/missing", "/v2/b/manifests/d3"],
+            ],
+        )
+        self.assertEqual(
+            first=[
+                result.deleted
+                for result in my_fake_docker_registry_client.delete_images(items=items)
+            ],
+            second=[True] * 6,
+        )
+
+    def test_delete_images_broken_connection(self):
+        """Docker Client Bulk Delete Resent After A Broken Connection"""
+
+        sockets: list[FakePipelinedSocket] = []
+
+        def connect(**_) -> FakePipelinedSocket:
+            sockets.append(
+                FakePipelinedSocket(
+                    statuses={"missing": 404},
+                    close_after=None if sockets else 1,
+                    broken=True,
+                )
+            )
+            return sockets[-1]
+
+        my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+            registry_url="https://fake.registry.example.com:12345"
+        )
+        with patch(
+            target="docker_registry_client.open_pipelined_connection", new=connect
+        ):
+            results = list(
+                my_fake_docker_registry_client.delete_images(
+                    items=[("a", "d1"), ("a", "missing")], depth=2
+                )
+            )
+
+        # Unanswered 'missing' may have been processed: its 404 on resend is deleted
+        self.assertEqual(
+            first=[(result.digest, result.deleted) for result in results],
+            second=[("d1", True), ("missing", True)],
+        )
+        self.assertEqual(first=len(sockets), second=2)
+
     @patch(
         target="docker_registry_client.HTTPSConnection",
         new=MagicMock(return_value=FakeHTTPSConnection(status=404)),
@@ -260,3 +657,498 @@ class DockerRegistryClientTests(TestCase):
             ),
             second=False,
         )
+
+    def test_error_response_read(self):
+        """Docker Client Error Response Bodies Read (Connection Reusable)"""
+
+        fake_socket: FakeKeepAliveSocket = FakeKeepAliveSocket(
+            routes={"/v2/fake-ubuntu/tags/list": (200, {"tags": ["a"]})}
+        )
+        connection: HTTPConnection = HTTPConnection(host="fake.registry.example.com")
+        connection.sock = fake_socket
+        metrics: Metrics = Metrics()
+        with patch(
+            target="docker_registry_client.HTTPSConnection",
+            new=MagicMock(return_value=connection),
+        ):
+            my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+                registry_url="https://fake.registry.example.com",
+                retry_policy=RetryPolicy(max_retries=0),
+                metrics=metrics,
+            )
+        self.assertFalse(
+            expr=my_fake_docker_registry_client.delete_image(
+                image="fake-ubuntu", digest="sha256:missing"
+            )
+        )
+        self.assertEqual(
+            first=list(
+                map(
+                    str,
+                    my_fake_docker_registry_client.get_image_tags(image="fake-ubuntu"),
+                )
+            ),
+            second=["fake-ubuntu:a"],
+        )
+        # Same connection, no network error seen
+        self.assertIs(expr1=connection.sock, expr2=fake_socket)
+        self.assertEqual(
+            first=metrics.get(name="docker_registry_cleaner_reconnects_total"),
+            second=0,
+        )
+
+    def test_unread_response(self):
+        """Docker Client Reads A Response Left Unread Before The Next Request"""
+
+        fake_socket: FakeKeepAliveSocket = FakeKeepAliveSocket(
+            routes={
+                "/v2/fake-ubuntu/tags/list": (
+                    200,
+                    {"tags": [f"tag-{index:06d}" for index in range(20000)]},
+                ),
+                "/v2/fake-ubuntu/manifests/sha256:old": (202, {}),
+            }
+        )
+        connection: HTTPConnection = HTTPConnection(host="fake.registry.example.com")
+        connection.sock = fake_socket
+        metrics: Metrics = Metrics()
+        with patch(
+            target="docker_registry_client.HTTPSConnection",
+            new=MagicMock(return_value=connection),
+        ):
+            my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+                registry_url="https://fake.registry.example.com",
+                retry_policy=RetryPolicy(max_retries=0),
+                metrics=metrics,
+            )
+        # Tags list stopped early (generator still open): body partly read
+        tags = my_fake_docker_registry_client.get_image_tags(image="fake-ubuntu")
+        self.assertEqual(first=str(next(tags)), second="fake-ubuntu:tag-000000")
+        self.assertTrue(
+            expr=my_fake_docker_registry_client.delete_image(
+                image="fake-ubuntu", digest="sha256:old"
+            )
+        )
+        self.assertIs(expr1=connection.sock, expr2=fake_socket)
+        self.assertEqual(
+            first=metrics.get(name="docker_registry_cleaner_reconnects_total"),
+            second=0,
+        )
+
+    @patch(target="docker_registry_client.sleep", new=MagicMock())
+    def test_delete_image_retried_404(self):
+        """Docker Client Retried Delete Answered 404 Is Deleted (If Maybe Processed)"""
+
+        # Network error or 503: the first attempt may have been processed,
+        # a 429 was not (the manifest never existed)
+        for failure, expected in (
+            (ConnectionResetError(), True),
+            (503, True),
+            (429, False),
+        ):
+            with patch(
+                target="docker_registry_client.HTTPSConnection",
+                new=MagicMock(
+                    return_value=FakeFlakyHTTPSConnection(
+                        failures=[failure], status=404
+                    )
+                ),
+            ):
+                client: DockerRegistryClient = DockerRegistryClient(
+                    registry_url="https://fake.registry.example.com"
+                )
+            self.assertEqual(
+                first=client.delete_image(image="fake-ubuntu", digest="sha256:old"),
+                second=expected,
+                msg=repr(failure),
+            )
+
+    @patch(
+        target="docker_registry_client.HTTPSConnection",
+        new=MagicMock(return_value=FakePaginatedHTTPSConnection()),
+    )
+    def test_pagination(self):
+        """Docker Client Get Images And Tags Following Link Header Pagination"""
+
+        my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+            registry_url="https://fake.registry.example.com:12345"
+        )
+        self.assertEqual(
+            first=list(my_fake_docker_registry_client.get_images(number_max=2)),
+            second=["fake-alpine", "fake-ubuntu", "fake-python"],
+        )
+        self.assertEqual(
+            first=list(
+                map(
+                    str,
+                    my_fake_docker_registry_client.get_image_tags(
+                        image="fake-alpine", pattern="[ac]", number_max=2
+                    ),
+                )
+            ),
+            second=["fake-alpine:a", "fake-alpine:c"],
+        )
+
+    def test_get_image_tag_digest_media_type_cache(self):
+        """Docker Client Get Image Tag Digest (single HEAD, media type cache)"""
+
+        oci_index: str = "application/vnd.oci.image.index.v1+json"
+        fake_https_connection = FakeRecordingHTTPSConnection(
+            headers={
+                "Docker-Content-Digest": docker_image_tag_fake_digest,
+                "Content-Type": oci_index,
+            }
+        )
+        with patch(
+            target="docker_registry_client.HTTPSConnection",
+            new=MagicMock(return_value=fake_https_connection),
+        ):
+            my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+                registry_url="https://fake.registry.example.com"
+            )
+        for _ in range(2):
+            self.assertEqual(
+                first=my_fake_docker_registry_client.get_image_tag_digest(
+                    image_tag="fake-ubuntu:22.04"
+                ),
+                second=docker_image_tag_fake_digest,
+            )
+
+        self.assertEqual(first=len(fake_https_connection.requests), second=2)
+        first_accept, second_accept = (
+            headers["Accept"].split(", ") for headers in fake_https_connection.requests
+        )
+        self.assertEqual(first=first_accept, second=list(MANIFEST_MEDIA_TYPES))
+        self.assertEqual(first=second_accept[0], second=oci_index)
+        self.assertEqual(first=sorted(second_accept), second=sorted(first_accept))
+        self.assertEqual(
+            first=my_fake_docker_registry_client.manifest_media_types,
+            second={"fake-ubuntu": oci_index},
+        )
+
+    def test_get_image_tag_created(self):
+        """Docker Client Get Image Tag Creation Date (config blob cache)"""
+
+        fake_https_connection = FakeRoutedHTTPSConnection(
+            routes={
+                "/v2/fake-ubuntu/manifests/a": {"config": {"digest": "sha256:c"}},
+                "/v2/fake-ubuntu/manifests/b": {"config": {"digest": "sha256:c"}},
+                "/v2/fake-ubuntu/manifests/index": {
+                    "manifests": [{"digest": "sha256:amd64"}]
+                },
+                "/v2/fake-ubuntu/manifests/sha256:amd64": {
+                    "config": {"digest": "sha256:c"}
+                },
+                "/v2/fake-ubuntu/blobs/sha256:c": {"created": "2024-01-02T03:04:05Z"},
+            }
+        )
+        with patch(
+            target="docker_registry_client.HTTPSConnection",
+            new=MagicMock(return_value=fake_https_connection),
+        ):
+            my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+                registry_url="https://fake.registry.example.com"
+            )
+
+        for tag in ("a", "b", "index"):
+            self.assertEqual(
+                first=my_fake_docker_registry_client.get_image_tag_created(
+                    image_tag=f"fake-ubuntu:{tag}"
+                ),
+                second=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            )
+        # Config blob fetched once: 4 manifests + 1 blob
+        self.assertEqual(first=len(fake_https_connection.requests), second=5)
+        self.assertIsNone(
+            obj=my_fake_docker_registry_client.get_image_tag_created(
+                image_tag="fake-ubuntu:missing"
+            )
+        )
+
+    @patch(target="docker_registry_client.sleep", new=MagicMock())
+    def test_retry(self):
+        """Docker Client Retries On Throttling And Network Errors"""
+
+        fake_https_connection = FakeFlakyHTTPSConnection(
+            failures=[429, ConnectionResetError("reset"), 503],
+            headers={"Docker-Content-Digest": docker_image_tag_fake_digest},
+        )
+        with patch(
+            target="docker_registry_client.HTTPSConnection",
+            new=MagicMock(return_value=fake_https_connection),
+        ):
+            my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+                registry_url="https://fake.registry.example.com"
+            )
+
+        self.assertEqual(
+            first=my_fake_docker_registry_client.get_image_tag_digest(
+                image_tag="fake-ubuntu:22.04"
+            ),
+            second=docker_image_tag_fake_digest,
+        )
+        self.assertEqual(first=len(fake_https_connection.requests), second=4)
+
+        # Retries exhausted
+        fake_https_connection.failures = [503] * 4
+        self.assertIsNone(
+            obj=my_fake_docker_registry_client.get_image_tag_digest(
+                image_tag="fake-ubuntu:22.04"
+            )
+        )
+
+    def test_authentication(self):
+        """Docker Client Retries With A Token On 401 Challenge"""
+
+        fake_https_connection = FakeChallengeHTTPSConnection(
+            headers={"Docker-Content-Digest": docker_image_tag_fake_digest}
+        )
+        fake_authenticator = FakeAuthenticator()
+        with patch(
+            target="docker_registry_client.HTTPSConnection",
+            new=MagicMock(return_value=fake_https_connection),
+        ):
+            my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+                registry_url="https://fake.registry.example.com",
+                authenticator=fake_authenticator,
+            )
+
+        for tag in ("22.04", "24.04"):
+            self.assertEqual(
+                first=my_fake_docker_registry_client.get_image_tag_digest(
+                    image_tag=f"fake-ubuntu:{tag}"
+                ),
+                second=docker_image_tag_fake_digest,
+            )
+        # One challenge, then the token is sent proactively
+        self.assertEqual(first=len(fake_authenticator.challenges), second=1)
+        self.assertEqual(first=len(fake_https_connection.requests), second=3)
+        self.assertEqual(
+            first=fake_https_connection.requests[-1]["Authorization"],
+            second="Bearer /v2/fake-ubuntu/manifests/24.04",
+        )
+
+    @patch(target="docker_registry_client.sleep", new=MagicMock())
+    def test_metrics(self):
+        """Docker Client Records Requests, Retries And Reconnections"""
+
+        fake_https_connection = FakeFlakyHTTPSConnection(
+            failures=[503, ConnectionResetError("reset")],
+            headers={"Docker-Content-Digest": docker_image_tag_fake_digest},
+        )
+        metrics = Metrics()
+        with patch(
+            target="docker_registry_client.HTTPSConnection",
+            new=MagicMock(return_value=fake_https_connection),
+        ):
+            my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+                registry_url="https://fake.registry.example.com", metrics=metrics
+            )
+
+        my_fake_docker_registry_client.get_image_tag_digest(
+            image_tag="fake-ubuntu:22.04"
+        )
+        for status, expected in (("200", 1), ("503", 1), ("error", 1)):
+            self.assertEqual(
+                first=metrics.get(
+                    name="docker_registry_cleaner_requests_total",
+                    endpoint="manifest",
+                    method="HEAD",
+                    status=status,
+                ),
+                second=expected,
+            )
+        self.assertEqual(
+            first=metrics.get(
+                name="docker_registry_cleaner_retries_total",
+                endpoint="manifest",
+                method="HEAD",
+            ),
+            second=2,
+        )
+        self.assertEqual(
+            first=metrics.get(name="docker_registry_cleaner_reconnects_total"),
+            second=1,
+        )
+
+    def test_get_images_last(self):
+        """Docker Client Lists Docker Images After The Last One"""
+
+        fake_https_connection = FakeRoutedHTTPSConnection(
+            routes={"/v2/_catalog?n=10&last=team/app": {"repositories": ["z"]}}
+        )
+        with patch(
+            target="docker_registry_client.HTTPSConnection",
+            new=MagicMock(return_value=fake_https_connection),
+        ):
+            my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+                registry_url="https://fake.registry.example.com"
+            )
+
+        self.assertEqual(
+            first=list(
+                my_fake_docker_registry_client.get_images(
+                    number_max=10, last="team/app"
+                )
+            ),
+            second=["z"],
+        )
+
+    def test_get_image_blobs(self):
+        """Docker Client Gets Blobs Of A Manifest List"""
+
+        fake_https_connection = FakeRoutedHTTPSConnection(
+            routes={
+                "/v2/app/manifests/sha256:index": {
+                    "manifests": [{"digest": "sha256:amd64", "size": 5}]
+                },
+                "/v2/app/manifests/sha256:amd64": {
+                    "config": {"digest": "sha256:config", "size": 7},
+                    "layers": [{"digest": "sha256:layer", "size": 1000}],
+                },
+            }
+        )
+        with patch(
+            target="docker_registry_client.HTTPSConnection",
+            new=MagicMock(return_value=fake_https_connection),
+        ):
+            my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+                registry_url="https://fake.registry.example.com"
+            )
+
+        self.assertEqual(
+            first=my_fake_docker_registry_client.get_image_blobs(
+                image="app", digest="sha256:index"
+            ),
+            second=[
+                ("sha256:amd64", 5),
+                ("sha256:config", 7),
+                ("sha256:layer", 1000),
+            ],
+        )
+
+    def test_get_redirect_url(self):
+        """Redirect URLs (registry paths and absolute URLs)"""
+
+        for url, location, expected in [
+            ("/v2/a/blobs/x", "https://cdn/x?s=1", "https://cdn/x?s=1"),
+            ("/v2/a/blobs/x", "/v2/b/blobs/x", "/v2/b/blobs/x"),
+            ("/v2/a/blobs/x?n=1", "y", "/v2/a/blobs/y"),
+            ("https://cdn/a/x", "/b", "https://cdn/b"),
+        ]:
+            self.assertEqual(
+                first=get_redirect_url(url=url, location=location), second=expected
+            )
+
+    def test_redirect(self):
+        """Docker Client Redirects (other host, hop limit and permanent cache)"""
+
+        routes: dict[str, tuple[int, dict[str, str], Any]] = {
+            "/v2/_catalog?n=10": (301, {"location": "/v3/_catalog?n=10"}, {}),
+            "/v3/_catalog?n=10": (200, {}, {"repositories": ["app"]}),
+            "/v2/app/blobs/sha256:config": (
+                307,
+                {"location": "https://cdn.example.com/blob?sig=1"},
+                {},
+            ),
+            "/blob?sig=1": (200, {}, {"created": "2024-01-01T00:00:00Z"}),
+            "/v2/app/manifests/latest": (
+                200,
+                {},
+                {"config": {"digest": "sha256:config"}},
+            ),
+            "/v2/loop/tags/list": (302, {"location": "/v2/loop/tags/list"}, {}),
+        }
+        connections: dict[str, FakeScriptedHTTPSConnection] = {}
+        with patch(
+            target="docker_registry_client.HTTPSConnection",
+            new=MagicMock(
+                side_effect=lambda host, **kwargs: connections.setdefault(
+                    host, FakeScriptedHTTPSConnection(host=host, routes=routes)
+                )
+            ),
+        ):
+            my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+                registry_url="https://fake.registry.example.com",
+                authenticator=FakeAuthenticator(),
+            )
+            my_fake_docker_registry_client.authenticator.challenges.append("known")
+
+            for _ in range(2):
+                self.assertEqual(
+                    first=list(
+                        my_fake_docker_registry_client.get_images(number_max=10)
+                    ),
+                    second=["app"],
+                )
+            self.assertEqual(
+                first=my_fake_docker_registry_client.get_image_tag_created(
+                    image_tag="app:latest"
+                ),
+                second=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            )
+
+        registry = connections["fake.registry.example.com"]
+        # Permanent redirect cached: the second listing goes to the final URL
+        self.assertEqual(
+            first=[url for url in registry.urls if "_catalog" in url],
+            second=["/v2/_catalog?n=10", "/v3/_catalog?n=10", "/v3/_catalog?n=10"],
+        )
+        # Other origin: own connection, no registry credentials
+        cdn = connections["cdn.example.com"]
+        self.assertEqual(first=cdn.urls, second=["/blob?sig=1"])
+        self.assertNotIn(member="Authorization", container=cdn.requests[0])
+        self.assertIn(member="Authorization", container=registry.requests[0])
+
+        with self.assertRaises(expected_exception=HTTPException):
+            list(my_fake_docker_registry_client.get_image_tags(image="loop"))
+        self.assertEqual(first=registry.urls.count("/v2/loop/tags/list"), second=6)
+
+    def test_get_image_tags_cache(self):
+        """Docker Client Tags List Cache (conditional requests, 304 as hit)"""
+
+        pages: dict[str, tuple[str, list[str], Optional[str]]] = {
+            "/v2/app/tags/list?n=2": (
+                '"1"',
+                ["a", "b"],
+                "/v2/app/tags/list?n=2&last=b",
+            ),
+            "/v2/app/tags/list?n=2&last=b": ('"2"', ["c"], None),
+        }
+        connection = FakeConditionalHTTPSConnection(pages=pages)
+        with patch(
+            target="docker_registry_client.HTTPSConnection",
+            new=MagicMock(return_value=connection),
+        ), TagsListCache(path=":memory:") as tags_cache:
+            my_fake_docker_registry_client: DockerRegistryClient = DockerRegistryClient(
+                registry_url="https://fake.registry.example.com",
+                tags_cache=tags_cache,
+            )
+
+            def get_tags() -> list[str]:
+                return list(
+                    map(
+                        str,
+                        my_fake_docker_registry_client.get_image_tags(
+                            image="app", number_max=2
+                        ),
+                    )
+                )
+
+            self.assertEqual(first=get_tags(), second=["app:a", "app:b", "app:c"])
+            self.assertNotIn(member="If-None-Match", container=connection.requests[0])
+            # Unchanged pages: 304 answers, tags (and next page) from the cache
+            self.assertEqual(first=get_tags(), second=["app:a", "app:b", "app:c"])
+            self.assertEqual(
+                first=[headers["If-None-Match"] for headers in connection.requests[2:]],
+                second=['"1"', '"2"'],
+            )
+            # Changed page: downloaded again and cached
+            pages["/v2/app/tags/list?n=2&last=b"] = ('"3"', ["c", "d"], None)
+            self.assertEqual(
+                first=get_tags(), second=["app:a", "app:b", "app:c", "app:d"]
+            )
+            self.assertEqual(
+                first=tags_cache.get(url="/v2/app/tags/list?n=2&last=b").tags,
+                second=["c", "d"],
+            )
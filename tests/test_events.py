@@ -0,0 +1,50 @@
+"""Events Tests"""
+
+from json import loads
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from events import EventWriter, RunSummary
+
+
+class EventWriterTests(TestCase):
+    """Event Writer Tests Class"""
+
+    def test_write(self):
+        """One JSON Line Per Event, Appended To The File"""
+
+        with TemporaryDirectory() as directory:
+            file_path: str = path.join(directory, "events.jsonl")
+            for tag in ("a", "b"):
+                with EventWriter.open(path=file_path) as events:
+                    events.write(image="alpine", tag=tag, result="deleted")
+            with open(file_path, encoding="utf-8") as file:
+                records: list[dict] = [loads(line) for line in file]
+
+        self.assertEqual(first=[record["tag"] for record in records], second=["a", "b"])
+        self.assertEqual(first=records[0]["result"], second="deleted")
+        self.assertIn(member="time", container=records[0])
+
+
+class RunSummaryTests(TestCase):
+    """Run Summary Tests Class"""
+
+    def test_record(self):
+        """Counters And Bounded Failures Sample"""
+
+        summary = RunSummary(failures_max=2)
+        for number in range(5):
+            summary.record(image_tag=f"alpine:{number}", result="deleted")
+            summary.record(
+                image_tag=f"ubuntu:{number}",
+                result="failed",
+                reason="delete failed" if number % 2 else None,
+            )
+
+        self.assertEqual(first=(summary.deleted, summary.failed), second=(5, 5))
+        self.assertEqual(
+            first=summary.failures, second=["ubuntu:0", "ubuntu:1 (delete failed)"]
+        )
+        self.assertEqual(
+            first=summary.reasons, second={"unknown": 3, "delete failed": 2}
+        )
@@ -0,0 +1,45 @@
+"""GC Estimation Tests"""
+
+from unittest import TestCase
+from gc_estimate import BlobIndex, get_digest_key
+
+base_digest: str = "sha256:" + "ab" * 32
+layer_digest: str = "sha256:" + "cd" * 32
+
+
+class BlobIndexTests(TestCase):
+    """Blob Index Tests Class"""
+
+    def test_get_digest_key(self):
+        """Raw sha256 Digest Keys"""
+
+        self.assertEqual(first=get_digest_key(digest=base_digest), second=b"\xab" * 32)
+        self.assertEqual(
+            first=get_digest_key(digest="sha512:1234"), second=b"sha512:1234"
+        )
+
+    def test_get_reclaimable(self):
+        """Shared Blobs Are Reclaimable Only If No Retained Manifest Uses Them"""
+
+        blob_index = BlobIndex()
+        blob_index.add(
+            repository="app",
+            blobs=[(base_digest, 1000), (layer_digest, 10), ("sha256:c1", 1)],
+            retained=False,
+        )
+        blob_index.add(
+            repository="app",
+            blobs=[(base_digest, 1000), ("sha256:c2", 2)],
+            retained=True,
+        )
+        blob_index.add(
+            repository="other",
+            blobs=[(layer_digest, 10), ("sha256:c3", 3)],
+            retained=False,
+        )
+
+        self.assertEqual(first=len(blob_index), second=5)
+        self.assertEqual(
+            first=blob_index.get_reclaimable(),
+            second={"app": (2, 11), "other": (1, 3)},
+        )
@@ -0,0 +1,70 @@
+"""HTTP Response Parser Tests"""
+
+from http.client import HTTPException, IncompleteRead, RemoteDisconnected
+from io import BytesIO
+from unittest import TestCase
+from http_parser import ParsedResponse, read_response
+
+
+class HTTPParserTests(TestCase):
+    """HTTP Response Parser Tests Class"""
+
+    def test_read_response(self):
+        """Pipelined Responses Read In Order (Length, Chunked, No Body)"""
+
+        stream: BytesIO = BytesIO(
+            b"HTTP/1.1 202 Accepted\r\nContent-Length: 2\r\n\r\n{}"
+            b"HTTP/1.1 404 Not Found\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b'4;ext=1\r\n{"a"\r\n3\r\n: 1\r\n1\r\n}\r\n0\r\nX-Trailer: 1\r\n\r\n'
+            b"HTTP/1.1 204 No Content\r\nConnection: close\r\n\r\n"
+            b"HTTP/1.0 200 OK\r\n\r\nuntil the end"
+        )
+        self.assertEqual(
+            first=read_response(stream=stream, method="DELETE"),
+            second=ParsedResponse(
+                status=202,
+                reason="Accepted",
+                headers={"content-length": "2"},
+                body=b"{}",
+                keep_alive=True,
+            ),
+        )
+        response: ParsedResponse = read_response(stream=stream, method="DELETE")
+        self.assertEqual(
+            first=(response.status, response.reason), second=(404, "Not Found")
+        )
+        self.assertEqual(first=response.body, second=b'{"a": 1}')
+        self.assertTrue(expr=response.keep_alive)
+        response = read_response(stream=stream)
+        self.assertEqual(
+            first=(response.body, response.keep_alive), second=(b"", False)
+        )
+        response = read_response(stream=stream)
+        self.assertEqual(
+            first=(response.body, response.keep_alive), second=(b"until the end", False)
+        )
+        with self.assertRaises(expected_exception=RemoteDisconnected):
+            read_response(stream=stream)
+
+        # HEAD: no body whatever the headers
+        response = read_response(
+            stream=BytesIO(b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\n"),
+            method="HEAD",
+        )
+        self.assertEqual(first=(response.body, response.keep_alive), second=(b"", True))
+
+    def test_invalid_response(self):
+        """Invalid Or Truncated Responses Raise HTTPException"""
+
+        for data in (
+            b"SSH-2.0-OpenSSH\r\n\r\n",
+            b"HTTP/1.1 20x OK\r\n\r\n",
+            b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\n{}",
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n10\r\n{}",
+        ):
+            with self.assertRaises(expected_exception=HTTPException, msg=data):
+                read_response(stream=BytesIO(data))
+        with self.assertRaises(expected_exception=IncompleteRead):
+            read_response(
+                stream=BytesIO(b"HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\n{}")
+            )
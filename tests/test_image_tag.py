@@ -0,0 +1,86 @@
+"""Image Tag Tests"""
+
+from hashlib import sha256
+from unittest import TestCase
+from image_tag import (
+    DigestTable,
+    ImageTag,
+    join_digests,
+    pack_digest,
+    unpack_digest,
+)
+
+digest: str = f"sha256:{sha256(b'Pouet').hexdigest()}"
+
+
+class ImageTagTests(TestCase):
+    """Image Tag Tests Class"""
+
+    def test_parse(self):
+        """Image Tag Parsed From References (Registry Ports, Default Tag)"""
+
+        for reference, image, tag in (
+            ("alpine:3.19", "alpine", "3.19"),
+            ("alpine", "alpine", "latest"),
+            ("team/app:v1", "team/app", "v1"),
+            ("localhost:5000/app", "localhost:5000/app", "latest"),
+            ("localhost:5000/app:v1", "localhost:5000/app", "v1"),
+        ):
+            image_tag: ImageTag = ImageTag.parse(reference=reference)
+            self.assertEqual(
+                first=(image_tag.image, image_tag.tag), second=(image, tag)
+            )
+        self.assertEqual(first=str(ImageTag.parse(reference="a/b:c")), second="a/b:c")
+
+    def test_pack_digest(self):
+        """Digests Packed As Raw Bytes (Other Digests As Text)"""
+
+        self.assertEqual(first=len(pack_digest(digest=digest)), second=32)
+        for other in (digest, "sha256:ab", digest.upper(), f"sha512:{'0' * 128}"):
+            self.assertEqual(
+                first=unpack_digest(packed=pack_digest(digest=other)), second=other
+            )
+
+    def test_digest_table(self):
+        """Digest Tables Grouped And Joined In Digest Order"""
+
+        other: str = f"sha256:{sha256(b'Other').hexdigest()}"
+        candidates = DigestTable()
+        for tag, tag_digest in (
+            ("a", digest),
+            ("b", other),
+            ("c", digest),
+            ("d", "sha256:fake"),
+        ):
+            candidates.add(tag=tag, digest=tag_digest)
+        retained = DigestTable()
+        retained.add(tag="latest", digest=other)
+        retained.add(tag="e", digest="sha256:unknown")
+
+        self.assertEqual(first=len(candidates), second=4)
+        self.assertEqual(first=len(candidates.digests), second=4 * 32)
+        self.assertEqual(
+            first=sorted(join_digests(candidates=candidates, retained=retained)),
+            second=sorted(
+                [
+                    (digest, ["a", "c"], None),
+                    (other, ["b"], "latest"),
+                    ("sha256:fake", ["d"], None),
+                ]
+            ),
+        )
+        self.assertEqual(
+            first=list(join_digests(candidates=DigestTable(), retained=retained)),
+            second=[],
+        )
+
+    def test_identity(self):
+        """Image Tags Equal By Name, Repository Names Interned"""
+
+        first = ImageTag(image="".join(["team/", "app"]), tag="a")
+        second = ImageTag(image="team/app", tag="a")
+        self.assertEqual(first=first, second=second)
+        self.assertEqual(first=len({first, second}), second=1)
+        self.assertIs(expr1=first.image, expr2=second.image)
+        self.assertFalse(expr=hasattr(first, "__dict__"))
+        self.assertNotEqual(first=first, second=ImageTag(image="team/app", tag="b"))
@@ -0,0 +1,68 @@
+"""JSON Stream Tests"""
+
+from io import BytesIO
+from json import dumps
+from unittest import TestCase
+from json_stream import iter_json_strings, iter_tokens
+
+
+class JSONStreamTests(TestCase):
+    """JSON Stream Tests Class"""
+
+    def test_iter_tokens(self):
+        """JSON Tokens Of A Stream (Scalars, Escapes, Whitespace)"""
+
+        body: bytes = b'{"a": [1, -2.5e3, true, null], "b\\"c": "\\u00e9t\\u00e9"}\n'
+        self.assertEqual(
+            first=list(iter_tokens(stream=BytesIO(body), chunk_size=3)),
+            second=[
+                ("{", None),
+                ("string", "a"),
+                (":", None),
+                ("[", None),
+                ("scalar", 1),
+                (",", None),
+                ("scalar", -2500.0),
+                (",", None),
+                ("scalar", True),
+                (",", None),
+                ("scalar", None),
+                ("]", None),
+                (",", None),
+                ("string", 'b"c'),
+                (":", None),
+                ("string", "été"),
+                ("}", None),
+            ],
+        )
+
+    def test_iter_json_strings(self):
+        """JSON Array Member Strings Streamed (Every Chunk Boundary)"""
+
+        tags: list[str] = ["v1.0", "", 'quo"te', "back\\slash", "ünïcode", "x" * 40]
+        body: bytes = dumps(
+            obj={
+                "name": "tags",
+                "nested": {"tags": ["not", "these"]},
+                "tags": [*tags[:3], {"skipped": ["a"]}, [1, "b"], *tags[3:]],
+                "other": ["neither"],
+            },
+            ensure_ascii=False,
+        ).encode()
+        for chunk_size in range(1, 16):
+            self.assertEqual(
+                first=list(
+                    iter_json_strings(
+                        stream=BytesIO(body), key="tags", chunk_size=chunk_size
+                    )
+                ),
+                second=tags,
+            )
+        for body in (b"", b"{}", b'{"tags": null}', b'{"tags": []}'):
+            self.assertEqual(
+                first=list(iter_json_strings(stream=BytesIO(body), key="tags")),
+                second=[],
+            )
+        for body in (b'{"tags": ["a"', b'{"tags": ["a', b'{"tags": []}}'):
+            with self.assertRaises(expected_exception=ValueError):
+                list(iter_json_strings(stream=BytesIO(body), key="tags"))
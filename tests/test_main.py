@@ -0,0 +1,142 @@
+"""Main (Command Line Interface) Tests"""
+
+import sys
+from json import loads
+from os import path
+from subprocess import run
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from config import Config
+from main import EXIT_SUCCESS, EXIT_USAGE, check_filters, get_filters, main
+
+SRC: str = path.join(path.dirname(path.dirname(path.abspath(__file__))), "src")
+
+# Modules that the command line entry point must not import before it knows
+# which subcommand runs (HTTP stack, SQLite, worker pool, pipeline)
+HEAVY_MODULES: tuple[str, ...] = (
+    "concurrent.futures",
+    "docker_registry_client",
+    "email.utils",
+    "http.client",
+    "json",
+    "pipeline",
+    "sqlite3",
+    "ssl",
+    "tag_index",
+    "urllib.request",
+)
+
+
+def get_imported(code: str, env: dict[str, str] | None = None) -> list[str]:
+    """Get the heavy modules imported by some code (fresh interpreter)"""
+
+    process = run(
+        args=[
+            sys.executable,
+            "-c",
+            f"import sys\n{code}\n"
+            f"print(sorted(set({HEAVY_MODULES!r}).intersection(sys.modules)))",
+        ],
+        env={"PYTHONPATH": SRC, **(env or {})},
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return loads(process.stdout.splitlines()[-1].replace("'", '"'))
+
+
+class MainTests(TestCase):
+    """Main (Command Line Interface) Tests Class"""
+
+    def test_lazy_imports(self):
+        """Main Module And Subcommands Import Only What They Need"""
+
+        self.assertEqual(first=get_imported(code="import main"), second=[])
+        with TemporaryDirectory() as directory:
+            self.assertEqual(
+                first=get_imported(
+                    code="import main\nmain.main(argv=['stats'])",
+                    env={"STATE_FILE": path.join(directory, "state.db")},
+                ),
+                second=["sqlite3", "tag_index"],
+            )
+
+    def test_startup_imports(self):
+        """Main Help Startup Imports No Heavy Module"""
+
+        self.assertEqual(
+            first=get_imported(
+                code=(
+                    "import main\ntry:\n    main.main(argv=['--help'])\n"
+                    "except SystemExit:\n    pass"
+                )
+            ),
+            second=[],
+        )
+
+    def test_check_filters(self):
+        """Main Dangerous Filters Refused Unless Forced (Non-Interactive)"""
+
+        dangerous = get_filters(config=Config(docker_tags_filter=".*"))
+        safe = get_filters(
+            config=Config(docker_images_filter="^team/", docker_tags_filter="^old-")
+        )
+        self.assertFalse(expr=check_filters(filters=dangerous, force=False))
+        self.assertTrue(expr=check_filters(filters=dangerous, force=True))
+        self.assertTrue(expr=check_filters(filters=safe, force=False))
+
+    def test_main(self):
+        """Main Usage Errors (No Network Calls)"""
+
+        config = Config(docker_registry_url="https://localhost:1")
+        self.assertEqual(first=main(argv=["delete"], config=config), second=EXIT_USAGE)
+        self.assertEqual(first=main(argv=["stats"], config=config), second=EXIT_USAGE)
+        with TemporaryDirectory() as directory:
+            self.assertEqual(
+                first=main(
+                    argv=["stats"],
+                    config=config._replace(state_file=path.join(directory, "db")),
+                ),
+                second=EXIT_SUCCESS,
+            )
+        with self.assertRaises(expected_exception=ValueError):
+            main(argv=["--force", "plan"], config=Config())
+
+    def test_main_profile(self):
+        """Main Profiling Report And Output File"""
+
+        with TemporaryDirectory() as directory:
+            profile_path: str = path.join(directory, "run.pstats")
+            config = Config(state_file=path.join(directory, "state.db"))
+            with self.assertLogs(level="INFO") as logs:
+                exit_code: int = main(
+                    argv=["--profile-output", profile_path, "stats"], config=config
+                )
+            self.assertEqual(first=exit_code, second=EXIT_SUCCESS)
+            self.assertTrue(expr=path.exists(profile_path))
+            phases: list[str] = [
+                line.split("⏱️ ")[1].split()[0] for line in logs.output if "⏱️ " in line
+            ]
+            # Profile written, report title, header, then one line per phase
+            self.assertEqual(first=phases[2], second="phase")
+            self.assertEqual(
+                first=sorted(phases[3:]), second=["logging", "run_stats", "setup"]
+            )
+
+    def test_main_registries(self):
+        """Main Several Registries (Subcommands Needing One Registry)"""
+
+        with TemporaryDirectory() as directory:
+            config_path: str = path.join(directory, "registries.toml")
+            with open(config_path, mode="w", encoding="utf-8") as file:
+                file.write(
+                    '[registries.a]\ndocker_registry_url = "https://localhost:1"\n'
+                    '[registries.b]\ndocker_registry_url = "https://localhost:2"\n'
+                )
+            for argv in (
+                ["--config", config_path, "list"],
+                ["--config", config_path, "plan", "--output", "plan.jsonl"],
+                ["--config", config_path, "--registry", "c", "list"],
+                ["--config", config_path, "--force", "--registry", "a", "stats"],
+            ):
+                self.assertEqual(first=main(argv=argv, config=Config()), second=2)
@@ -0,0 +1,77 @@
+"""Matcher Tests"""
+
+from unittest import TestCase
+from matcher import Matcher, get_matcher, is_literal, is_pathological_regex
+
+
+class MatcherTests(TestCase):
+    """Matcher Tests Class"""
+
+    def test_is_literal(self):
+        """Literal Pattern Detection"""
+
+        self.assertTrue(expr=is_literal(pattern="release-candidate"))
+        self.assertFalse(expr=is_literal(pattern="^release"))
+        self.assertFalse(expr=is_literal(pattern=r"v\d"))
+
+    def test_is_pathological_regex(self):
+        """Pathological (Catastrophic Backtracking) Pattern Detection"""
+
+        for pattern in (
+            r"(a+)+$",
+            r"(.*)*",
+            r"^(\w+\s?)*$",
+            r"x(?:[a-z]*-?)+y",
+            r"((a|b+)c)*",
+            r"(a{2,})+",
+        ):
+            self.assertTrue(expr=is_pathological_regex(pattern=pattern), msg=pattern)
+        for pattern in (
+            r"^release/.*",
+            r"^v\d+\.\d+$",
+            r"(ab){2,5}",
+            r"(a|b)+",
+            r"(a+){2}",
+            r"([+*])+",
+            r"(\+\*)+",
+            r"(a+)(b)+",
+        ):
+            self.assertFalse(expr=is_pathological_regex(pattern=pattern), msg=pattern)
+
+    def test_matches(self):
+        """Include/Exclude Patterns With Literal Fast Paths"""
+
+        matcher: Matcher = Matcher.from_string(
+            includes="^pr-\nmain\n^latest$\n^v\\d+\n", excludes="^pr-keep"
+        )
+        for string in ("pr-1", "main-x", "x-main", "latest", "v12"):
+            self.assertTrue(expr=matcher(string), msg=string)
+        for string in ("pr-keep-1", "latest2", "v", "x"):
+            self.assertFalse(expr=matcher(string), msg=string)
+
+        self.assertTrue(expr=Matcher()("anything"))
+        self.assertTrue(expr=Matcher(includes=[".*"], excludes=["^x$"])("y"))
+        self.assertFalse(expr=Matcher(includes=[".*"], excludes=["^x$"])("x"))
+        self.assertEqual(
+            first=Matcher.from_string(includes="a\n\nb").includes, second=("a", "b")
+        )
+        # Spaces are part of the pattern (never split)
+        self.assertFalse(expr=Matcher.from_string(includes="^a b")("a-b"))
+        self.assertEqual(
+            first=Matcher.from_string(includes="a\nb").pathological_patterns, second=[]
+        )
+
+    def test_invalid_pattern(self):
+        """Invalid Patterns Are Reported At Compile Time"""
+
+        with self.assertRaisesRegex(
+            expected_exception=ValueError, expected_regex="Invalid filter regex"
+        ):
+            Matcher(includes=["ok", "("])
+
+    def test_get_matcher(self):
+        """Matcher Cache"""
+
+        matcher: Matcher = get_matcher(pattern="^abc")
+        self.assertIs(expr1=get_matcher(pattern="^abc"), expr2=matcher)
+        self.assertIs(expr1=get_matcher(pattern=matcher), expr2=matcher)
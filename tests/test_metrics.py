@@ -0,0 +1,128 @@
+"""Metrics Tests"""
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from os import path
+from tempfile import TemporaryDirectory
+from threading import Thread
+from unittest import TestCase
+from metrics import Metrics, format_labels, get_endpoint
+
+
+class FakePushgatewayHandler(BaseHTTPRequestHandler):
+    """FakePushgatewayHandler Class"""
+
+    pushed: list[tuple[str, str, str]] = []
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        """FakePushgatewayHandler PUT Method"""
+
+        body: bytes = self.rfile.read(int(self.headers["Content-Length"]))
+        self.pushed.append((self.path, self.headers["Content-Type"], body.decode()))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *_):  # pylint: disable=arguments-differ
+        """FakePushgatewayHandler Quiet Logs"""
+
+
+class MetricsTests(TestCase):
+    """Metrics Tests Class"""
+
+    def setUp(self):
+        self.metrics = Metrics(buckets=(0.1, 1.0))
+        for duration in (0.05, 0.5, 2.0):
+            self.metrics.on_request(
+                url="/v2/app/manifests/latest",
+                method="HEAD",
+                status=200,
+                duration=duration,
+            )
+        self.metrics.on_request(
+            url="/v2/app/tags/list?n=10",
+            method="GET",
+            status=200,
+            duration=0.01,
+            size=123,
+        )
+
+    def test_get_endpoint(self):
+        """Endpoint Labels"""
+
+        for url, endpoint in [
+            ("/path/v2/_catalog?n=10&last=a", "catalog"),
+            ("/v2/team/app/tags/list", "tags_list"),
+            ("/v2/app/manifests/sha256:abc", "manifest"),
+            ("/v2/app/blobs/sha256:abc", "blob"),
+            ("/v2/", "other"),
+        ]:
+            self.assertEqual(first=get_endpoint(url=url), second=endpoint)
+
+    def test_format_labels(self):
+        """Escaped Label Values"""
+
+        self.assertEqual(
+            first=format_labels(labels=(("a", 'x"y\\z\n'), ("b", "c"))),
+            second='{a="x\\"y\\\\z\\n",b="c"}',
+        )
+        self.assertEqual(first=format_labels(labels=()), second="")
+
+    def test_render(self):
+        """Prometheus Text Format"""
+
+        lines: list[str] = self.metrics.render().splitlines()
+        prefix: str = "docker_registry_cleaner"
+        labels: str = 'endpoint="manifest",method="HEAD"'
+        for line in [
+            f"# TYPE {prefix}_requests_total counter",
+            f'{prefix}_requests_total{{{labels},status="200"}} 3',
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+            f'{prefix}_request_duration_seconds_bucket{{{labels},le="0.1"}} 1',
+            f'{prefix}_request_duration_seconds_bucket{{{labels},le="1"}} 2',
+            f'{prefix}_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3',
+            f"{prefix}_request_duration_seconds_sum{{{labels}}} 2.55",
+            f"{prefix}_request_duration_seconds_count{{{labels}}} 3",
+            f'{prefix}_received_bytes_total{{endpoint="tags_list"}} 123',
+        ]:
+            self.assertIn(member=line, container=lines)
+        self.assertNotIn(member="# EOF", container=lines)
+
+    def test_render_openmetrics(self):
+        """OpenMetrics Text Format"""
+
+        lines: list[str] = self.metrics.render(openmetrics=True).splitlines()
+        self.assertIn(
+            member="# TYPE docker_registry_cleaner_requests counter", container=lines
+        )
+        self.assertEqual(first=lines[-1], second="# EOF")
+
+    def test_write_textfile(self):
+        """Textfile Written"""
+
+        with TemporaryDirectory() as directory:
+            file_path: str = path.join(directory, "cleaner.prom")
+            self.metrics.write_textfile(path=file_path)
+            with open(file_path, encoding="utf-8") as file:
+                self.assertEqual(first=file.read(), second=self.metrics.render())
+
+    def test_push(self):
+        """Pushgateway Push"""
+
+        server = HTTPServer(("127.0.0.1", 0), FakePushgatewayHandler)
+        thread = Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            self.assertTrue(
+                expr=self.metrics.push(
+                    url=f"http://127.0.0.1:{server.server_port}/", job="cleaner"
+                )
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+        url, content_type, body = FakePushgatewayHandler.pushed[-1]
+        self.assertEqual(first=url, second="/metrics/job/cleaner")
+        self.assertTrue(expr=content_type.startswith("text/plain; version=0.0.4"))
+        self.assertEqual(first=body, second=self.metrics.render())
+
+        self.assertFalse(expr=self.metrics.push(url="http://127.0.0.1:1", job="x"))
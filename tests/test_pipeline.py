@@ -0,0 +1,410 @@
+"""Pipeline Tests"""
+
+from unittest import TestCase
+from unittest.mock import patch
+from datetime import datetime, timezone
+from io import StringIO
+from json import loads
+from os import path
+from tempfile import TemporaryDirectory
+from threading import Thread
+from typing import Iterator, Optional
+from http.client import HTTPException
+from docker_registry_client import DeleteResult
+from events import EventWriter
+from gc_estimate import BlobIndex
+from image_tag import ImageTag
+from logger import logger
+from pipeline import CleanerPipeline
+from plan import PlanWriter, read_plan
+from protected_index import ProtectedIndex
+from retention_policy import RetentionPolicy
+from scheduler import FairScheduler
+from sharding import Checkpoint
+from tag_index import TagIndex
+
+
+class FakeDockerRegistryClient:
+    """FakeDockerRegistryClient Class"""
+
+    tags: dict[str, list[str]] = {
+        "fake-alpine": ["a", "b", "c", "latest"],
+        "fake-ubuntu": ["22.04", "no-digest"],
+        "fake-no-tags": [],
+    }
+    digests: dict[str, str] = {
+        "fake-alpine:a": "sha256:ab",
+        "fake-alpine:b": "sha256:ab",
+        "fake-alpine:c": "sha256:c",
+        "fake-alpine:latest": "sha256:c",
+    }
+    deletions: list[tuple[str, str]] = []
+    depths: list[int] = []
+    heads: list[str] = []
+
+    def get_image_tags(self, image: str, **_) -> Iterator[ImageTag]:
+        """FakeDockerRegistryClient Get Image Tags Method"""
+
+        for tag in self.tags[image]:
+            yield ImageTag(image=image, tag=tag)
+
+    def get_image_tag_digest(self, image_tag: ImageTag) -> Optional[str]:
+        """FakeDockerRegistryClient Get Image Tag Digest Method"""
+
+        self.heads.append(str(image_tag))
+        if image_tag.tag == "no-digest":
+            return None
+        return self.digests.get(str(image_tag), f"sha256:{image_tag}")
+
+    def get_image_tag_created(self, image_tag: ImageTag) -> Optional[datetime]:
+        """FakeDockerRegistryClient Get Image Tag Creation Date Method"""
+
+        return datetime(2024, 1, ord(image_tag.tag[-1]) % 28 + 1, tzinfo=timezone.utc)
+
+    def get_image_blobs(self, image: str, digest: str) -> list[tuple[str, int]]:
+        """FakeDockerRegistryClient Get Image Blobs Method"""
+
+        if (image, digest) in self.deletions:
+            raise HTTPException(f"HTTP 404 for '{image}@{digest}'")
+        return [("sha256:base", 100), (f"{image}@{digest}", 10)]
+
+    def delete_image(self, image: str, digest: str) -> bool:
+        """FakeDockerRegistryClient Delete Image Method"""
+
+        self.deletions.append((image, digest))
+        return image != "fake-ubuntu" or not digest.endswith(":22.04")
+
+    def delete_images(
+        self, items: Iterator[tuple[str, str]], depth: int = 1
+    ) -> Iterator[DeleteResult]:
+        """FakeDockerRegistryClient Bulk Delete Method"""
+
+        self.depths.append(depth)
+        for image, digest in items:
+            yield DeleteResult(
+                image=image,
+                digest=digest,
+                deleted=self.delete_image(image=image, digest=digest),
+                latency=0.0,
+            )
+
+
+class CleanerPipelineTests(TestCase):
+    """Cleaner Pipeline Tests Class"""
+
+    images: list[str] = ["fake-alpine", "fake-ubuntu", "fake-no-tags"]
+
+    @staticmethod
+    def get_results(events: StringIO, result: str) -> list[str]:
+        """Get sorted 'image:tag (digest)' of the events with a given result"""
+
+        return sorted(
+            f"{event['image']}:{event['tag']}"
+            + (f" ({event['digest']})" if event["digest"] else "")
+            for event in map(loads, events.getvalue().splitlines())
+            if event["result"] == result
+        )
+
+    def test_run(self):
+        """Cleaner Pipeline Run Test (serial, concurrent and bulk deletes)"""
+
+        for concurrency, depth in ((1, 1), (8, 1), (8, 4)):
+            FakeDockerRegistryClient.deletions.clear()
+            FakeDockerRegistryClient.depths.clear()
+            events = StringIO()
+            pipeline = CleanerPipeline(
+                client_factory=FakeDockerRegistryClient,
+                concurrency=concurrency,
+                delete_pipeline_depth=depth,
+                tags_filter=r"^([a-c]|22\.04|no-digest)$",
+                dry_run=False,
+                events=EventWriter(stream=events),
+            )
+            pipeline.run(images=iter(self.images))
+
+            self.assertEqual(first=pipeline.images, second=3)
+            # 'c' is kept: its digest is still referenced by 'latest'
+            self.assertEqual(
+                first=self.get_results(events=events, result="deleted"),
+                second=["fake-alpine:a (sha256:ab)", "fake-alpine:b (sha256:ab)"],
+            )
+            self.assertEqual(
+                first=self.get_results(events=events, result="failed"),
+                second=[
+                    "fake-ubuntu:22.04 (sha256:fake-ubuntu:22.04)",
+                    "fake-ubuntu:no-digest",
+                ],
+            )
+            self.assertEqual(
+                first=self.get_results(events=events, result="kept"),
+                second=["fake-alpine:c (sha256:c)"],
+            )
+            self.assertEqual(
+                first=(pipeline.summary.deleted, pipeline.summary.failed), second=(2, 2)
+            )
+            self.assertEqual(
+                first=pipeline.summary.reasons,
+                second={"delete failed": 1, "digest unknown": 1},
+            )
+            # One DELETE per manifest digest
+            self.assertEqual(
+                first=sorted(FakeDockerRegistryClient.deletions),
+                second=[
+                    ("fake-alpine", "sha256:ab"),
+                    ("fake-ubuntu", "sha256:fake-ubuntu:22.04"),
+                ],
+            )
+            # One bulk delete per image with deletions (pipelined requests)
+            self.assertEqual(
+                first=FakeDockerRegistryClient.depths,
+                second=[] if depth == 1 else [depth, depth],
+            )
+
+    def test_run_dry_run(self):
+        """Cleaner Pipeline Dry-Run Test"""
+
+        FakeDockerRegistryClient.deletions.clear()
+        events = StringIO()
+        plan = StringIO()
+        pipeline = CleanerPipeline(
+            client_factory=FakeDockerRegistryClient,
+            concurrency=4,
+            dry_run=True,
+            events=EventWriter(stream=events),
+            failures_max=0,
+            plan=PlanWriter(stream=plan, registry="https://fake"),
+        )
+        pipeline.run(images=self.images)
+
+        self.assertEqual(
+            first=self.get_results(events=events, result="deleted"), second=[]
+        )
+        self.assertEqual(
+            first=self.get_results(events=events, result="failed"),
+            second=["fake-ubuntu:no-digest"],
+        )
+        self.assertEqual(first=pipeline.summary.counts["dry_run"], second=5)
+        # Bounded failures sample
+        self.assertEqual(first=pipeline.summary.failures, second=[])
+        self.assertEqual(first=FakeDockerRegistryClient.deletions, second=[])
+        # One plan entry per manifest
+        self.assertEqual(
+            first=sorted(
+                read_plan(stream=plan.getvalue().splitlines(), registry="https://fake")
+            ),
+            second=[
+                ("fake-alpine", "sha256:ab", ["a", "b"]),
+                ("fake-alpine", "sha256:c", ["c", "latest"]),
+                ("fake-ubuntu", "sha256:fake-ubuntu:22.04", ["22.04"]),
+            ],
+        )
+
+    def test_run_protected(self):
+        """Cleaner Pipeline Protected Tags Kept (No Deletion)"""
+
+        FakeDockerRegistryClient.deletions.clear()
+        events = StringIO()
+        pipeline = CleanerPipeline(
+            client_factory=FakeDockerRegistryClient,
+            tags_filter=r"^[a-c]$",
+            dry_run=False,
+            events=EventWriter(stream=events),
+            protected=ProtectedIndex(image_tags=["fake-alpine:b"]),
+        )
+        pipeline.run(images=iter(self.images))
+
+        # 'a' shares its manifest with the protected 'b'
+        self.assertEqual(
+            first=self.get_results(events=events, result="kept"),
+            second=[
+                "fake-alpine:a (sha256:ab)",
+                "fake-alpine:b (sha256:ab)",
+                "fake-alpine:c (sha256:c)",
+            ],
+        )
+        self.assertEqual(
+            first=sorted(
+                event["reason"]
+                for event in map(loads, events.getvalue().splitlines())
+                if event["result"] == "kept"
+            ),
+            second=[
+                "protected 'fake-alpine:b'",
+                "protected 'fake-alpine:b'",
+                "referenced by 'fake-alpine:latest'",
+            ],
+        )
+        self.assertEqual(first=FakeDockerRegistryClient.deletions, second=[])
+
+    def test_run_scheduler(self):
+        """Cleaner Pipelines Sharing A Scheduler Budget"""
+
+        scheduler = FairScheduler(budget=1)
+        pipelines: list[CleanerPipeline] = [
+            CleanerPipeline(
+                client_factory=FakeDockerRegistryClient,
+                concurrency=4,
+                scheduler=scheduler,
+                name=name,
+            )
+            for name in ("a", "b")
+        ]
+        threads: list[Thread] = [
+            Thread(target=pipeline.run, kwargs={"images": self.images})
+            for pipeline in pipelines
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        for pipeline in pipelines:
+            self.assertEqual(first=pipeline.summary.counts["dry_run"], second=5)
+        self.assertEqual(first=scheduler.running, second={"a": 0, "b": 0})
+
+    def test_run_checkpoint(self):
+        """Cleaner Pipeline Checkpoint Reaches The Last Docker Image"""
+
+        with TemporaryDirectory() as directory:
+            checkpoint = Checkpoint(
+                path=path.join(directory, "checkpoint.json"), key="test"
+            )
+            pipeline = CleanerPipeline(
+                client_factory=FakeDockerRegistryClient,
+                concurrency=4,
+                tags_filter=r"^([a-c]|22\.04|no-digest)$",
+                dry_run=False,
+                checkpoint=checkpoint,
+            )
+            pipeline.run(images=self.images)
+            self.assertEqual(first=checkpoint.last, second="fake-no-tags")
+
+    def test_run_gc_estimate(self):
+        """Cleaner Pipeline GC Estimation (shared base layer is retained)"""
+
+        pipeline = CleanerPipeline(
+            client_factory=FakeDockerRegistryClient,
+            concurrency=4,
+            tags_filter=r"^([a-c]|22\.04|no-digest)$",
+            blob_index=BlobIndex(),
+            gc_batch_size=1,
+        )
+        pipeline.run(images=self.images)
+        self.assertEqual(
+            first=pipeline.blob_index.get_reclaimable(),
+            second={"fake-alpine": (1, 10), "fake-ubuntu": (1, 10)},
+        )
+
+    def test_run_gc_estimate_delete(self):
+        """Cleaner Pipeline GC Estimation Before Deleting (Single And Bulk)"""
+
+        for depth in (1, 4):
+            FakeDockerRegistryClient.deletions.clear()
+            pipeline = CleanerPipeline(
+                client_factory=FakeDockerRegistryClient,
+                concurrency=4,
+                tags_filter=r"^([a-c]|22\.04|no-digest)$",
+                dry_run=False,
+                delete_pipeline_depth=depth,
+                blob_index=BlobIndex(),
+                gc_batch_size=1,
+            )
+            with self.assertNoLogs(logger=logger, level="WARNING"):
+                pipeline.run(images=["fake-alpine"])
+            # Blobs fetched before the manifest was deleted
+            self.assertEqual(
+                first=pipeline.blob_index.get_reclaimable(),
+                second={"fake-alpine": (1, 10)},
+            )
+            self.assertEqual(
+                first=FakeDockerRegistryClient.deletions,
+                second=[("fake-alpine", "sha256:ab")],
+            )
+
+    def test_run_tag_index(self):
+        """Cleaner Pipeline Incremental Run Using A Tag Index"""
+
+        with TagIndex(path=":memory:") as tag_index:
+            for heads in (4, 1):
+                FakeDockerRegistryClient.heads.clear()
+                pipeline = CleanerPipeline(
+                    client_factory=FakeDockerRegistryClient,
+                    tags_filter=r"^[a-c]$",
+                    tag_index=tag_index,
+                )
+                pipeline.run(images=self.images)
+
+                # Second run: candidates digests are known, kept tags resolved
+                self.assertEqual(
+                    first=len(FakeDockerRegistryClient.heads), second=heads
+                )
+                self.assertEqual(first=pipeline.summary.failed, second=0)
+
+            self.assertEqual(
+                first=tag_index.get_digest(image="fake-alpine", tag="latest"),
+                second="sha256:c",
+            )
+
+    def test_run_tag_index_moved_tag(self):
+        """Cleaner Pipeline Tag Index With A Kept Tag Moved Onto A Candidate"""
+
+        FakeDockerRegistryClient.deletions.clear()
+        with TagIndex(path=":memory:") as tag_index:
+            CleanerPipeline(
+                client_factory=FakeDockerRegistryClient,
+                tags_filter=r"^[a-c]$",
+                tag_index=tag_index,
+            ).run(images=["fake-alpine"])
+
+            # Same tags list, but 'latest' now references the 'a' and 'b' digest
+            with patch.dict(
+                in_dict=FakeDockerRegistryClient.digests,
+                values={"fake-alpine:latest": "sha256:ab"},
+            ):
+                pipeline = CleanerPipeline(
+                    client_factory=FakeDockerRegistryClient,
+                    tags_filter=r"^[a-c]$",
+                    dry_run=False,
+                    tag_index=tag_index,
+                )
+                pipeline.run(images=["fake-alpine"])
+
+        self.assertEqual(
+            first=FakeDockerRegistryClient.deletions,
+            second=[("fake-alpine", "sha256:c")],
+        )
+        self.assertEqual(first=pipeline.summary.failed, second=0)
+
+    def test_run_retention_policy(self):
+        """Cleaner Pipeline With A Retention Policy"""
+
+        pipeline = CleanerPipeline(
+            client_factory=FakeDockerRegistryClient,
+            concurrency=4,
+            tags_filter=r"^[a-c]$",
+            dry_run=False,
+            retention_policy=RetentionPolicy(keep_last=1),
+            events=EventWriter(stream=(events := StringIO())),
+        )
+        FakeDockerRegistryClient.deletions.clear()
+        pipeline.run(images=["fake-alpine"])
+
+        # 'c' is the newest tag and kept, 'a' and 'b' share a digest
+        self.assertEqual(
+            first=self.get_results(events=events, result="deleted"),
+            second=["fake-alpine:a (sha256:ab)", "fake-alpine:b (sha256:ab)"],
+        )
+        self.assertEqual(
+            first=FakeDockerRegistryClient.deletions,
+            second=[("fake-alpine", "sha256:ab")],
+        )
+
+        # 'b' is the newest tag and kept: 'a' digest is still referenced
+        pipeline = CleanerPipeline(
+            client_factory=FakeDockerRegistryClient,
+            tags_filter=r"^[ab]$",
+            dry_run=False,
+            retention_policy=RetentionPolicy(keep_last=1),
+        )
+        pipeline.run(images=["fake-alpine"])
+        self.assertEqual(first=pipeline.summary.deleted, second=0)
@@ -0,0 +1,133 @@
+"""Plan Tests"""
+
+from io import StringIO
+from json import loads
+from typing import Optional
+from unittest import TestCase
+from events import EventWriter
+from image_tag import ImageTag
+from plan import PlanApplier, PlanEntry, PlanWriter, read_plan
+from protected_index import ProtectedIndex
+
+
+class FakeDockerRegistryClient:
+    """FakeDockerRegistryClient Class (tags re-pushed since the plan)"""
+
+    digests: dict[str, str] = {
+        "alpine:a": "sha256:a",
+        "alpine:b": "sha256:b",
+        "alpine:c": "sha256:new",
+        "ubuntu:22.04": "sha256:22.04",
+    }
+    deletions: list[tuple[str, str]] = []
+
+    def get_image_tag_digest(self, image_tag: ImageTag) -> Optional[str]:
+        """FakeDockerRegistryClient Get Image Tag Digest Method"""
+
+        return self.digests.get(str(image_tag))
+
+    def delete_image(self, image: str, digest: str) -> bool:
+        """FakeDockerRegistryClient Delete Image Method"""
+
+        self.deletions.append((image, digest))
+        return image != "ubuntu"
+
+
+class PlanTests(TestCase):
+    """Plan Tests Class"""
+
+    entries: list[PlanEntry] = [
+        PlanEntry(image="alpine", digest="sha256:a", tags=["a"]),
+        PlanEntry(image="alpine", digest="sha256:b", tags=["b", "gone"]),
+        PlanEntry(image="alpine", digest="sha256:c", tags=["c"]),
+        PlanEntry(image="ubuntu", digest="sha256:22.04", tags=["22.04"]),
+    ]
+
+    def test_read_plan(self):
+        """Plan Written And Read Back (Registry Checked)"""
+
+        stream = StringIO()
+        writer = PlanWriter(stream=stream, registry="https://registry")
+        for entry in self.entries:
+            writer.write(image=entry.image, digest=entry.digest, tags=entry.tags)
+        lines: list[str] = stream.getvalue().splitlines()
+
+        self.assertEqual(first=writer.entries, second=4)
+        self.assertEqual(first=loads(lines[0])["plan"], second=1)
+        self.assertEqual(
+            first=list(read_plan(stream=lines, registry="https://registry")),
+            second=self.entries,
+        )
+        with self.assertRaises(expected_exception=ValueError):
+            list(read_plan(stream=lines, registry="https://other"))
+        with self.assertRaises(expected_exception=ValueError):
+            list(
+                read_plan(
+                    stream=[*lines, '{"image":"alpine"}'], registry="https://registry"
+                )
+            )
+        with self.assertRaises(expected_exception=ValueError):
+            list(read_plan(stream=lines[1:], registry="https://registry"))
+
+    def test_apply(self):
+        """Plan Applied Concurrently (Re-Pushed Tags Kept)"""
+
+        FakeDockerRegistryClient.deletions.clear()
+        events = StringIO()
+        applier = PlanApplier(
+            client_factory=FakeDockerRegistryClient,
+            concurrency=2,
+            events=EventWriter(stream=events),
+        )
+        applier.run(entries=iter(self.entries))
+
+        self.assertEqual(first=applier.entries, second=4)
+        self.assertEqual(
+            first=sorted(FakeDockerRegistryClient.deletions),
+            second=[
+                ("alpine", "sha256:a"),
+                ("alpine", "sha256:b"),
+                ("ubuntu", "sha256:22.04"),
+            ],
+        )
+        self.assertEqual(
+            first=applier.summary.counts,
+            second={"deleted": 2, "failed": 1, "dry_run": 0, "kept": 2},
+        )
+        self.assertEqual(
+            first=sorted(
+                f"{event['image']}:{event['tag']}"
+                for event in map(loads, events.getvalue().splitlines())
+                if event["result"] == "kept"
+            ),
+            second=["alpine:c", "alpine:gone"],
+        )
+
+    def test_apply_protected(self):
+        """Plan Protected Manifests Kept Without Requests"""
+
+        FakeDockerRegistryClient.deletions.clear()
+        events = StringIO()
+        applier = PlanApplier(
+            client_factory=FakeDockerRegistryClient,
+            events=EventWriter(stream=events),
+            protected=ProtectedIndex(image_tags=["alpine:b", "ubuntu:latest"]),
+        )
+        applier.run(entries=iter(self.entries))
+
+        self.assertEqual(
+            first=FakeDockerRegistryClient.deletions,
+            second=[("alpine", "sha256:a"), ("ubuntu", "sha256:22.04")],
+        )
+        self.assertEqual(
+            first=sorted(
+                (f"{event['image']}:{event['tag']}", event["reason"])
+                for event in map(loads, events.getvalue().splitlines())
+                if event["result"] == "kept"
+            ),
+            second=[
+                ("alpine:b", "protected 'alpine:b'"),
+                ("alpine:c", "digest changed since plan"),
+                ("alpine:gone", "protected 'alpine:b'"),
+            ],
+        )
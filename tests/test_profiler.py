@@ -0,0 +1,106 @@
+"""Profiler Tests"""
+
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+from pstats import Stats
+from tempfile import TemporaryDirectory
+from time import sleep
+from typing import Iterator
+from unittest import TestCase
+from matcher import Matcher
+from profiler import ProfiledMatcher, Profiler, get_percentile, get_thread_group
+
+
+class FakeClient:
+    """FakeClient Class"""
+
+    def get_images(self, count: int) -> Iterator[str]:
+        """FakeClient Get Images Method (paginated: waits per page)"""
+
+        for index in range(count):
+            sleep(0.01)
+            yield f"image-{index}"
+
+    def get_image_blobs(self, depth: int) -> list[int]:
+        """FakeClient Get Image Blobs Method (recursive: index manifests)"""
+
+        return [depth] + (self.get_image_blobs(depth=depth - 1) if depth else [])
+
+
+def run_worker(duration: float) -> None:
+    """Wait for a worker thread (cleaner pool) during some seconds"""
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="cleaner") as pool:
+        pool.submit(sleep, duration).result()
+
+
+class ProfilerTests(TestCase):
+    """Profiler Tests Class"""
+
+    def test_phases(self):
+        """Profiler Phases Timed (Calls, Generators, Nested Calls, Wait Time)"""
+
+        profiler = Profiler()
+        client: FakeClient = profiler.instrument(obj=FakeClient())
+        with profiler.phase(name="setup"):
+            sleep(0.02)
+        self.assertEqual(first=len(list(client.get_images(count=3))), second=3)
+        self.assertEqual(first=client.get_image_blobs(depth=2), second=[2, 1, 0])
+        matcher = ProfiledMatcher(
+            matcher=Matcher(includes=["^old-"]), profiler=profiler, name="filter"
+        )
+        self.assertEqual(
+            first=[matcher(tag) for tag in ("old-1", "new-1")], second=[True, False]
+        )
+
+        # One call per generator and per outermost call
+        self.assertEqual(
+            first={name: len(times.walls) for name, times in profiler.phases.items()},
+            second={"setup": 1, "catalog": 1, "blobs": 1, "filter": 2},
+        )
+        self.assertGreaterEqual(a=profiler.phases["catalog"].walls[0], b=0.03)
+        # Sleeping is waiting, not CPU time
+        self.assertLess(a=profiler.phases["catalog"].cpu, b=0.02)
+
+        lines: list[str] = profiler.report()
+        self.assertEqual(first=lines[0].split()[:2], second=["phase", "calls"])
+        self.assertEqual(
+            first=[line.split()[0] for line in lines[1:3]], second=["catalog", "setup"]
+        )
+
+    def test_output(self):
+        """Profiler Output Files (pstats, Collapsed Stacks Of Every Thread)"""
+
+        with TemporaryDirectory() as directory:
+            pstats_path: str = path.join(directory, "run.pstats")
+            with Profiler(output=pstats_path):
+                run_worker(duration=0.05)
+            functions: list[str] = [name for _, _, name in Stats(pstats_path).stats]
+            self.assertIn(member="run_worker", container=functions)
+
+            collapsed_path: str = path.join(directory, "run.collapsed")
+            with Profiler(output=collapsed_path, interval=0.001):
+                run_worker(duration=0.05)
+            with open(collapsed_path, encoding="utf-8") as file:
+                stacks: list[tuple[str, str]] = [
+                    tuple(line.rstrip("\n").rsplit(" ", 1)) for line in file
+                ]
+            self.assertTrue(expr=all(count.isdigit() for _, count in stacks))
+            self.assertTrue(
+                expr=any(stack.startswith("cleaner;") for stack, _ in stacks)
+            )
+            self.assertTrue(
+                expr=any(
+                    stack.startswith("MainThread;") and "run_worker" in stack
+                    for stack, _ in stacks
+                )
+            )
+
+    def test_helpers(self):
+        """Profiler Percentiles And Thread Groups"""
+
+        values: list[float] = [float(value) for value in range(1, 101)]
+        self.assertEqual(first=get_percentile(values=values, percentile=99), second=99)
+        self.assertEqual(first=get_percentile(values=[], percentile=99), second=0)
+        self.assertEqual(first=get_thread_group(name="cleaner_12"), second="cleaner")
+        self.assertEqual(first=get_thread_group(name="MainThread"), second="MainThread")
@@ -0,0 +1,110 @@
+"""Protected Index Tests"""
+
+from os import path, urandom
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+from protected_index import ProtectedIndex, get_fingerprint, parse_reference
+
+DIGEST_A: str = f"sha256:{'a' * 64}"
+DIGEST_B: str = f"sha256:{'b' * 64}"
+DIGEST_C: str = f"sha256:{'c' * 64}"
+
+
+class ProtectedIndexTests(TestCase):
+    """Protected Index Tests Class"""
+
+    def test_load(self):
+        """Protected Index Loaded From A Running Images Export"""
+
+        with TemporaryDirectory() as directory:
+            file_path: str = path.join(directory, "running.txt")
+            with open(file_path, mode="w", encoding="utf-8") as file:
+                file.write(
+                    "# kubectl get pods -A -o jsonpath='{..image} {..imageID}'\n"
+                    f"registry.example.com/team/app:1.2 {DIGEST_A}\n"
+                    f"docker-pullable://registry.example.com/team/api@{DIGEST_B}\n"
+                    "other.example.com:5000/team/web:2.0 team/worker\n"
+                    f"registry.example.com:443/team/cron:v3  # {DIGEST_C}\n"
+                )
+            protected = ProtectedIndex.load(
+                path=file_path, registry_url="https://registry.example.com/"
+            )
+
+        self.assertEqual(first=len(protected), second=5)
+        self.assertTrue(expr=protected.protects_digest(digest=DIGEST_A))
+        self.assertTrue(expr=protected.protects_digest(digest=DIGEST_B))
+        # Comments are ignored
+        self.assertFalse(expr=protected.protects_digest(digest=DIGEST_C))
+        self.assertEqual(
+            first=sorted(protected.image_tags),
+            second=["team/app:1.2", "team/cron:v3", "team/worker:latest"],
+        )
+        self.assertEqual(
+            first=protected.get_reason(
+                image="team/other", digest=DIGEST_B, tags=["old"]
+            ),
+            second="protected digest",
+        )
+        self.assertEqual(
+            first=protected.get_reason(
+                image="team/app", digest=DIGEST_C, tags=["1.1", "1.2"]
+            ),
+            second="protected 'team/app:1.2'",
+        )
+        self.assertIsNone(
+            obj=protected.get_reason(image="team/web", digest=DIGEST_C, tags=["2.0"])
+        )
+
+    @patch(target="protected_index.CHUNK_SIZE", new=64)
+    def test_load_lines(self):
+        """Protected Index Loaded From One Reference Per Line (Several Chunks)"""
+
+        with TemporaryDirectory() as directory:
+            file_path: str = path.join(directory, "running.txt")
+            with open(file_path, mode="w", encoding="utf-8") as file:
+                file.write(
+                    f"registry.example.com/team/app@{DIGEST_A}\n"
+                    f"registry.example.com/team/api@{DIGEST_B}\n"
+                    "registry.example.com/team/web:2.0\n"
+                    f"docker-pullable://team/cron@{DIGEST_C}"
+                )
+            protected = ProtectedIndex.load(
+                path=file_path, registry_url="https://registry.example.com"
+            )
+
+        self.assertEqual(first=len(protected), second=4)
+        for digest in (DIGEST_A, DIGEST_B, DIGEST_C):
+            self.assertTrue(expr=protected.protects_digest(digest=digest))
+        self.assertEqual(first=protected.image_tags, second={"team/web:2.0"})
+
+    def test_lookup(self):
+        """Protected Index Lookups (Every Bucket, Absent Digests)"""
+
+        digests: list[str] = [f"sha256:{urandom(32).hex()}" for _ in range(5000)]
+        protected = ProtectedIndex(fingerprints=map(get_fingerprint, digests[:4000]))
+        self.assertTrue(
+            expr=all(protected.protects_digest(digest=d) for d in digests[:4000])
+        )
+        self.assertFalse(
+            expr=any(protected.protects_digest(digest=d) for d in digests[4000:])
+        )
+        self.assertFalse(expr=protected.protects_digest(digest="sha512:abc"))
+        self.assertFalse(expr=ProtectedIndex().protects_digest(digest=DIGEST_A))
+
+    def test_parse_reference(self):
+        """Protected Index References Of This Registry Only"""
+
+        for reference, expected in (
+            ("team/app", "team/app:latest"),
+            ("registry.example.com/team/app:1", "team/app:1"),
+            ("docker://registry.example.com/app:1", "app:1"),
+            ("localhost:5000/team/app:1", None),
+            ("other.example.com/team/app:1", None),
+        ):
+            image_tag = parse_reference(
+                reference=reference, registry_host="registry.example.com"
+            )
+            self.assertEqual(
+                first=None if image_tag is None else str(image_tag), second=expected
+            )
@@ -0,0 +1,79 @@
+"""Rate Limiter Tests"""
+
+from unittest import TestCase
+from rate_limiter import AdaptiveRateLimiter, RetryPolicy
+
+
+class FakeClock:
+    """FakeClock Class (sleeping moves the clock forward)"""
+
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """FakeClock Sleep Method"""
+
+        self.now += seconds
+
+
+class AdaptiveRateLimiterTests(TestCase):
+    """Adaptive Rate Limiter Tests Class"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.rate_limiter = AdaptiveRateLimiter(
+            max_rate=10, burst=1, clock=self.clock, sleeper=self.clock.sleep
+        )
+
+    def test_acquire(self):
+        """Token Bucket Rate"""
+
+        for _ in range(11):
+            self.rate_limiter.acquire()
+        self.assertAlmostEqual(first=self.clock.now, second=1.0)
+
+    def test_throttled(self):
+        """Rate Halved On 429 And Retry-After Respected"""
+
+        self.rate_limiter.acquire()
+        self.rate_limiter.on_throttled(retry_after=5)
+        self.assertEqual(first=self.rate_limiter.rate, second=5)
+        self.assertAlmostEqual(first=self.rate_limiter.acquire(), second=5)
+        # Retry-After capped (RETRY_AFTER_MAX)
+        self.rate_limiter.on_throttled(retry_after=3600)
+        self.assertAlmostEqual(first=self.rate_limiter.acquire(), second=30)
+
+        for _ in range(20):
+            self.rate_limiter.on_success(latency=0.1)
+        self.assertEqual(first=self.rate_limiter.rate, second=10)
+
+    def test_latency(self):
+        """Rate Lowered When Latency Degrades"""
+
+        self.rate_limiter.on_success(latency=0.1)
+        for _ in range(10):
+            self.rate_limiter.on_success(latency=1)
+        self.assertLess(a=self.rate_limiter.rate, b=10)
+        self.assertGreaterEqual(a=self.rate_limiter.rate, b=1)
+
+
+class RetryPolicyTests(TestCase):
+    """Retry Policy Tests Class"""
+
+    def test_get_delay(self):
+        """Jittered Exponential Backoff"""
+
+        retry_policy = RetryPolicy(backoff_base=1, backoff_max=4)
+        for attempt, maximum in ((0, 1), (1, 2), (2, 4), (5, 4)):
+            delay: float = retry_policy.get_delay(attempt=attempt)
+            self.assertTrue(expr=0 <= delay <= maximum)
+        self.assertEqual(
+            first=retry_policy.get_delay(attempt=9, retry_after=3), second=3
+        )
+        # Retry-After capped to backoff_max
+        self.assertEqual(
+            first=retry_policy.get_delay(attempt=9, retry_after=3600), second=4
+        )
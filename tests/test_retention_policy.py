@@ -0,0 +1,90 @@
+"""Retention Policy Tests"""
+
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+from retention_policy import RetentionPolicy, parse_semver
+
+now: datetime = datetime(year=2024, month=6, day=1, tzinfo=timezone.utc)
+
+
+class RetentionPolicyTests(TestCase):
+    """Retention Policy Tests Class"""
+
+    @staticmethod
+    def evaluate(
+        policy: RetentionPolicy, tags: dict[str, datetime | None]
+    ) -> tuple[list[str], list[str]]:
+        """Evaluate a policy over tags (name -> created), get (deleted, kept)"""
+
+        evaluator = policy.evaluator(now=now)
+        deleted: list[str] = []
+        for tag, created in tags.items():
+            deleted.extend(evaluator.feed(tag=tag, item=tag, created=created))
+        return sorted(deleted), sorted(evaluator.finish())
+
+    def test_parse_semver(self):
+        """Semantic Version Parsing And Ordering"""
+
+        self.assertIsNone(obj=parse_semver(tag="latest"))
+        self.assertIsNone(obj=parse_semver(tag="1.2"))
+        versions: list[str] = [
+            "0.9.0",
+            "v1.0.0-alpha",
+            "1.0.0-alpha.1",
+            "1.0.0-alpha.beta",
+            "1.0.0-beta.2",
+            "1.0.0-beta.11",
+            "1.0.0-rc.1",
+            "v1.0.0+build.5",
+            "1.10.0",
+        ]
+        self.assertEqual(first=sorted(versions, key=parse_semver), second=versions)
+
+    def test_disabled(self):
+        """Disabled Retention Policy"""
+
+        self.assertFalse(expr=RetentionPolicy().is_enabled)
+        self.assertFalse(expr=RetentionPolicy(keep_semver=3).needs_created)
+        self.assertTrue(expr=RetentionPolicy(keep_last=3).needs_created)
+
+    def test_keep_last(self):
+        """Keep The N Newest Tags"""
+
+        tags: dict[str, datetime | None] = {
+            f"sha-{day}": now - timedelta(days=day) for day in (5, 1, 9, 3, 7)
+        }
+        tags["unknown"] = None
+        self.assertEqual(
+            first=self.evaluate(policy=RetentionPolicy(keep_last=2), tags=tags),
+            second=(["sha-5", "sha-7", "sha-9", "unknown"], ["sha-1", "sha-3"]),
+        )
+
+    def test_older_than(self):
+        """Delete Tags Older Than N Days Only"""
+
+        tags: dict[str, datetime | None] = {
+            "old": now - timedelta(days=40),
+            "new": now - timedelta(days=2),
+            "unknown": None,
+        }
+        self.assertEqual(
+            first=self.evaluate(policy=RetentionPolicy(older_than_days=30), tags=tags),
+            second=(["old"], ["new", "unknown"]),
+        )
+
+    def test_keep_semver_and_last(self):
+        """Keep Highest Semantic Versions And Newest Tags (independent rules)"""
+
+        tags: dict[str, datetime | None] = {
+            "1.0.0": now - timedelta(days=30),
+            "2.0.0": now - timedelta(days=20),
+            "1.5.0": now - timedelta(days=10),
+            "dev": now - timedelta(days=5),
+            "feature": now - timedelta(days=1),
+        }
+        self.assertEqual(
+            first=self.evaluate(
+                policy=RetentionPolicy(keep_last=1, keep_semver=2), tags=tags
+            ),
+            second=(["1.0.0", "dev"], ["1.5.0", "2.0.0", "feature"]),
+        )
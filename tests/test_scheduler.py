@@ -0,0 +1,47 @@
+"""Scheduler Tests"""
+
+from threading import Thread
+from time import sleep
+from unittest import TestCase
+from scheduler import FairScheduler
+
+
+class FairSchedulerTests(TestCase):
+    """Fair Scheduler Tests Class"""
+
+    @staticmethod
+    def wait_for(condition, timeout: float = 5.0) -> None:
+        """Wait (polling) until a condition is true"""
+
+        for _ in range(int(timeout / 0.01)):
+            if condition():
+                return
+            sleep(0.01)
+        raise TimeoutError("Condition not reached")
+
+    def test_fairness(self):
+        """Fair Scheduler Gives Free Slots To The Registry Holding The Fewest"""
+
+        scheduler = FairScheduler(budget=2)
+        scheduler.acquire(key="slow")
+        scheduler.acquire(key="slow")
+
+        # Older waiting task of the slow registry, then one of another registry
+        slow = Thread(target=scheduler.acquire, kwargs={"key": "slow"})
+        slow.start()
+        self.wait_for(condition=lambda: scheduler.waiting == 1)
+        fast = Thread(target=scheduler.acquire, kwargs={"key": "fast"})
+        fast.start()
+        self.wait_for(condition=lambda: scheduler.waiting == 2)
+
+        scheduler.release(key="slow")
+        fast.join(timeout=5)
+        self.assertFalse(expr=fast.is_alive())
+        self.assertEqual(first=scheduler.running, second={"slow": 1, "fast": 1})
+        self.assertEqual(first=scheduler.waiting, second=1)
+
+        # Budget never exceeded: the slow registry gets the next free slot
+        scheduler.release(key="fast")
+        slow.join(timeout=5)
+        self.assertFalse(expr=slow.is_alive())
+        self.assertEqual(first=scheduler.running, second={"slow": 2, "fast": 0})
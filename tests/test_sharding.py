@@ -0,0 +1,64 @@
+"""Sharding Tests"""
+
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from sharding import Checkpoint, filter_shard, get_shard
+
+
+class ShardingTests(TestCase):
+    """Sharding Tests Class"""
+
+    images: list[str] = [f"team/image-{number}" for number in range(100)]
+
+    def test_filter_shard(self):
+        """Every Docker Image Belongs To Exactly One Shard"""
+
+        shards: list[list[str]] = [
+            list(filter_shard(images=self.images, index=index, count=3))
+            for index in range(3)
+        ]
+        self.assertEqual(
+            first=sorted(image for shard in shards for image in shard),
+            second=sorted(self.images),
+        )
+        self.assertTrue(expr=all(shards))
+        self.assertEqual(
+            first=get_shard(name="team/image-1", count=3),
+            second=get_shard(name="team/image-1", count=3),
+        )
+        self.assertEqual(
+            first=list(filter_shard(images=self.images, index=0, count=1)),
+            second=self.images,
+        )
+        with self.assertRaises(ValueError):
+            filter_shard(images=self.images, index=3, count=3)
+
+
+class CheckpointTests(TestCase):
+    """Checkpoint Tests Class"""
+
+    def test_checkpoint(self):
+        """Checkpoint Moves Forward Over Completed Images Only"""
+
+        with TemporaryDirectory() as directory:
+            file_path: str = path.join(directory, "checkpoint.json")
+            checkpoint = Checkpoint(path=file_path, key="shard=0/1")
+            self.assertIsNone(obj=checkpoint.last)
+            for image in ("a", "b", "c"):
+                checkpoint.start(image=image)
+            checkpoint.done(image="b")
+            self.assertIsNone(obj=checkpoint.last)
+            checkpoint.done(image="a")
+            self.assertEqual(first=checkpoint.last, second="b")
+
+            # Interrupted run: resume after 'b'
+            self.assertEqual(
+                first=Checkpoint(path=file_path, key="shard=0/1").last, second="b"
+            )
+            # Other settings: start from the beginning
+            self.assertIsNone(obj=Checkpoint(path=file_path, key="shard=1/2").last)
+
+            checkpoint.clear()
+            self.assertFalse(expr=path.exists(file_path))
+            self.assertIsNone(obj=Checkpoint(path=file_path, key="shard=0/1").last)
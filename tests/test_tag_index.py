@@ -0,0 +1,85 @@
+"""Tag Index Tests"""
+
+from unittest import TestCase
+from tag_index import TagIndex, get_tags_hash
+
+
+class TagIndexTests(TestCase):
+    """Tag Index Tests Class"""
+
+    def setUp(self):
+        self.tag_index = TagIndex(path=":memory:")
+
+    def tearDown(self):
+        self.tag_index.close()
+
+    def test_get_tags_hash(self):
+        """Tags Hash Is Order Independent"""
+
+        self.assertEqual(
+            first=get_tags_hash(tags=["a", "b"]), second=get_tags_hash(tags=["b", "a"])
+        )
+        self.assertNotEqual(
+            first=get_tags_hash(tags=["a", "b"]), second=get_tags_hash(tags=["a"])
+        )
+
+    def test_digest(self):
+        """Tag Index Set/Get Digest (with TTL)"""
+
+        self.assertIsNone(obj=self.tag_index.get_digest(image="alpine", tag="a"))
+        self.tag_index.set_digest(image="alpine", tag="a", digest="sha256:a")
+        self.assertEqual(
+            first=self.tag_index.get_digest(image="alpine", tag="a"), second="sha256:a"
+        )
+        self.tag_index.digest_ttl = -1
+        self.assertIsNone(obj=self.tag_index.get_digest(image="alpine", tag="a"))
+
+    def test_update_tags(self):
+        """Tag Index Update Tags (change detection and stale tags removal)"""
+
+        self.assertTrue(expr=self.tag_index.is_tags_changed(image="alpine", tags=["a"]))
+        self.tag_index.set_digest(image="alpine", tag="a", digest="sha256:a")
+        self.tag_index.set_digest(image="alpine", tag="b", digest="sha256:b")
+        self.tag_index.update_tags(image="alpine", tags=["a"])
+
+        self.assertFalse(
+            expr=self.tag_index.is_tags_changed(image="alpine", tags=["a"])
+        )
+        self.assertIsNone(obj=self.tag_index.get_digest(image="alpine", tag="b"))
+
+        self.tag_index.delete_tags(image="alpine", tags=["a"])
+        self.assertIsNone(obj=self.tag_index.get_digest(image="alpine", tag="a"))
+        self.assertTrue(expr=self.tag_index.is_tags_changed(image="alpine", tags=[]))
+
+    def test_get_deletion_candidates(self):
+        """Tag Index Deletion Candidates (digests referenced elsewhere kept)"""
+
+        for tag, digest in (("a", "ab"), ("b", "ab"), ("c", "c"), ("latest", "c")):
+            self.tag_index.set_digest(image="alpine", tag=tag, digest=digest)
+        self.tag_index.update_tags(image="alpine", tags=["a", "b", "c", "latest"])
+
+        self.assertEqual(
+            first=list(self.tag_index.get_deletion_candidates(tags_pattern="^[a-c]$")),
+            second=[("alpine", "ab", ["a", "b"])],
+        )
+        self.assertEqual(
+            first=list(self.tag_index.get_deletion_candidates(images_pattern="ubuntu")),
+            second=[],
+        )
+
+    def test_get_counts(self):
+        """Tag Index Counts (images, tags and distinct digests)"""
+
+        for tag, digest in (("a", "ab"), ("b", "ab"), ("c", "c")):
+            self.tag_index.set_digest(image="alpine", tag=tag, digest=digest)
+        self.tag_index.update_tags(image="alpine", tags=["a", "b", "c"])
+        self.tag_index.update_tags(image="ubuntu", tags=[])
+
+        self.assertEqual(
+            first=self.tag_index.get_counts(),
+            second={"images": 2, "tags": 3, "digests": 2},
+        )
+        self.assertEqual(
+            first=self.tag_index.get_counts(pattern="ubuntu"),
+            second={"images": 1, "tags": 0, "digests": 0},
+        )
@@ -0,0 +1,37 @@
+"""Tags List Cache Tests"""
+
+from os import path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from tags_cache import CachedTagsPage, TagsListCache
+
+
+class TagsListCacheTests(TestCase):
+    """Tags List Cache Tests Class"""
+
+    def test_get_set(self):
+        """Tags List Cache Pages Persisted (Validators, Tags, Next Page)"""
+
+        pages: dict[str, CachedTagsPage] = {
+            "/v2/app/tags/list": CachedTagsPage(
+                etag='"abc"',
+                last_modified=None,
+                tags=["a", "b"],
+                next_url="/v2/app/tags/list?last=b",
+            ),
+            "/v2/empty/tags/list": CachedTagsPage(
+                etag=None,
+                last_modified="Mon, 01 Jan 2024 00:00:00 GMT",
+                tags=[],
+                next_url=None,
+            ),
+        }
+        with TemporaryDirectory() as directory:
+            cache_path: str = path.join(directory, "tags.db")
+            with TagsListCache(path=cache_path) as tags_cache:
+                for url, page in pages.items():
+                    tags_cache.set(url=url, page=page)
+            with TagsListCache(path=cache_path) as tags_cache:
+                for url, page in pages.items():
+                    self.assertEqual(first=tags_cache.get(url=url), second=page)
+                self.assertIsNone(obj=tags_cache.get(url="/v2/other/tags/list"))
@@ -2,11 +2,16 @@
 
 from unittest import TestCase
 from random import randrange
+from datetime import datetime, timezone
 from utils import (
     str2bool,
     is_valid_url,
     is_dangerous_regex,
     get_percentage,
+    get_human_size,
+    get_next_link,
+    parse_datetime,
+    parse_retry_after,
 )
 
 
@@ -49,3 +54,57 @@ class TestUtils(TestCase):
                     second=number_1 / number_2,
                 )
         self.assertEqual(first=get_percentage(nbr_a=1, nbr_b=0), second=0)
+
+    def test_get_human_size(self):
+        """Test Human Readable Size Function"""
+
+        for size, expected in [
+            (0, "0 B"),
+            (1023, "1023 B"),
+            (1536, "1.5 KiB"),
+            (5 * 2**30, "5.0 GiB"),
+            (3 * 2**50, "3072.0 TiB"),
+        ]:
+            self.assertEqual(first=get_human_size(size=size), second=expected)
+
+    def test_get_next_link(self):
+        """Test Link Header 'next' URL Parsing Function"""
+
+        self.assertEqual(
+            first=get_next_link(link_header='</v2/_catalog?last=b&n=2>; rel="next"'),
+            second="/v2/_catalog?last=b&n=2",
+        )
+        self.assertEqual(
+            first=get_next_link(
+                link_header=(
+                    '<https://r.example.com/v2/a/tags/list?last=x>; rel="prev", '
+                    '<https://r.example.com/v2/a/tags/list?last=z>; rel="next"'
+                )
+            ),
+            second="/v2/a/tags/list?last=z",
+        )
+        self.assertIsNone(obj=get_next_link(link_header=None))
+        self.assertIsNone(obj=get_next_link(link_header='</v2/x>; rel="prev"'))
+
+    def test_parse_datetime(self):
+        """Test RFC 3339 Date Parsing Function"""
+
+        self.assertEqual(
+            first=parse_datetime(value="2023-05-02T10:11:12.123456789Z"),
+            second=datetime(2023, 5, 2, 10, 11, 12, 123456, tzinfo=timezone.utc),
+        )
+        self.assertEqual(
+            first=parse_datetime(value="2023-05-02T10:11:12"),
+            second=datetime(2023, 5, 2, 10, 11, 12, tzinfo=timezone.utc),
+        )
+        self.assertIsNone(obj=parse_datetime(value=None))
+
+    def test_parse_retry_after(self):
+        """Test Retry-After Header Parsing Function"""
+
+        self.assertEqual(first=parse_retry_after(value="120"), second=120)
+        self.assertEqual(
+            first=parse_retry_after(value="Wed, 21 Oct 2015 07:28:00 GMT"), second=0
+        )
+        self.assertIsNone(obj=parse_retry_after(value="soon"))
+        self.assertIsNone(obj=parse_retry_after(value=None))